@@ -9,6 +9,10 @@ from typing import Any
 import streamlit as st
 
 from partner_os.runtime import AppRuntime, build_runtime
+from partner_os.services.excerpt import read_excerpt
+from partner_os.services.media import MediaInfo
+
+FIRM_INBOX_PANEL_CHARS = 20000
 
 
 @st.cache_resource
@@ -20,18 +24,19 @@ def get_runtime() -> AppRuntime:
 def stage_uploads(runtime: AppRuntime, uploads: list[Any]) -> list[Path]:
     staged_paths: list[Path] = []
     for upload in uploads:
-        target = runtime.config.staging_inbox_dir / upload.name
-        if target.exists():
-            stem = target.stem
-            suffix = target.suffix
-            counter = 1
-            while True:
-                candidate = target.with_name(f"{stem}_{counter}{suffix}")
-                if not candidate.exists():
-                    target = candidate
-                    break
+        base = runtime.config.staging_inbox_dir / upload.name
+        target, counter = base, 1
+        while True:
+            # Exclusive create claims the name atomically; the common case is one open, no stat.
+            try:
+                handle = target.open("xb")
+            except FileExistsError:
+                target = base.with_name(f"{base.stem}_{counter}{base.suffix}")
                 counter += 1
-        target.write_bytes(upload.getbuffer())
+                continue
+            with handle:
+                handle.write(upload.getbuffer())
+            break
         staged_paths.append(target)
     return staged_paths
 
@@ -66,7 +71,11 @@ def render_sidebar(runtime: AppRuntime) -> tuple[list[Any], bool, bool]:
     st.sidebar.write(f"Pending Tasks: **{runtime.queue.pending_count}**")
 
     if st.sidebar.button("Index 00_FIRM_LIBRARY"):
-        result = runtime.librarian.index_firm_library()
+        bar = st.sidebar.progress(0.0, text="Scanning 00_FIRM_LIBRARY")
+        result = runtime.librarian.index_firm_library(
+            progress=lambda update: bar.progress(update.fraction, text=update.label)
+        )
+        bar.empty()
         runtime.store.log_action(
             actor="Librarian",
             action="index_firm_library",
@@ -114,7 +123,8 @@ def render_panels(runtime: AppRuntime) -> None:
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("00_FIRM_INBOX.md")
-        st.code(runtime.config.firm_inbox_path.read_text(encoding="utf-8"), language="markdown")
+        inbox_tail, _ = read_excerpt(runtime.config.firm_inbox_path, head_chars=0, tail_chars=FIRM_INBOX_PANEL_CHARS)
+        st.code(inbox_tail, language="markdown")
 
     with col2:
         st.subheader("Recent action_logs")
@@ -135,6 +145,39 @@ def render_panels(runtime: AppRuntime) -> None:
 
 
 
+def render_media(runtime: AppRuntime) -> None:
+    deals = runtime.store.list_deals()
+    if not deals:
+        return
+    deal_ids = [row["deal_id"] for row in deals]
+    last_deal = st.session_state.get("last_result", {}).get("deal_id")
+    st.subheader("Deal Media")
+    deal_id = st.selectbox(
+        "Deal",
+        deal_ids,
+        index=deal_ids.index(last_deal) if last_deal in deal_ids else 0,
+        format_func=lambda value: next(row["property_address"] for row in deals if row["deal_id"] == value),
+    )
+    rows = runtime.store.list_deal_media(deal_id)
+    if not rows:
+        st.write("No photos, video or audio filed for this deal.")
+        return
+
+    # Only cached thumbnails are decoded here; originals are never opened on a rerun.
+    photos = [row for row in rows if row["thumbnail_path"] and Path(row["thumbnail_path"]).exists()]
+    if photos:
+        st.image(
+            [row["thumbnail_path"] for row in photos],
+            caption=[f"{Path(row['file_path']).name} - {MediaInfo.from_row(row).describe()}" for row in photos],
+            width=200,
+        )
+    shown = {row["file_path"] for row in photos}
+    for row in rows:
+        if row["file_path"] not in shown:
+            st.markdown(f"- `{Path(row['file_path']).name}`: {MediaInfo.from_row(row).describe()}")
+
+
+
 def main() -> None:
     runtime = get_runtime()
     uploads, include_cfo, include_scout = render_sidebar(runtime)
@@ -169,6 +212,7 @@ def main() -> None:
         st.json(st.session_state["last_result"])
 
     render_panels(runtime)
+    render_media(runtime)
 
 
 if __name__ == "__main__":
@@ -8,20 +8,32 @@ from datetime import datetime
 from pathlib import Path
 
 from partner_os.agents.base import BaseAgent
+from partner_os.constants import DOCUMENT_KIND_CFO_REPORT
 from partner_os.models import AgentResult, CFOInput, Task
+from partner_os.services.comps import CompsEngine, CompsEstimate, CompSubject, subject_from_cache
 from partner_os.services.filesystem import ensure_deal_jacket
+from partner_os.services.library import file_digest
 
 
 @dataclass(slots=True)
 class CFOAgent(BaseAgent):
     """Deterministic underwriting engine."""
 
+    comps: CompsEngine | None = None
+
     def run_underwrite_task(self, task: Task) -> AgentResult:
         deal = self.store.get_deal(task.deal_id)
         if not deal:
             raise ValueError(f"Deal not found: {task.deal_id}")
 
         payload = task.payload
+        comps_estimate = self._comps_estimate(deal["property_address"], payload)
+        arv = payload.get("arv")
+        if arv is None:
+            if comps_estimate is None or comps_estimate.arv is None:
+                raise ValueError("arv is required when no comparable sales are available")
+            arv = comps_estimate.arv
+
         cfo_input = CFOInput(
             purchase_price=float(payload["purchase_price"]),
             current_noi=float(payload["current_noi"]),
@@ -29,23 +41,37 @@ class CFOAgent(BaseAgent):
             annual_debt_service=float(payload["annual_debt_service"]),
             annual_cash_flow=float(payload["annual_cash_flow"]),
             total_cash_invested=float(payload["total_cash_invested"]),
-            arv=float(payload["arv"]),
+            arv=float(arv),
             rehab_budget=float(payload["rehab_budget"]),
             market_cap_rate=float(payload["market_cap_rate"]),
             cash_flows=[float(item) for item in payload["cash_flows"]],
         )
         metrics = self.compute_metrics(cfo_input)
+        if comps_estimate is not None and comps_estimate.arv is not None:
+            metrics.update(
+                {
+                    "comps_arv": comps_estimate.arv,
+                    "comps_arv_low": comps_estimate.low,
+                    "comps_arv_high": comps_estimate.high,
+                    "comps_count": len(comps_estimate.comps),
+                    "comps_summary": comps_estimate.summary,
+                }
+            )
 
         self.store.update_deal_underwriting(task.deal_id, metrics)
         self.store.update_deal_status(task.deal_id, "underwritten")
 
-        deal_root = ensure_deal_jacket(self.config, task.deal_id, deal["slug"])
+        deal_root = ensure_deal_jacket(self.config, task.deal_id, deal["slug"], self.store)
         report_path = self._write_underwriting_report(deal_root, deal["property_address"], metrics)
         self.store.insert_document(
             deal_id=task.deal_id,
             category="06_AI_Deliverables",
             file_path=report_path,
             summary="Deterministic CFO underwriting report",
+            kind=DOCUMENT_KIND_CFO_REPORT,
+            size_bytes=report_path.stat().st_size,
+            content_hash=file_digest(report_path),
+            replace=True,
         )
 
         return AgentResult(
@@ -54,6 +80,14 @@ class CFOAgent(BaseAgent):
             details={"report_path": str(report_path), "metrics": metrics},
         )
 
+    def _comps_estimate(self, property_address: str, payload: dict) -> CompsEstimate | None:
+        """Comps ARV for the deal, locating it from `payload["subject"]` or the geocode cache."""
+        if self.comps is None:
+            return None
+        subject_data = payload.get("subject")
+        subject = CompSubject(**subject_data) if subject_data else subject_from_cache(self.store, property_address)
+        return self.comps.estimate(subject) if subject else None
+
     def compute_metrics(self, cfo_input: CFOInput) -> dict[str, float | str]:
         cap_rate = self.cap_rate(cfo_input.current_noi, cfo_input.purchase_price)
         dscr = self.dscr(cfo_input.current_noi, cfo_input.annual_debt_service)
@@ -158,6 +192,10 @@ class CFOAgent(BaseAgent):
                 f"- Stabilized Value: `${metrics['stabilized_direct_capped_value']:,.2f}`",
                 f"- Forced Equity Delta vs Purchase: `${metrics['forced_equity_delta']:,.2f}`",
                 "",
+                "## Comparable Sales",
+                "",
+                str(metrics.get("comps_summary", "No comps index available.")),
+                "",
                 "## Raw JSON",
                 "",
                 "```json",
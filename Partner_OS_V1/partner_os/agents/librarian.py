@@ -2,27 +2,43 @@
 
 from __future__ import annotations
 
-import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Callable
 
 from partner_os.agents.base import BaseAgent
-from partner_os.constants import EXTENSION_TO_SUBDIR, is_within_directory
+from partner_os.constants import DOCUMENT_KIND_SUMMARY, DOCUMENT_KIND_UPLOAD, EXTENSION_TO_SUBDIR, is_within_directory
 from partner_os.models import AgentResult, Task
+from partner_os.services.async_runner import AsyncFanout
+from partner_os.services.blobs import BlobStore
+from partner_os.services.chunks import ChunkIndex
+from partner_os.services.extract import CHARS_PER_TOKEN, TextExtractor, extract_text
 from partner_os.services.filesystem import ensure_deal_jacket
-from partner_os.services.llm import GeminiAPIError, GeminiClient, NullLLMClient
+from partner_os.services.library import IndexProgress, LibraryFile, file_digest, plan_library_scan, walk_files
+from partner_os.services.llm import GeminiClient, NullLLMClient, SummaryResult
+from partner_os.services.media import MediaProcessor
+
+LIBRARY_SUMMARY_TOKENS = 1250
+TRIAGE_SUMMARY_TOKENS = 2250
+RETRIEVAL_INDEX_TOKENS = 25_000
 
 
 @dataclass(slots=True)
 class LibrarianAgent(BaseAgent):
     llm_client: GeminiClient | NullLLMClient
+    blobs: BlobStore
+    chunks: ChunkIndex
+    extractor: TextExtractor | None = None
+    media: MediaProcessor | None = None
+    fanout: AsyncFanout | None = None
 
     def create_deal_jacket_task(self, task: Task) -> AgentResult:
         deal = self.store.get_deal(task.deal_id)
         if not deal:
             raise ValueError(f"Deal not found: {task.deal_id}")
 
-        deal_root = ensure_deal_jacket(self.config, task.deal_id, deal["slug"])
+        deal_root = ensure_deal_jacket(self.config, task.deal_id, deal["slug"], self.store)
         self.store.log_action(
             actor=self.name,
             action="create_deal_jacket",
@@ -44,152 +60,349 @@ class LibrarianAgent(BaseAgent):
 
         staged_path = Path(task.payload["staged_path"]).resolve()
         original_name = task.payload.get("original_name", staged_path.name)
-        if not staged_path.exists():
-            raise FileNotFoundError(f"Staged file missing: {staged_path}")
-        if not is_within_directory(self.config.staging_inbox_dir, staged_path):
-            raise ValueError("Staged file is outside of _STAGING_INBOX contract.")
-
-        deal_root = ensure_deal_jacket(self.config, task.deal_id, deal["slug"])
-        ext = staged_path.suffix.lower()
-        subdir_name = EXTENSION_TO_SUBDIR.get(ext, "04_Intel_Docs")
-        target_dir = deal_root / subdir_name
-        target_path = self._unique_target_path(target_dir / original_name)
-
-        moved = False
-        try:
-            staged_path.replace(target_path)
-            moved = True
+        triaged = self._triage_files(task.deal_id, deal["slug"], [(staged_path, original_name)])[0]
 
-            summary_text, fallback = self._summarize_file(task.deal_id, target_path)
-            summary_md = self._write_summary_file(deal_root=deal_root, file_path=target_path, summary=summary_text)
+        return AgentResult(
+            summary=f"Triaged {original_name} -> {triaged['category']}",
+            rationale="Validated extension map and preserved filesystem pointer integrity.",
+            details={
+                "target_path": triaged["target_path"],
+                "summary_path": triaged["summary_path"],
+            },
+        )
 
-            self.store.insert_document(
-                deal_id=task.deal_id,
-                category=subdir_name,
-                file_path=target_path,
-                summary=summary_text,
-            )
-            self.store.insert_document(
-                deal_id=task.deal_id,
-                category="06_AI_Deliverables",
-                file_path=summary_md,
-                summary="Librarian artifact summary",
-            )
+    def triage_staged_batch_task(self, task: Task) -> AgentResult:
+        deal = self.store.get_deal(task.deal_id)
+        if not deal:
+            raise ValueError(f"Deal not found: {task.deal_id}")
 
-            self.store.log_action(
-                actor=self.name,
-                action="file_move",
-                rationale="Moved staged artifact into strict Deal Jacket destination.",
-                status="completed",
-                deal_id=task.deal_id,
-                details={
-                    "from": str(staged_path),
-                    "to": str(target_path),
-                    "fallback_summary": fallback,
-                },
-            )
+        staged: list[tuple[Path, str]] = []
+        for item in task.payload["files"]:
+            staged_path = Path(item["staged_path"]).resolve()
+            staged.append((staged_path, item.get("original_name", staged_path.name)))
+        triaged = self._triage_files(task.deal_id, deal["slug"], staged)
 
-            return AgentResult(
-                summary=f"Triaged {original_name} -> {subdir_name}",
-                rationale="Validated extension map and preserved filesystem pointer integrity.",
-                details={
-                    "target_path": str(target_path),
-                    "summary_path": str(summary_md),
-                },
-            )
+        return AgentResult(
+            summary=f"Triaged {len(triaged)} files",
+            rationale="Validated extension map for every artifact and summarized the batch concurrently.",
+            details={"files": triaged},
+        )
+
+    def _triage_files(self, deal_id: str, slug: str, staged: list[tuple[Path, str]]) -> list[dict[str, str]]:
+        for staged_path, _ in staged:
+            if not staged_path.exists():
+                raise FileNotFoundError(f"Staged file missing: {staged_path}")
+            if not is_within_directory(self.config.staging_inbox_dir, staged_path):
+                raise ValueError("Staged file is outside of _STAGING_INBOX contract.")
+
+        hashes = [file_digest(staged_path) for staged_path, _ in staged]
+        deal_root = ensure_deal_jacket(self.config, deal_id, slug, self.store)
+        placed: list[_Placement] = []
+        reserved: set[Path] = set()
+        try:
+            for (staged_path, original_name), content_hash in zip(staged, hashes):
+                existing = self.store.find_blob_ref(deal_id, content_hash)
+                if existing is not None and Path(existing["file_path"]).exists():
+                    # Same bytes already filed for this deal: nothing to move, link or summarize.
+                    placed.append(_Placement(staged_path, Path(existing["file_path"]), content_hash, duplicate=True))
+                    continue
+                subdir_name = EXTENSION_TO_SUBDIR.get(staged_path.suffix.lower(), "04_Intel_Docs")
+                wanted = deal_root / subdir_name / original_name
+                while True:
+                    target_path = self._unique_target_path(wanted, reserved)
+                    reserved.add(target_path)
+                    try:
+                        created = self.blobs.place(staged_path, content_hash, target_path, deal_id)
+                        break
+                    except FileExistsError:
+                        # A file copied into the jacket by hand is not catalogued; take the next name.
+                        continue
+                placed.append(_Placement(staged_path, target_path, content_hash, new_blob=created))
+
+            filed = [item for item in placed if not item.duplicate]
+            self._index_passages(deal_id, filed)
+            summaries = self._summaries_by_hash(deal_id, filed, media_notes=self._describe_media(filed))
+
+            triaged: list[dict[str, str]] = []
+            for item in placed:
+                summary_text, fallback = summaries.get(item.content_hash, ("", False))
+                if item.duplicate:
+                    summary_md = self._summary_path(deal_root, item.target_path)
+                else:
+                    summary_md = self._write_summary_file(
+                        deal_root=deal_root, file_path=item.target_path, summary=summary_text
+                    )
+                    self.store.insert_document(
+                        deal_id=deal_id,
+                        category=item.target_path.parent.name,
+                        file_path=item.target_path,
+                        summary=summary_text,
+                        kind=DOCUMENT_KIND_UPLOAD,
+                        size_bytes=item.target_path.stat().st_size,
+                        content_hash=item.content_hash,
+                    )
+                    self.store.insert_document(
+                        deal_id=deal_id,
+                        category="06_AI_Deliverables",
+                        file_path=summary_md,
+                        summary="Librarian artifact summary",
+                        kind=DOCUMENT_KIND_SUMMARY,
+                        size_bytes=summary_md.stat().st_size,
+                    )
+                self.store.log_action(
+                    actor=self.name,
+                    action="file_dedup" if item.duplicate else "file_move",
+                    rationale=(
+                        "Identical artifact already filed for this deal; dropped the staged copy."
+                        if item.duplicate
+                        else "Moved staged artifact into strict Deal Jacket destination."
+                    ),
+                    status="completed",
+                    deal_id=deal_id,
+                    details={
+                        "from": str(item.staged_path),
+                        "to": str(item.target_path),
+                        "content_hash": item.content_hash,
+                        "new_blob": item.new_blob,
+                        "fallback_summary": fallback,
+                    },
+                )
+                triaged.append(
+                    {
+                        "category": item.target_path.parent.name,
+                        "target_path": str(item.target_path),
+                        "summary_path": str(summary_md),
+                    }
+                )
         except Exception:
-            if moved and target_path.exists():
-                target_path.replace(self.config.staging_inbox_dir / target_path.name)
+            for item in placed:
+                if item.duplicate:
+                    continue
+                if item.target_path.exists():
+                    item.target_path.replace(item.staged_path)
+                if item.new_blob:
+                    self.blobs.path_for(item.content_hash).unlink(missing_ok=True)
             raise
 
-    def index_firm_library(self) -> AgentResult:
-        indexed = 0
-        for path in sorted(self.config.firm_library_dir.rglob("*")):
-            if not path.is_file():
-                continue
-            if path.suffix.lower() not in {".txt", ".md", ".pdf"}:
+        for item in placed:
+            if item.duplicate:
+                item.staged_path.unlink(missing_ok=True)
+        return triaged
+
+    def _describe_media(self, placed: list[_Placement]) -> dict[str, str]:
+        """Metadata lines for photos, video and audio, which have no text for the summarizer."""
+        if self.media is None:
+            return {}
+        infos = self.media.process_many(
+            [item.target_path for item in placed], [item.content_hash for item in placed]
+        )
+        return {item.content_hash: info.describe() for item, info in zip(placed, infos) if info is not None}
+
+    def _summaries_by_hash(
+        self, deal_id: str, placed: list[_Placement], media_notes: dict[str, str] | None = None
+    ) -> dict[str, tuple[str, bool]]:
+        """Summaries are per content: reuse stored ones and summarize each new hash once."""
+        summaries: dict[str, tuple[str, bool]] = {}
+        pending: dict[str, Path] = {}
+        for item in placed:
+            if item.content_hash in summaries or item.content_hash in pending:
                 continue
+            blob = self.store.get_blob(item.content_hash)
+            if blob is not None and blob["summary"]:
+                summaries[item.content_hash] = (blob["summary"], False)
+            else:
+                pending[item.content_hash] = item.target_path
 
-            digest = hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:12]
-            ref_id = f"lib-{digest}"
-            content = self._read_text_excerpt(path)
-            abstract = self._safe_library_abstract(content)
-            self.store.upsert_library_entry(
-                ref_id=ref_id,
-                title=path.stem,
-                file_path=path,
-                doctrine_abstract=abstract,
+        outcomes = self._summarize_files(deal_id, list(pending.values()), list(pending), media_notes)
+        for content_hash, (summary_text, fallback) in zip(pending, outcomes):
+            summaries[content_hash] = (summary_text, fallback)
+            if not fallback:
+                self.store.set_blob_summary(content_hash, summary_text)
+        return summaries
+
+    def _index_passages(self, deal_id: str, placed: list[_Placement]) -> None:
+        """Index passages for retrieval; the larger extraction is cached, so summaries reuse it."""
+        texts = self._extract_texts(
+            [item.target_path for item in placed], RETRIEVAL_INDEX_TOKENS, [item.content_hash for item in placed]
+        )
+        for item, text in zip(placed, texts):
+            if text.strip():
+                self.chunks.index_text(item.target_path, text, deal_id=deal_id, content_hash=item.content_hash)
+
+    def index_firm_library(self, progress: Callable[[IndexProgress], None] | None = None) -> AgentResult:
+        """Walk, hash/read, summarize and write the library as overlapping stages.
+
+        Reads for the next batch run on the worker pool while the current batch
+        is summarized; each batch is written with its manifest rows in one
+        transaction, so an interrupted run resumes where it stopped.
+        `progress` is called from the calling thread only.
+        """
+        report = progress or (lambda _: None)
+        batch_size = max(1, self.config.library_index_batch_size)
+        with ThreadPoolExecutor(
+            max_workers=max(1, self.config.library_index_workers), thread_name_prefix="library-read"
+        ) as pool:
+            report(IndexProgress("scanning"))
+            scan = plan_library_scan(
+                walk_files(self.config.firm_library_dir),
+                manifest=self.store.list_library_manifest(),
+                indexed=self.store.list_library_refs(),
+                executor=pool,
             )
-            indexed += 1
+            with self.store.transaction():
+                self.store.delete_library_paths(scan.removed)
+                self.chunks.remove(scan.removed)
+                for old_path, item in scan.renamed:
+                    self.store.move_library_entry(old_path, item.path, title=item.path.stem)
+                    self.chunks.move(old_path, item.path)
+                self.store.upsert_library_manifest(
+                    [_manifest_row(item) for item in [*scan.touched, *(item for _, item in scan.renamed)]]
+                )
+
+            batches = [scan.changed[start : start + batch_size] for start in range(0, len(scan.changed), batch_size)]
+            done = 0
+            report(IndexProgress("indexing", done, len(scan.changed)))
+            reads = pool.map(self._library_text, batches[0]) if batches else None
+            for number, batch in enumerate(batches):
+                contents = list(reads)
+                if number + 1 < len(batches):
+                    reads = pool.map(self._library_text, batches[number + 1])
+                self._write_library_batch(batch, contents)
+                done += len(batch)
+                report(IndexProgress("indexing", done, len(scan.changed)))
 
+        details = {
+            "indexed": len(scan.changed),
+            "renamed": len(scan.renamed),
+            "removed": len(scan.removed),
+            "unchanged": scan.unchanged + len(scan.touched),
+        }
         return AgentResult(
-            summary=f"Indexed {indexed} library files",
-            rationale="Maintained global doctrine index for Manager retrieval.",
-            details={"indexed": indexed},
+            summary=(
+                f"Indexed {details['indexed']} library files "
+                f"({details['renamed']} renamed, {details['removed']} removed, {details['unchanged']} unchanged)"
+            ),
+            rationale="Maintained global doctrine index for Manager retrieval; unchanged files were not re-read.",
+            details=details,
         )
 
-    def _safe_library_abstract(self, content: str) -> str:
-        if not content.strip():
-            return "No parseable text detected."
-        try:
-            return self.llm_client.summarize_text(content[:5000], deal_id=None)
-        except GeminiAPIError:
-            return content[:400].strip()
-
-    def _summarize_file(self, deal_id: str, file_path: Path) -> tuple[str, bool]:
-        text_excerpt = self._read_text_excerpt(file_path)
-        if not text_excerpt:
-            return (
-                "Binary or non-text artifact. Manual review required. \n"
-                f"File: {file_path.name} ({file_path.suffix.lower()})",
-                True,
-            )
+    def _summarize_many(self, texts: list[str], deal_id: str | None = None) -> list[SummaryResult]:
+        """Batch summaries go through the asyncio fan-out when one is configured."""
+        return (self.fanout or self.llm_client).summarize_many(texts, deal_id=deal_id)
+
+    def _write_library_batch(self, batch: list[LibraryFile], contents: list[str]) -> None:
+        textual = [idx for idx, content in enumerate(contents) if content.strip()]
+        summary_chars = LIBRARY_SUMMARY_TOKENS * CHARS_PER_TOKEN
+        results = self._summarize_many([contents[idx][:summary_chars] for idx in textual])
+        summaries = {idx: result for idx, result in zip(textual, results)}
+        self._warn_unreadable_pdfs([item.path for item, content in zip(batch, contents) if not content.strip()])
+
+        with self.store.transaction():
+            for idx, (item, content) in enumerate(zip(batch, contents)):
+                if content.strip():
+                    self.chunks.index_text(item.path, content, deal_id=None, content_hash=item.content_hash)
+                result = summaries.get(idx)
+                if result is None:
+                    abstract = "No parseable text detected."
+                elif result.ok and result.summary:
+                    abstract = result.summary
+                else:
+                    abstract = content[:400].strip()
+                if result is not None:
+                    self.chunks.index_abstract(item.path, abstract)
+                self.store.upsert_library_entry(
+                    ref_id=item.ref_id,
+                    title=item.path.stem,
+                    file_path=item.path,
+                    doctrine_abstract=abstract,
+                )
+            self.store.upsert_library_manifest([_manifest_row(item) for item in batch])
+
+    def _summarize_files(
+        self, deal_id: str, file_paths: list[Path], hashes: list[str], media_notes: dict[str, str] | None = None
+    ) -> list[tuple[str, bool]]:
+        excerpts = self._extract_texts(file_paths, TRIAGE_SUMMARY_TOKENS, hashes)
+        textual = [idx for idx, excerpt in enumerate(excerpts) if excerpt]
+        results = self._summarize_many([excerpts[idx] for idx in textual], deal_id=deal_id)
+        by_index = {idx: result for idx, result in zip(textual, results)}
+        unreadable = self._warn_unreadable_pdfs(
+            [path for idx, path in enumerate(file_paths) if idx not in by_index], deal_id=deal_id
+        )
+
+        outcomes: list[tuple[str, bool]] = []
+        for idx, file_path in enumerate(file_paths):
+            result = by_index.get(idx)
+            if result is None:
+                note = (media_notes or {}).get(hashes[idx])
+                if note:
+                    lead = f"{note}. Visual review required."
+                elif file_path in unreadable:
+                    lead = "PDF with no extractable text (scanned, or set in CID fonts). Manual review required."
+                else:
+                    lead = "Binary or non-text artifact. Manual review required."
+                outcomes.append((f"{lead} \nFile: {file_path.name} ({file_path.suffix.lower()})", True))
+                continue
+            if result.ok and result.summary:
+                outcomes.append((result.summary, False))
+                continue
 
-        try:
-            summary = self.llm_client.summarize_text(text_excerpt[:9000], deal_id=deal_id)
-            return summary, False
-        except GeminiAPIError as exc:
             self.store.log_action(
                 actor=self.name,
                 action="summary_fallback",
                 rationale="Gemini summary failed; fallback summary preserved pipeline continuity.",
                 status="completed",
                 deal_id=deal_id,
-                details={"error": str(exc), "file": str(file_path)},
+                details={"error": result.error, "file": str(file_path)},
             )
             fallback = "\n".join(
                 [
                     "LLM summary unavailable. Fallback excerpt:",
-                    text_excerpt[:600].strip() or "No textual content.",
+                    excerpts[idx][:600].strip() or "No textual content.",
                 ]
             )
-            return fallback, True
+            outcomes.append((fallback, True))
+        return outcomes
 
-    @staticmethod
-    def _read_text_excerpt(path: Path) -> str:
-        if path.suffix.lower() not in {".txt", ".md", ".csv", ".json"}:
-            return ""
-        try:
-            return path.read_text(encoding="utf-8", errors="ignore")
-        except OSError:
-            return ""
+    def _warn_unreadable_pdfs(self, paths: list[Path], deal_id: str | None = None) -> set[Path]:
+        """Record PDFs that yielded no text; the stream parser cannot read scans or CID-font text."""
+        unreadable = {path for path in paths if path.suffix.lower() == ".pdf"}
+        for path in sorted(unreadable):
+            self.store.log_action(
+                actor=self.name,
+                action="pdf_text_missing",
+                rationale="No text could be extracted; the PDF is likely scanned or uses CID fonts. Review it by hand.",
+                status="completed",
+                deal_id=deal_id,
+                details={"file": str(path)},
+            )
+        return unreadable
 
-    @staticmethod
-    def _unique_target_path(target: Path) -> Path:
-        if not target.exists():
-            return target
-        stem = target.stem
-        suffix = target.suffix
-        counter = 1
-        while True:
-            candidate = target.with_name(f"{stem}_{counter}{suffix}")
-            if not candidate.exists():
-                return candidate
+    def _library_text(self, item: LibraryFile) -> str:
+        return self._extract_texts([item.path], RETRIEVAL_INDEX_TOKENS, [item.content_hash])[0]
+
+    def _extract_texts(self, paths: list[Path], max_tokens: int, hashes: list[str] | None = None) -> list[str]:
+        if self.extractor is None:
+            return [extract_text(path, max_tokens * CHARS_PER_TOKEN)[0] for path in paths]
+        return self.extractor.extract_many(paths, max_tokens, hashes)
+
+    def _unique_target_path(self, target: Path, reserved: set[Path]) -> Path:
+        """First free `name`, `name_1`, `name_2`, ... per the document catalog and this batch's placements."""
+        taken = self.store.document_names_like(target.parent, target.stem, target.suffix)
+        taken.update(path.name for path in reserved if path.parent == target.parent)
+        candidate, counter = target, 1
+        while candidate.name in taken:
+            candidate = target.with_name(f"{target.stem}_{counter}{target.suffix}")
             counter += 1
+        return candidate
+
+    @staticmethod
+    def _summary_path(deal_root: Path, file_path: Path) -> Path:
+        # The full file name, suffix included, so report.pdf and report.docx get separate summaries.
+        return deal_root / "06_AI_Deliverables" / f"{file_path.name}_summary.md"
 
     @staticmethod
     def _write_summary_file(deal_root: Path, file_path: Path, summary: str) -> Path:
-        deliverable = deal_root / "06_AI_Deliverables" / f"{file_path.stem}_summary.md"
+        deliverable = LibrarianAgent._summary_path(deal_root, file_path)
         content = "\n".join(
             [
                 f"# Librarian Summary: {file_path.name}",
@@ -202,3 +415,24 @@ class LibrarianAgent(BaseAgent):
         )
         deliverable.write_text(content, encoding="utf-8")
         return deliverable
+
+
+
+@dataclass(slots=True)
+class _Placement:
+    staged_path: Path
+    target_path: Path
+    content_hash: str
+    new_blob: bool = False
+    duplicate: bool = False
+
+
+
+def _manifest_row(item: LibraryFile) -> dict[str, Any]:
+    return {
+        "file_path": str(item.path),
+        "ref_id": item.ref_id,
+        "size_bytes": item.size_bytes,
+        "mtime_ns": item.mtime_ns,
+        "content_hash": item.content_hash,
+    }
@@ -10,23 +10,34 @@ from pathlib import Path
 from typing import Any
 
 from partner_os.agents.base import BaseAgent
-from partner_os.constants import WA_TOKENS
+from partner_os.constants import DOCUMENT_KIND_CFO_REPORT, DOCUMENT_KIND_MARKET_REPORT, WA_TOKENS
 from partner_os.models import AgentResult, Task, TaskType
-from partner_os.services.filesystem import append_firm_inbox, deal_root, ensure_deal_jacket, newest_markdown_files
+from partner_os.services.address import normalize_address
+from partner_os.services.chunks import ChunkIndex, RetrievedPassage
+from partner_os.services.excerpt import read_excerpt
+from partner_os.services.filesystem import append_firm_inbox, deal_root
 from partner_os.services.ids import new_deal_id, new_task_id, slugify
+from partner_os.services.library import file_digest
 from partner_os.services.llm import GeminiAPIError, GeminiClient, NullLLMClient
+from partner_os.services.memory import ConversationMemory
 from partner_os.services.queue import SequentialTaskQueue
+from partner_os.services.watcher import group_by_hint, original_name, sidecar_path
 
 ADDRESS_PATTERN = re.compile(
     r"(?P<address>\d{1,6}\s+[\w\s.-]+?,\s*[\w\s.-]+?,\s*(?:WA|OR|ID|Washington|Oregon|Idaho)\b[^\n]*)",
     re.IGNORECASE,
 )
+INBOX_PASSAGE_QUERY = "rent income NOI expenses cap rate repairs roof foundation inspection zoning lease financing"
+INBOX_PASSAGE_TOKENS = 600
+CHAT_PASSAGE_TOKENS = 800
 
 
 @dataclass(slots=True)
 class ManagerAgent(BaseAgent):
     queue: SequentialTaskQueue
     llm_client: GeminiClient | NullLLMClient
+    memory: ConversationMemory
+    chunks: ChunkIndex | None = None
 
     def handle_user_message(
         self,
@@ -36,7 +47,7 @@ class ManagerAgent(BaseAgent):
         run_scout: bool = True,
     ) -> dict[str, Any]:
         """Create deal workflow from chat input and process queued tasks."""
-        self.store.insert_chat_message(role="user", content=message)
+        message_id = self.store.insert_chat_message(role="user", content=message)
 
         extracted_address = self._extract_address(message)
         if not extracted_address:
@@ -47,24 +58,8 @@ class ManagerAgent(BaseAgent):
             self.store.insert_chat_message(role="assistant", content=response)
             return {"deal_id": None, "response": response, "results": []}
 
-        deal_id = new_deal_id()
-        slug = slugify(extracted_address)
-        jurisdiction_warning = not self._is_wa_address(extracted_address)
-
-        self.store.create_deal(
-            deal_id=deal_id,
-            property_address=extracted_address,
-            slug=slug,
-            jurisdiction_warning=jurisdiction_warning,
-        )
-        self.store.log_action(
-            actor=self.name,
-            action="create_deal",
-            rationale="Initialized new deal from chat context.",
-            status="completed",
-            deal_id=deal_id,
-            details={"address": extracted_address, "jurisdiction_warning": jurisdiction_warning},
-        )
+        deal_id, slug, jurisdiction_warning = self._open_deal(extracted_address, source="chat context")
+        self.store.assign_chat_message(message_id, deal_id)
 
         self._delegate(
             deal_id=deal_id,
@@ -73,16 +68,7 @@ class ManagerAgent(BaseAgent):
             rationale="Initialize strict Deal Jacket before processing files.",
         )
 
-        for upload_path in uploaded_paths:
-            self._delegate(
-                deal_id=deal_id,
-                task_type=TaskType.triage_file,
-                payload={
-                    "staged_path": str(upload_path.resolve()),
-                    "original_name": upload_path.name,
-                },
-                rationale="Route uploaded artifact from staging to mapped Deal Jacket folder.",
-            )
+        self._delegate_triage(deal_id, [(path, path.name) for path in uploaded_paths])
 
         if run_scout:
             self._delegate(
@@ -110,8 +96,8 @@ class ManagerAgent(BaseAgent):
         results = self.queue.process_all()
 
         response = self._build_manager_reply(
-            message=message,
             deal_id=deal_id,
+            query=message,
             queue_results=[{"task_id": item.task_id, "success": item.success, "message": item.message} for item in results],
         )
         self.store.insert_chat_message(role="assistant", content=response, deal_id=deal_id)
@@ -123,26 +109,54 @@ class ManagerAgent(BaseAgent):
             "jurisdiction_warning": jurisdiction_warning,
         }
 
+    def intake_staged_files(self, paths: list[Path]) -> dict[str, Any]:
+        """Route settled `_STAGING_INBOX` files to deals by their hint and run the triage tasks.
+
+        Files without a resolvable hint stay in the inbox for a chat upload to claim.
+        """
+        routed: dict[str, list[str]] = {}
+        unmatched: list[str] = []
+        for hint, group in group_by_hint(paths, self.config.staging_inbox_dir).items():
+            deal_id = self._deal_for_hint(hint) if hint else None
+            if deal_id is None:
+                unmatched.extend(str(path) for path in group)
+                continue
+            self._delegate_triage(deal_id, [(path, original_name(path)) for path in group])
+            routed.setdefault(deal_id, []).extend(str(path) for path in group)
+
+        if unmatched:
+            self.store.log_action(
+                actor=self.name,
+                action="intake_unmatched",
+                rationale="No sidecar, subfolder or filename prefix named a known deal or an address.",
+                status="skipped",
+                details={"files": unmatched},
+            )
+        results = self.queue.process_all()
+        for path in paths:
+            sidecar = sidecar_path(path)
+            if not path.exists() and sidecar.exists():
+                sidecar.unlink()
+        return {"routed": routed, "unmatched": unmatched, "results": results}
+
     def append_firm_inbox_task(self, task: Task) -> AgentResult:
         deal = self.store.get_deal(task.deal_id)
         if not deal:
             raise ValueError(f"Deal not found: {task.deal_id}")
 
-        deal_path = ensure_deal_jacket(self.config, task.deal_id, deal["slug"])
         underwriting = json.loads(deal["underwriting_json"]) if deal["underwriting_json"] else {}
 
-        market_files = newest_markdown_files(deal_path / "04_Intel_Docs", limit=1)
-        market_excerpt = "No Scout report found."
-        if market_files:
-            market_excerpt = self._read_excerpt(market_files[0])
+        market_report = self._latest_market_report(task.deal_id, deal["slug"])
+        market_excerpt = self._read_excerpt(market_report) if market_report else "No Scout report found."
 
-        cfo_files = newest_markdown_files(deal_path / "06_AI_Deliverables", limit=3)
-        cfo_report = next((path for path in cfo_files if path.name.startswith("cfo_underwriting_")), None)
+        cfo_row = self.store.latest_document(task.deal_id, DOCUMENT_KIND_CFO_REPORT)
+        cfo_report = Path(cfo_row["file_path"]) if cfo_row else None
 
         warning_prefix = "[OUT OF STATE WARNING] " if int(deal["jurisdiction_warning"]) == 1 else ""
         timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%SZ")
 
         synthesis = self._build_synthesis(underwriting, market_excerpt)
+        passages = self._retrieve(task.deal_id, INBOX_PASSAGE_QUERY, INBOX_PASSAGE_TOKENS)
 
         lines = [
             f"## {warning_prefix}{task.deal_id} - {deal['property_address']}",
@@ -162,9 +176,12 @@ class ManagerAgent(BaseAgent):
             "### Superintelligence Synthesis",
             synthesis,
             "",
+            "### Relevant Passages",
+            *([f"- {passage.render()}" for passage in passages] or ["- No indexed passages matched."]),
+            "",
             "### Artifacts",
             f"- CFO Report: `{cfo_report}`" if cfo_report else "- CFO Report: `not generated`",
-            f"- Market Context: `{market_files[0]}`" if market_files else "- Market Context: `not generated`",
+            f"- Market Context: `{market_report}`" if market_report else "- Market Context: `not generated`",
             "",
             "### Required Human Action",
             "- Review this summary and any draft deliverables before any external communication.",
@@ -202,11 +219,90 @@ class ManagerAgent(BaseAgent):
             },
         )
 
-    def _build_manager_reply(self, message: str, deal_id: str, queue_results: list[dict[str, Any]]) -> str:
-        transcript = [
-            {"role": "user", "content": message},
-            {"role": "system", "content": f"Queue results: {queue_results}"},
-        ]
+    def _open_deal(self, extracted_address: str, source: str) -> tuple[str, str, bool]:
+        """Reuse the deal for a normalized address or create one; returns `(deal_id, slug, jurisdiction_warning)`."""
+        address_key = normalize_address(extracted_address)
+        jurisdiction_warning = not self._is_wa_address(extracted_address)
+        existing = self.store.get_deal_by_address_key(address_key)
+
+        if existing:
+            deal_id = existing["deal_id"]
+            self.store.log_action(
+                actor=self.name,
+                action="reuse_deal",
+                rationale="Address matches an existing deal after normalization.",
+                status="completed",
+                deal_id=deal_id,
+                details={"address": extracted_address, "address_key": address_key},
+            )
+            return deal_id, existing["slug"], jurisdiction_warning
+
+        deal_id = new_deal_id()
+        slug = slugify(address_key)
+        self.store.create_deal(
+            deal_id=deal_id,
+            property_address=extracted_address,
+            slug=slug,
+            jurisdiction_warning=jurisdiction_warning,
+        )
+        self.store.link_deal_address(address_key, deal_id)
+        self.store.log_action(
+            actor=self.name,
+            action="create_deal",
+            rationale=f"Initialized new deal from {source}.",
+            status="completed",
+            deal_id=deal_id,
+            details={"address": extracted_address, "jurisdiction_warning": jurisdiction_warning},
+        )
+        return deal_id, slug, jurisdiction_warning
+
+    def _deal_for_hint(self, hint: str) -> str | None:
+        """A hint may be a deal id, a deal slug or a full address (which opens a deal if needed)."""
+        deal = self.store.get_deal(hint) or self.store.get_deal_by_slug(hint)
+        if deal is not None:
+            return deal["deal_id"]
+        address = self._extract_address(hint)
+        if address is None:
+            return None
+        return self._open_deal(address, source="staging inbox hint")[0]
+
+    def _delegate_triage(self, deal_id: str, uploads: list[tuple[Path, str]]) -> None:
+        if len(uploads) > 1:
+            self._delegate(
+                deal_id=deal_id,
+                task_type=TaskType.triage_batch,
+                payload={
+                    "files": [
+                        {"staged_path": str(upload_path.resolve()), "original_name": name}
+                        for upload_path, name in uploads
+                    ]
+                },
+                rationale="Route uploaded artifacts from staging to mapped Deal Jacket folders in one batch.",
+            )
+        elif uploads:
+            upload_path, name = uploads[0]
+            self._delegate(
+                deal_id=deal_id,
+                task_type=TaskType.triage_file,
+                payload={
+                    "staged_path": str(upload_path.resolve()),
+                    "original_name": name,
+                },
+                rationale="Route uploaded artifact from staging to mapped Deal Jacket folder.",
+            )
+
+    def _build_manager_reply(self, deal_id: str, query: str, queue_results: list[dict[str, Any]]) -> str:
+        transcript = self.memory.build_transcript(deal_id)
+        transcript.append({"role": "system", "content": f"Queue results: {queue_results}"})
+        passages = self._retrieve(deal_id, query, CHAT_PASSAGE_TOKENS)
+        if passages:
+            transcript.append(
+                {
+                    "role": "system",
+                    "content": "Relevant passages from deal documents and firm doctrine (cite the file):\n"
+                    + "\n".join(passage.render() for passage in passages),
+                }
+            )
         try:
             return self.llm_client.chat_reply(transcript=transcript, deal_id=deal_id)
         except GeminiAPIError as exc:
@@ -223,6 +319,11 @@ class ManagerAgent(BaseAgent):
                 "review 00_FIRM_INBOX.md for actionable summary."
             )
 
+    def _retrieve(self, deal_id: str, query: str, token_budget: int) -> list[RetrievedPassage]:
+        if self.chunks is None:
+            return []
+        return self.chunks.retrieve(deal_id, query, token_budget=token_budget)
+
     @staticmethod
     def _extract_address(message: str) -> str | None:
         match = ADDRESS_PATTERN.search(message)
@@ -235,10 +336,35 @@ class ManagerAgent(BaseAgent):
         normalized = address.lower()
         return any(token in normalized for token in WA_TOKENS)
 
+    def _latest_market_report(self, deal_id: str, slug: str) -> Path | None:
+        """Newest Scout report from the catalog.
+
+        Scout reports written before the catalog existed have no row. When a
+        deal has none, its reports folder is scanned once and what it finds is
+        catalogued, so the next lookup is a query again.
+        """
+        row = self.store.latest_document(deal_id, DOCUMENT_KIND_MARKET_REPORT)
+        if row is not None:
+            return Path(row["file_path"])
+        # Timestamped names (market_context_YYYYmmdd_HHMMSS.md) sort chronologically.
+        found = sorted((deal_root(self.config, deal_id, slug) / "04_Intel_Docs").glob("market_context_*.md"))
+        for path in found:
+            self.store.insert_document(
+                deal_id=deal_id,
+                category="04_Intel_Docs",
+                file_path=path,
+                summary="Scout market context report",
+                kind=DOCUMENT_KIND_MARKET_REPORT,
+                size_bytes=path.stat().st_size,
+                content_hash=file_digest(path),
+                replace=True,
+            )
+        return found[-1] if found else None
+
     @staticmethod
     def _read_excerpt(path: Path, limit: int = 700) -> str:
         try:
-            return path.read_text(encoding="utf-8", errors="ignore")[:limit].strip()
+            return read_excerpt(path, head_chars=limit)[0].strip()
         except OSError:
             return "Unable to read report excerpt."
 
@@ -3,19 +3,40 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from datetime import datetime
 from pathlib import Path
 
 from partner_os.agents.base import BaseAgent
-from partner_os.models import AgentResult, ScoutClaim, Task
+from partner_os.constants import DOCUMENT_KIND_MARKET_REPORT
+from partner_os.models import AgentResult, ParcelRecord, ScoutClaim, Task
+from partner_os.services.async_runner import AsyncFanout
+from partner_os.services.chunks import ChunkIndex
 from partner_os.services.filesystem import ensure_deal_jacket
-from partner_os.services.search import WebSearchClient
+from partner_os.services.library import file_digest
+from partner_os.services.pages import FetchedPage, PageFetcher
+from partner_os.services.parcels import ParcelClient
+from partner_os.services.search import WebSearchClient, canonical_url, score_claims
+from partner_os.services.search_cache import CachedSearchClient
+from partner_os.services.signals import extract_signals, geography_for_address, history_conflicts
+
+MARKET_SUB_QUERIES = {
+    "cap_rates": "{address} Vancouver Clark County multifamily cap rate",
+    "rates": "SOFR 10-year treasury yield commercial real estate lending",
+    "zoning": "{address} Clark County zoning land use",
+    "employers": "Vancouver WA major employers expansion",
+    "infrastructure": "Vancouver Clark County infrastructure transportation projects",
+}
 
 
 @dataclass(slots=True)
 class ScoutAgent(BaseAgent):
-    search_client: WebSearchClient
+    search_client: WebSearchClient | CachedSearchClient
+    page_fetcher: PageFetcher | None = None
+    parcel_client: ParcelClient | None = None
+    chunks: ChunkIndex | None = None
+    fanout: AsyncFanout | None = None
 
     def run_market_scan_task(self, task: Task) -> AgentResult:
         deal = self.store.get_deal(task.deal_id)
@@ -23,22 +44,38 @@ class ScoutAgent(BaseAgent):
             raise ValueError(f"Deal not found: {task.deal_id}")
 
         property_address = deal["property_address"]
-        query = (
-            f"{property_address} Vancouver Clark County cap rate SOFR "
-            "10-year treasury infrastructure zoning employers"
-        )
+        claims, failed_topics = self._scan(property_address)
+        pages = self.page_fetcher.fetch_many(claim.url for claim in claims) if self.page_fetcher else {}
+        signals = extract_signals(self._with_page_text(claims, pages), geography_for_address(property_address))
+        conflict_notes = self._detect_market_conflicts(claims) + history_conflicts(self.store, signals)
+        self.store.insert_market_signals(signals, deal_id=task.deal_id)
+        parcel, parcel_error = self._lookup_parcel(property_address)
 
-        claims = self.search_client.search(query=query, limit=8)
-        conflict_notes = self._detect_market_conflicts(claims)
-
-        deal_root = ensure_deal_jacket(self.config, task.deal_id, deal["slug"])
+        deal_root = ensure_deal_jacket(self.config, task.deal_id, deal["slug"], self.store)
         report_path = self._write_market_report(
             deal_root=deal_root,
             deal_id=task.deal_id,
             property_address=property_address,
             claims=claims,
             conflict_notes=conflict_notes,
+            pages=pages,
+            parcel=parcel,
+        )
+        report_hash = file_digest(report_path)
+        self.store.insert_document(
+            deal_id=task.deal_id,
+            category="04_Intel_Docs",
+            file_path=report_path,
+            summary="Scout market context report",
+            kind=DOCUMENT_KIND_MARKET_REPORT,
+            size_bytes=report_path.stat().st_size,
+            content_hash=report_hash,
+            replace=True,
         )
+        if self.chunks is not None:
+            self.chunks.index_text(
+                report_path, report_path.read_text(encoding="utf-8"), deal_id=task.deal_id, content_hash=report_hash
+            )
 
         return AgentResult(
             summary="Scout market intelligence report generated",
@@ -47,9 +84,90 @@ class ScoutAgent(BaseAgent):
                 "report_path": str(report_path),
                 "claims_count": len(claims),
                 "conflicts": conflict_notes,
+                "failed_topics": failed_topics,
+                "signals_count": len(signals),
+                "pages_fetched": sum(1 for page in pages.values() if page.status in {"fetched", "revalidated"}),
+                "parcel_id": parcel.parcel_id if parcel else None,
+                "parcel_error": parcel_error,
             },
         )
 
+    def _scan(
+        self,
+        property_address: str,
+        per_query_limit: int = 6,
+        max_claims: int = 12,
+    ) -> tuple[list[ScoutClaim], list[str]]:
+        """Run focused sub-queries concurrently and merge them into one ranked claim set.
+
+        With a `fanout`, cache misses are fetched together on its event loop;
+        otherwise each sub-query gets its own thread.
+        """
+        queries = {topic: template.format(address=property_address) for topic, template in MARKET_SUB_QUERIES.items()}
+        if self.fanout is not None:
+            outcomes = dict(zip(queries, self._fan_out(self.fanout, list(queries.values()), per_query_limit)))
+        else:
+
+            def run(query: str) -> list[ScoutClaim] | Exception:
+                try:
+                    return self.search_client.search(query=query, limit=per_query_limit)
+                except Exception as exc:  # noqa: BLE001
+                    return exc
+
+            with ThreadPoolExecutor(max_workers=len(queries), thread_name_prefix="scout-query") as pool:
+                outcomes = dict(zip(queries, pool.map(run, queries.values())))
+
+        failed = {topic: outcome for topic, outcome in outcomes.items() if isinstance(outcome, Exception)}
+        if len(failed) == len(outcomes):
+            raise next(iter(failed.values()))
+
+        batches = [outcome for outcome in outcomes.values() if not isinstance(outcome, Exception)]
+        return self._merge_claims(batches)[:max_claims], sorted(failed)
+
+    def _fan_out(self, fanout: AsyncFanout, queries: list[str], limit: int) -> list[list[ScoutClaim] | Exception]:
+        if isinstance(self.search_client, CachedSearchClient):
+            outcomes = self.search_client.search_many(queries, limit, fanout.search_many)
+        else:
+            outcomes = fanout.search_many(queries, limit=limit)
+        return [
+            outcome if isinstance(outcome, (list, Exception)) else RuntimeError(repr(outcome)) for outcome in outcomes
+        ]
+
+    def _lookup_parcel(self, property_address: str) -> tuple[ParcelRecord | None, str | None]:
+        if self.parcel_client is None:
+            return None, None
+        try:
+            return self.parcel_client.lookup(property_address), None
+        except Exception as exc:  # noqa: BLE001
+            return None, str(exc)
+
+    @staticmethod
+    def _merge_claims(batches: list[list[ScoutClaim]]) -> list[ScoutClaim]:
+        """Re-score, drop blocked sources, dedupe by canonical URL merging snippets, rank by confidence."""
+        merged: dict[str, ScoutClaim] = {}
+        for claims in batches:
+            for claim in score_claims(claims):
+                if claim.confidence_label == "Blocked":
+                    continue
+                key = canonical_url(claim.url)
+                existing = merged.get(key)
+                if existing is None:
+                    merged[key] = claim
+                elif claim.summary and claim.summary not in existing.summary:
+                    merged[key] = replace(existing, summary=f"{existing.summary} ... {claim.summary}")
+        return sorted(merged.values(), key=lambda claim: claim.confidence_score, reverse=True)
+
+    @staticmethod
+    def _with_page_text(claims: list[ScoutClaim], pages: dict[str, FetchedPage]) -> list[ScoutClaim]:
+        """Extend snippets with fetched page text so signal extraction sees the full source."""
+        enriched = []
+        for claim in claims:
+            page = pages.get(claim.url)
+            if page and page.text:
+                claim = replace(claim, summary=f"{claim.summary}\n{page.text}")
+            enriched.append(claim)
+        return enriched
+
     @staticmethod
     def _detect_market_conflicts(claims: list[ScoutClaim]) -> list[str]:
         cap_rates: list[float] = []
@@ -74,6 +192,12 @@ class ScoutAgent(BaseAgent):
             ]
         return []
 
+    @staticmethod
+    def _cache_note(claim: ScoutClaim) -> str:
+        if claim.cache_age_seconds is None:
+            return " (live)"
+        return f" (cached, {claim.cache_age_seconds}s old)"
+
     @staticmethod
     def _write_market_report(
         deal_root: Path,
@@ -81,6 +205,8 @@ class ScoutAgent(BaseAgent):
         property_address: str,
         claims: list[ScoutClaim],
         conflict_notes: list[str],
+        pages: dict[str, FetchedPage] | None = None,
+        parcel: ParcelRecord | None = None,
     ) -> Path:
         ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
         report_path = deal_root / "04_Intel_Docs" / f"market_context_{ts}.md"
@@ -106,9 +232,28 @@ class ScoutAgent(BaseAgent):
                 [
                     f"### {claim.title}",
                     f"- Confidence: **{claim.confidence_label} ({claim.confidence_score}%)**",
-                    f"- Timestamp (UTC): `{claim.timestamp_utc}`",
+                    f"- Timestamp (UTC): `{claim.timestamp_utc}`{ScoutAgent._cache_note(claim)}",
                     f"- Source: {claim.url}",
                     f"- Summary: {claim.summary}",
+                ]
+            )
+            page = (pages or {}).get(claim.url)
+            if page:
+                detail = f" ({len(page.text)} chars)" if page.text else f" ({page.error})" if page.error else ""
+                lines.append(f"- Page: {page.status}{detail}")
+            lines.append("")
+
+        if parcel:
+            lines.extend(
+                [
+                    "## Parcel (Clark County GIS)",
+                    "",
+                    f"- Parcel ID: `{parcel.parcel_id}`",
+                    f"- Situs: {parcel.property_address}",
+                    f"- Zoning: {parcel.zoning_code or 'Unknown'}",
+                    f"- Lot size (sf): {parcel.lot_size_sf or 'Unknown'}",
+                    f"- Building (sf): {parcel.building_sqft or 'Unknown'} | Year built: {parcel.year_built or 'Unknown'}",
+                    f"- Assessed value: ${parcel.assessed_value:,.0f}",
                     "",
                 ]
             )
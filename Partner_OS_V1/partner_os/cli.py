@@ -4,19 +4,106 @@ from __future__ import annotations
 
 import argparse
 import json
+from dataclasses import asdict
 from pathlib import Path
 
 from partner_os.runtime import build_runtime
+from partner_os.services.address import GeocodeCache
+from partner_os.services.comps import subject_from_cache, write_analysis_comps
+from partner_os.services.ids import slugify
+from partner_os.services.parcel_db import ParcelIndex
+from partner_os.services.parcels import ParcelClient
+from partner_os.services.watcher import StagingWatcher
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Partner OS utility CLI")
-    parser.add_argument("command", choices=["init", "status"], help="Command to run")
+    parser.add_argument(
+        "command",
+        choices=["init", "status", "parcel", "import-parcels", "comps", "import-comps", "watch", "search-library"],
+        help="Command to run",
+    )
+    parser.add_argument(
+        "targets",
+        nargs="*",
+        help=(
+            "Addresses for `parcel`/`comps`; GeoJSON/GeoJSONSeq taxlot exports for `import-parcels`; "
+            "sales CSVs for `import-comps`; query words for `search-library`"
+        ),
+    )
+    parser.add_argument(
+        "--deals-dir",
+        type=Path,
+        help="With `comps`: also write comps_arv/comps_summary into <deals-dir>/<address-slug>/analysis.json",
+    )
     args = parser.parse_args()
+    if args.command in {"parcel", "import-parcels", "comps", "import-comps", "search-library"} and not args.targets:
+        parser.error(f"{args.command} requires at least one argument")
 
     runtime = build_runtime()
 
-    if args.command == "init":
+    if args.command == "parcel":
+        client = ParcelClient(local=ParcelIndex(runtime.store), cache=GeocodeCache(runtime.store))
+        records = client.lookup_many(args.targets)
+        print(json.dumps({address: asdict(record) if record else None for address, record in records.items()}, indent=2))
+    elif args.command == "import-parcels":
+        index = ParcelIndex(runtime.store)
+        for path in args.targets:
+            print(f"Imported {index.import_geojson(Path(path))} parcels from {path}")
+    elif args.command == "import-comps":
+        for path in args.targets:
+            print(f"Imported {runtime.cfo.comps.import_csv(Path(path))} sales from {path}")
+    elif args.command == "comps":
+        ParcelClient(local=ParcelIndex(runtime.store), cache=GeocodeCache(runtime.store)).lookup_many(args.targets)
+        subjects = {address: subject_from_cache(runtime.store, address) for address in args.targets}
+        located = [address for address, subject in subjects.items() if subject]
+        estimates = dict(zip(located, runtime.cfo.comps.estimate_many([subjects[address] for address in located])))
+        report = {}
+        for address in args.targets:
+            estimate = estimates.get(address)
+            report[address] = None if estimate is None else {
+                "arv": estimate.arv,
+                "low": estimate.low,
+                "high": estimate.high,
+                "stdev": estimate.stdev,
+                "comps_summary": estimate.summary,
+            }
+            if estimate is not None and args.deals_dir is not None:
+                analysis_path = args.deals_dir / slugify(address) / "analysis.json"
+                report[address]["analysis_updated"] = write_analysis_comps(analysis_path, estimate)
+        print(json.dumps(report, indent=2))
+    elif args.command == "watch":
+        watcher = StagingWatcher(
+            runtime.config.staging_inbox_dir,
+            settle_seconds=runtime.config.staging_watch_settle_seconds,
+            poll_seconds=runtime.config.staging_watch_poll_seconds,
+        )
+        print(f"Watching {runtime.config.staging_inbox_dir} ({watcher.mode}); Ctrl-C to stop.")
+        try:
+            while True:
+                ready = watcher.poll()
+                if not ready:
+                    continue
+                intake = runtime.manager.intake_staged_files(ready)
+                print(
+                    json.dumps(
+                        {
+                            "routed": intake["routed"],
+                            "unmatched": intake["unmatched"],
+                            "failed": [item.message for item in intake["results"] if not item.success],
+                        },
+                        indent=2,
+                    )
+                )
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.close()
+            runtime.close()
+    elif args.command == "search-library":
+        vectors = runtime.librarian.chunks.vectors
+        print(json.dumps(vectors.search_library(" ".join(args.targets)) if vectors else [], indent=2))
+    elif args.command == "init":
         runtime.librarian.index_firm_library()
         print("Initialized Partner OS runtime and indexed library.")
     elif args.command == "status":
@@ -26,6 +113,7 @@ def main() -> None:
             "deals": len(runtime.store.list_deals()),
             "tasks_pending": runtime.queue.pending_count,
             "action_logs": len(runtime.store.list_action_logs(limit=1000)),
+            "geocode_cache": runtime.store.get_cache_metrics("geocode"),
         }
         print(json.dumps(data, indent=2))
 
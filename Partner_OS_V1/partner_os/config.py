@@ -9,10 +9,14 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 from partner_os.constants import (
+    BLOB_STORE_DIRNAME,
     DATABASE_FILENAME,
     FIRM_INBOX_FILENAME,
     FIRM_LIBRARY_DIRNAME,
+    PAGE_CACHE_DIRNAME,
     STAGING_DIRNAME,
+    THUMBNAIL_CACHE_DIRNAME,
+    VECTOR_INDEX_FILENAME,
 )
 
 
@@ -20,12 +24,51 @@ from partner_os.constants import (
 class AppConfig:
     root_dir: Path
     database_path: Path
+    vector_index_path: Path
     staging_inbox_dir: Path
     firm_library_dir: Path
     firm_inbox_path: Path
+    blob_store_dir: Path
+    thumbnail_cache_dir: Path
     gemini_api_key: str
     gemini_model: str
+    gemini_model_routes: dict[str, str]
+    gemini_fallback_model: str
+    gemini_hedge_request_types: frozenset[str]
+    gemini_hedge_min_delay_ms: int
     gemini_timeout_seconds: int
+    gemini_base_url: str
+    search_endpoint: str
+    search_cache_ttl_seconds: int
+    search_cache_stale_seconds: int
+    domain_reputation_path: Path | None
+    scout_fetch_pages: bool
+    page_cache_dir: Path
+    page_fetch_per_host: int
+    parcel_lookup_enabled: bool
+    gemini_max_concurrency: int
+    async_io: bool
+    async_max_in_flight: int
+    library_index_workers: int
+    library_index_batch_size: int
+    extract_workers: int
+    media_workers: int
+    gemini_requests_per_minute: int
+    chat_memory_turns: int
+    chat_memory_summary_chars: int
+    staging_watch_settle_seconds: float
+    staging_watch_poll_seconds: float
+
+
+
+def parse_model_routes(raw: str) -> dict[str, str]:
+    """Parse `request_type=model` pairs, e.g. `summary=gemini-2.0-flash-lite,chat=gemini-2.5-flash`."""
+    routes: dict[str, str] = {}
+    for item in raw.split(","):
+        request_type, sep, model = item.partition("=")
+        if sep and request_type.strip() and model.strip():
+            routes[request_type.strip()] = model.strip()
+    return routes
 
 
 
@@ -43,6 +86,7 @@ def load_config(root_override: Path | None = None) -> AppConfig:
             root_dir = Path(__file__).resolve().parents[1]
 
     database_path = root_dir / DATABASE_FILENAME
+    reputation_path = os.getenv("DOMAIN_REPUTATION_PATH", "").strip()
     staging_inbox_dir = root_dir / STAGING_DIRNAME
     firm_library_dir = root_dir / FIRM_LIBRARY_DIRNAME
     firm_inbox_path = root_dir / FIRM_INBOX_FILENAME
@@ -50,10 +94,40 @@ def load_config(root_override: Path | None = None) -> AppConfig:
     return AppConfig(
         root_dir=root_dir,
         database_path=database_path,
+        vector_index_path=root_dir / VECTOR_INDEX_FILENAME,
         staging_inbox_dir=staging_inbox_dir,
         firm_library_dir=firm_library_dir,
         firm_inbox_path=firm_inbox_path,
+        blob_store_dir=root_dir / BLOB_STORE_DIRNAME,
+        thumbnail_cache_dir=root_dir / THUMBNAIL_CACHE_DIRNAME,
         gemini_api_key=os.getenv("GEMINI_API_KEY", "").strip(),
         gemini_model=os.getenv("GEMINI_MODEL", "gemini-2.0-flash").strip(),
+        gemini_model_routes=parse_model_routes(os.getenv("GEMINI_MODEL_ROUTES", "")),
+        gemini_fallback_model=os.getenv("GEMINI_FALLBACK_MODEL", "").strip(),
+        gemini_hedge_request_types=frozenset(
+            item.strip() for item in os.getenv("GEMINI_HEDGE_REQUEST_TYPES", "chat").split(",") if item.strip()
+        ),
+        gemini_hedge_min_delay_ms=int(os.getenv("GEMINI_HEDGE_MIN_DELAY_MS", "250")),
         gemini_timeout_seconds=int(os.getenv("GEMINI_TIMEOUT_SECONDS", "20")),
+        gemini_base_url=os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com").strip().rstrip("/"),
+        search_endpoint=os.getenv("SEARCH_ENDPOINT", "https://duckduckgo.com/html/").strip(),
+        search_cache_ttl_seconds=int(os.getenv("SEARCH_CACHE_TTL_SECONDS", "3600")),
+        search_cache_stale_seconds=int(os.getenv("SEARCH_CACHE_STALE_SECONDS", "86400")),
+        domain_reputation_path=Path(reputation_path).expanduser() if reputation_path else None,
+        scout_fetch_pages=os.getenv("SCOUT_FETCH_PAGES", "1").strip().lower() not in {"0", "false", "no"},
+        page_cache_dir=root_dir / PAGE_CACHE_DIRNAME,
+        page_fetch_per_host=int(os.getenv("PAGE_FETCH_PER_HOST", "2")),
+        parcel_lookup_enabled=os.getenv("PARCEL_LOOKUP", "1").strip().lower() not in {"0", "false", "no"},
+        gemini_max_concurrency=int(os.getenv("GEMINI_MAX_CONCURRENCY", "4")),
+        async_io=os.getenv("ASYNC_IO", "0").strip().lower() in {"1", "true", "yes"},
+        async_max_in_flight=int(os.getenv("ASYNC_MAX_IN_FLIGHT", "200")),
+        library_index_workers=int(os.getenv("LIBRARY_INDEX_WORKERS", "4")),
+        library_index_batch_size=int(os.getenv("LIBRARY_INDEX_BATCH_SIZE", "32")),
+        extract_workers=int(os.getenv("EXTRACT_WORKERS", "2")),
+        media_workers=int(os.getenv("MEDIA_WORKERS", "2")),
+        gemini_requests_per_minute=int(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "60")),
+        chat_memory_turns=int(os.getenv("CHAT_MEMORY_TURNS", "8")),
+        chat_memory_summary_chars=int(os.getenv("CHAT_MEMORY_SUMMARY_CHARS", "2000")),
+        staging_watch_settle_seconds=float(os.getenv("STAGING_WATCH_SETTLE_SECONDS", "2")),
+        staging_watch_poll_seconds=float(os.getenv("STAGING_WATCH_POLL_SECONDS", "1")),
     )
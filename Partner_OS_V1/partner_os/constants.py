@@ -10,6 +10,10 @@ FIRM_INBOX_FILENAME = "00_FIRM_INBOX.md"
 FIRM_LIBRARY_DIRNAME = "00_FIRM_LIBRARY"
 STAGING_DIRNAME = "_STAGING_INBOX"
 DATABASE_FILENAME = "firm_intelligence.db"
+VECTOR_INDEX_FILENAME = "firm_vectors.f32"
+PAGE_CACHE_DIRNAME = "_PAGE_CACHE"
+BLOB_STORE_DIRNAME = "_BLOBS"
+THUMBNAIL_CACHE_DIRNAME = "_THUMBNAILS"
 
 DEAL_JACKET_SUBDIRS = (
     "01_Intel_Photos",
@@ -20,6 +24,13 @@ DEAL_JACKET_SUBDIRS = (
     "06_AI_Deliverables",
 )
 
+# `documents.kind`: what an artifact catalog row records.
+DOCUMENT_KIND_UPLOAD = "upload"
+DOCUMENT_KIND_SUMMARY = "summary"
+DOCUMENT_KIND_CFO_REPORT = "cfo_report"
+DOCUMENT_KIND_MARKET_REPORT = "market_report"
+DOCUMENT_KIND_JACKET = "jacket"
+
 EXTENSION_TO_SUBDIR = {
     ".jpg": "01_Intel_Photos",
     ".jpeg": "01_Intel_Photos",
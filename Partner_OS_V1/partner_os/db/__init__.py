@@ -1,5 +1,6 @@
 """Database package for Partner OS."""
 
 from partner_os.db.store import DataStore
+from partner_os.db.writer import BackgroundWriter, StoreWriter
 
-__all__ = ["DataStore"]
+__all__ = ["BackgroundWriter", "DataStore", "StoreWriter"]
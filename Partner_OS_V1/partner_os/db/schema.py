@@ -24,6 +24,9 @@ CREATE TABLE IF NOT EXISTS documents (
     file_path TEXT NOT NULL UNIQUE,
     summary TEXT,
     created_at TEXT NOT NULL,
+    kind TEXT NOT NULL DEFAULT 'upload',
+    size_bytes INTEGER,
+    content_hash TEXT,
     FOREIGN KEY (deal_id) REFERENCES deals(deal_id) ON DELETE CASCADE
 );
 
@@ -36,6 +39,16 @@ CREATE TABLE IF NOT EXISTS chat_messages (
     FOREIGN KEY (deal_id) REFERENCES deals(deal_id) ON DELETE SET NULL
 );
 
+CREATE INDEX IF NOT EXISTS idx_chat_messages_deal ON chat_messages(deal_id, message_id);
+
+CREATE TABLE IF NOT EXISTS conversation_memory (
+    deal_id TEXT PRIMARY KEY,
+    summary TEXT NOT NULL,
+    summarized_through_id INTEGER NOT NULL,
+    updated_at TEXT NOT NULL,
+    FOREIGN KEY (deal_id) REFERENCES deals(deal_id) ON DELETE CASCADE
+);
+
 CREATE TABLE IF NOT EXISTS library_index (
     ref_id TEXT PRIMARY KEY,
     title TEXT NOT NULL,
@@ -44,6 +57,179 @@ CREATE TABLE IF NOT EXISTS library_index (
     indexed_at TEXT NOT NULL
 );
 
+CREATE TABLE IF NOT EXISTS library_manifest (
+    file_path TEXT PRIMARY KEY,
+    ref_id TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    indexed_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_library_manifest_hash ON library_manifest(content_hash);
+
+CREATE TABLE IF NOT EXISTS text_extracts (
+    content_hash TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    char_budget INTEGER NOT NULL,
+    truncated INTEGER NOT NULL,
+    extracted_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS blobs (
+    content_hash TEXT PRIMARY KEY,
+    blob_path TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    ref_count INTEGER NOT NULL DEFAULT 0,
+    summary TEXT,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS blob_refs (
+    file_path TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    deal_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    FOREIGN KEY (content_hash) REFERENCES blobs(content_hash),
+    FOREIGN KEY (deal_id) REFERENCES deals(deal_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_blob_refs_deal_hash ON blob_refs(deal_id, content_hash);
+
+CREATE TABLE IF NOT EXISTS media_metadata (
+    content_hash TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    duration_seconds REAL,
+    captured_at TEXT,
+    latitude REAL,
+    longitude REAL,
+    camera TEXT,
+    thumbnail_path TEXT,
+    extracted_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS chunks (
+    chunk_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source_path TEXT NOT NULL,
+    deal_id TEXT,
+    content_hash TEXT NOT NULL,
+    ordinal INTEGER NOT NULL,
+    start_offset INTEGER NOT NULL,
+    end_offset INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    UNIQUE (source_path, ordinal),
+    FOREIGN KEY (deal_id) REFERENCES deals(deal_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_chunks_deal ON chunks(deal_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+    text, content='chunks', content_rowid='chunk_id', tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS chunks_fts_insert AFTER INSERT ON chunks BEGIN
+    INSERT INTO chunks_fts (rowid, text) VALUES (new.chunk_id, new.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS chunks_fts_delete AFTER DELETE ON chunks BEGIN
+    INSERT INTO chunks_fts (chunks_fts, rowid, text) VALUES ('delete', old.chunk_id, old.text);
+END;
+
+CREATE TABLE IF NOT EXISTS vector_rows (
+    row_id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    source_path TEXT NOT NULL,
+    ordinal INTEGER NOT NULL,
+    deal_id TEXT,
+    active INTEGER NOT NULL DEFAULT 1,
+    FOREIGN KEY (deal_id) REFERENCES deals(deal_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_vector_rows_source ON vector_rows(source_path, kind) WHERE active = 1;
+
+CREATE TABLE IF NOT EXISTS vector_df (
+    bucket INTEGER PRIMARY KEY,
+    df INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS search_cache (
+    cache_key TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    claims_json TEXT NOT NULL,
+    fetched_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS market_signals (
+    signal_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    deal_id TEXT,
+    geography TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    source_url TEXT NOT NULL,
+    source_domain TEXT NOT NULL,
+    confidence_score INTEGER NOT NULL,
+    observed_at TEXT NOT NULL,
+    UNIQUE (source_url, metric, value, observed_at),
+    FOREIGN KEY (deal_id) REFERENCES deals(deal_id) ON DELETE SET NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_market_signals_lookup ON market_signals(geography, metric, observed_at);
+CREATE INDEX IF NOT EXISTS idx_market_signals_source ON market_signals(source_domain, observed_at);
+
+CREATE TABLE IF NOT EXISTS parcels (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    parcel_id TEXT NOT NULL UNIQUE,
+    property_address TEXT NOT NULL,
+    zoning_code TEXT,
+    lot_size_sf REAL,
+    year_built INTEGER,
+    building_sqft REAL,
+    land_value REAL NOT NULL DEFAULT 0,
+    building_value REAL NOT NULL DEFAULT 0,
+    rings_json TEXT NOT NULL,
+    imported_at TEXT NOT NULL
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS parcel_rtree USING rtree(id, min_x, max_x, min_y, max_y);
+
+CREATE TABLE IF NOT EXISTS geocode_cache (
+    address_key TEXT PRIMARY KEY,
+    input_address TEXT NOT NULL,
+    x REAL,
+    y REAL,
+    wkid INTEGER,
+    score REAL,
+    matched_address TEXT,
+    parcel_id TEXT,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS cache_metrics (
+    cache_name TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS deal_addresses (
+    address_key TEXT PRIMARY KEY,
+    deal_id TEXT NOT NULL,
+    FOREIGN KEY (deal_id) REFERENCES deals(deal_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS comp_sales (
+    sale_id TEXT PRIMARY KEY,
+    address TEXT NOT NULL,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    sale_price REAL NOT NULL,
+    sale_date TEXT NOT NULL,
+    building_sqft REAL,
+    year_built INTEGER,
+    imported_at TEXT NOT NULL
+);
+
 CREATE TABLE IF NOT EXISTS tasks (
     task_id TEXT PRIMARY KEY,
     deal_id TEXT NOT NULL,
@@ -98,4 +284,34 @@ CREATE TABLE IF NOT EXISTS api_calls (
     details_json TEXT,
     FOREIGN KEY (deal_id) REFERENCES deals(deal_id) ON DELETE SET NULL
 );
+
+CREATE INDEX IF NOT EXISTS idx_api_calls_latency ON api_calls(model, request_type, status, timestamp);
+"""
+
+# Columns added after release. `CREATE TABLE IF NOT EXISTS` leaves an older
+# table as it was, so `DataStore` adds each missing column with ALTER TABLE
+# and then runs its backfill statement, if any. Scout reports were never
+# catalogued before `kind` existed; the Manager catalogues those on first lookup.
+COLUMN_MIGRATIONS: tuple[tuple[str, str, str, str | None], ...] = (
+    (
+        "documents",
+        "kind",
+        "TEXT NOT NULL DEFAULT 'upload'",
+        """
+        UPDATE documents SET kind = CASE
+            WHEN summary = 'Librarian artifact summary' THEN 'summary'
+            WHEN summary = 'Deterministic CFO underwriting report' THEN 'cfo_report'
+            WHEN category = '04_Intel_Docs' AND file_path LIKE '%market_context_%.md' THEN 'market_report'
+            ELSE 'upload'
+        END
+        """,
+    ),
+    ("documents", "size_bytes", "INTEGER", None),
+    ("documents", "content_hash", "TEXT", None),
+)
+
+# Indexes over migrated columns, created once the columns exist.
+MIGRATED_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_documents_deal_kind ON documents(deal_id, kind, created_at);
+CREATE INDEX IF NOT EXISTS idx_documents_hash ON documents(content_hash);
 """
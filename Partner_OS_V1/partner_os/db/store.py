@@ -4,45 +4,128 @@ from __future__ import annotations
 
 import json
 import sqlite3
+import threading
 import uuid
+import weakref
 from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Iterator
 
-from partner_os.db.schema import SCHEMA_SQL
+from partner_os.constants import DOCUMENT_KIND_JACKET, DOCUMENT_KIND_UPLOAD
+from partner_os.db.schema import COLUMN_MIGRATIONS, MIGRATED_INDEX_SQL, SCHEMA_SQL
+from partner_os.db.writer import BackgroundWriter
+from partner_os.models import MarketSignal
+
+SQL_PARAM_BATCH = 500
+
+
+class _ThreadConnection:
+    """One thread's connection, held in its `threading.local`; closed when that thread's locals are dropped."""
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        weakref.finalize(self, conn.close)
 
 
 class DataStore:
-    """Repository facade for Partner OS state."""
+    """Repository facade for Partner OS state.
+
+    Every thread gets its own SQLite connection, and `transaction()` is scoped
+    to the thread that opened it. Writes that worker threads issue (api_calls,
+    caches, text extracts) go through `_shared_write`. They commit immediately
+    when no transaction is open. Otherwise they are handed to a background
+    writer, so they never join, and are never rolled back with, another
+    thread's task transaction.
+    """
 
     def __init__(self, database_path: Path):
         self.database_path = database_path
         self.database_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(self.database_path, check_same_thread=False)
-        self._in_transaction = False
-        self._conn.row_factory = sqlite3.Row
-        self._conn.execute("PRAGMA journal_mode=WAL;")
-        self._conn.execute("PRAGMA foreign_keys=ON;")
+        self._local = threading.local()
+        self._connections: weakref.WeakSet[_ThreadConnection] = weakref.WeakSet()
+        self._lock = threading.RLock()
+        self._open_transactions = 0
+        self._writer = BackgroundWriter(self._connect)
         self._conn.executescript(SCHEMA_SQL)
+        self._migrate()
         self._commit_if_needed()
 
+    def _migrate(self) -> None:
+        """Bring a database created by an older release up to `SCHEMA_SQL`."""
+        for table, column, declaration, backfill in COLUMN_MIGRATIONS:
+            columns = {row["name"] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            if column in columns:
+                continue
+            self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+            if backfill:
+                self._conn.execute(backfill)
+        self._conn.executescript(MIGRATED_INDEX_SQL)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.database_path, check_same_thread=False, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA foreign_keys=ON;")
+        return conn
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        holder = getattr(self._local, "conn", None)
+        if holder is None:
+            holder = self._local.conn = _ThreadConnection(self._connect())
+            with self._lock:
+                self._connections.add(holder)
+        return holder.conn
+
+    @property
+    def _in_transaction(self) -> bool:
+        return getattr(self._local, "in_transaction", False)
+
+    @_in_transaction.setter
+    def _in_transaction(self, value: bool) -> None:
+        self._local.in_transaction = value
+
     def close(self) -> None:
-        self._conn.close()
+        self._writer.close()
+        with self._lock:
+            for holder in list(self._connections):
+                holder.conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def flush(self, timeout: float | None = 10.0) -> bool:
+        """Wait for deferred writes; skipped while a transaction is open, since they cannot land yet."""
+        if self._open_transactions:
+            return False
+        return self._writer.flush(timeout)
 
     @contextmanager
     def transaction(self) -> Iterator[sqlite3.Connection]:
-        """Atomic transaction context."""
+        """Atomic transaction context on the calling thread's connection.
+
+        BEGIN IMMEDIATE takes the write lock up front: under WAL a deferred
+        transaction that has already read cannot upgrade once the background
+        writer commits in between, and would fail with "database is locked".
+        """
+        conn = self._conn
+        with self._lock:
+            self._open_transactions += 1
         try:
             self._in_transaction = True
-            self._conn.execute("BEGIN")
-            yield self._conn
-            self._commit_if_needed()
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            self._in_transaction = False
+            conn.commit()
         except Exception:
-            self._conn.rollback()
+            conn.rollback()
             raise
         finally:
             self._in_transaction = False
+            with self._lock:
+                self._open_transactions -= 1
 
     @staticmethod
     def now_iso() -> str:
@@ -52,6 +135,15 @@ class DataStore:
         if not self._in_transaction:
             self._conn.commit()
 
+    def _shared_write(self, sql: str, params: tuple[Any, ...]) -> None:
+        """Write that may come from any thread and must stay out of open task transactions."""
+        with self._lock:
+            if not self._open_transactions:
+                self._conn.execute(sql, params)
+                self._conn.commit()
+                return
+        self._writer.submit(sql, params)
+
     def create_deal(self, deal_id: str, property_address: str, slug: str, jurisdiction_warning: bool) -> None:
         now = self.now_iso()
         self._conn.execute(
@@ -89,28 +181,84 @@ class DataStore:
         cur = self._conn.execute("SELECT * FROM deals WHERE deal_id = ?", (deal_id,))
         return cur.fetchone()
 
+    def get_deal_by_slug(self, slug: str) -> sqlite3.Row | None:
+        cur = self._conn.execute("SELECT * FROM deals WHERE slug = ? ORDER BY created_at DESC LIMIT 1", (slug,))
+        return cur.fetchone()
+
     def list_deals(self) -> list[sqlite3.Row]:
         cur = self._conn.execute("SELECT * FROM deals ORDER BY created_at DESC")
         return cur.fetchall()
 
-    def insert_document(self, deal_id: str, category: str, file_path: Path, summary: str | None) -> int:
+    def insert_document(
+        self,
+        deal_id: str,
+        category: str,
+        file_path: Path,
+        summary: str | None,
+        kind: str = DOCUMENT_KIND_UPLOAD,
+        size_bytes: int | None = None,
+        content_hash: str | None = None,
+        replace: bool = False,
+    ) -> int:
+        """Catalogue an artifact. A path already catalogued raises IntegrityError.
+
+        With `replace`, used for a report regenerated under the same
+        timestamped name, the existing row is updated instead.
+        """
+        upsert = """
+            ON CONFLICT(file_path) DO UPDATE SET
+                summary = excluded.summary,
+                created_at = excluded.created_at,
+                kind = excluded.kind,
+                size_bytes = excluded.size_bytes,
+                content_hash = excluded.content_hash
+        """
         cur = self._conn.execute(
-            """
-            INSERT INTO documents (deal_id, category, file_path, summary, created_at)
-            VALUES (?, ?, ?, ?, ?)
+            f"""
+            INSERT INTO documents (deal_id, category, file_path, summary, created_at, kind, size_bytes, content_hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            {upsert if replace else ""}
+            RETURNING document_id
             """,
-            (deal_id, category, str(file_path), summary, self.now_iso()),
+            (deal_id, category, str(file_path), summary, self.now_iso(), kind, size_bytes, content_hash),
         )
+        document_id = int(cur.fetchone()[0])
         self._commit_if_needed()
-        return int(cur.lastrowid)
+        return document_id
 
     def list_documents(self, deal_id: str) -> list[sqlite3.Row]:
+        """Artifacts filed for a deal, oldest first; the jacket's own catalog row is left out."""
         cur = self._conn.execute(
-            "SELECT * FROM documents WHERE deal_id = ? ORDER BY created_at ASC",
-            (deal_id,),
+            "SELECT * FROM documents WHERE deal_id = ? AND kind != ? ORDER BY created_at ASC",
+            (deal_id, DOCUMENT_KIND_JACKET),
         )
         return cur.fetchall()
 
+    def latest_document(self, deal_id: str, kind: str) -> sqlite3.Row | None:
+        cur = self._conn.execute(
+            """
+            SELECT * FROM documents
+            WHERE deal_id = ? AND kind = ?
+            ORDER BY created_at DESC, document_id DESC
+            LIMIT 1
+            """,
+            (deal_id, kind),
+        )
+        return cur.fetchone()
+
+    def document_names_like(self, directory: Path, stem: str, suffix: str) -> set[str]:
+        """Catalogued names in `directory` that are `stem + suffix` or `stem_<anything> + suffix`.
+
+        GLOB, unlike the default case-insensitive LIKE, is answered from the
+        unique index on `file_path` as a prefix range.
+        """
+        prefix = _glob_escape(str(directory / stem))
+        cur = self._conn.execute(
+            "SELECT file_path FROM documents WHERE file_path = ? OR file_path GLOB ?",
+            (str(directory / f"{stem}{suffix}"), f"{prefix}_*{_glob_escape(suffix)}"),
+        )
+        return {Path(row["file_path"]).name for row in cur.fetchall()}
+
     def insert_chat_message(self, role: str, content: str, deal_id: str | None = None) -> int:
         cur = self._conn.execute(
             """
@@ -129,6 +277,42 @@ class DataStore:
         )
         return cur.fetchall()[::-1]
 
+    def assign_chat_message(self, message_id: int, deal_id: str) -> None:
+        self._conn.execute(
+            "UPDATE chat_messages SET deal_id = ? WHERE message_id = ?",
+            (deal_id, message_id),
+        )
+        self._commit_if_needed()
+
+    def list_deal_chat_messages(self, deal_id: str, after_message_id: int = 0) -> list[sqlite3.Row]:
+        cur = self._conn.execute(
+            """
+            SELECT * FROM chat_messages
+            WHERE deal_id = ? AND message_id > ?
+            ORDER BY message_id ASC
+            """,
+            (deal_id, after_message_id),
+        )
+        return cur.fetchall()
+
+    def get_conversation_memory(self, deal_id: str) -> sqlite3.Row | None:
+        cur = self._conn.execute("SELECT * FROM conversation_memory WHERE deal_id = ?", (deal_id,))
+        return cur.fetchone()
+
+    def upsert_conversation_memory(self, deal_id: str, summary: str, summarized_through_id: int) -> None:
+        self._conn.execute(
+            """
+            INSERT INTO conversation_memory (deal_id, summary, summarized_through_id, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(deal_id) DO UPDATE SET
+                summary=excluded.summary,
+                summarized_through_id=excluded.summarized_through_id,
+                updated_at=excluded.updated_at
+            """,
+            (deal_id, summary, summarized_through_id, self.now_iso()),
+        )
+        self._commit_if_needed()
+
     def upsert_library_entry(self, ref_id: str, title: str, file_path: Path, doctrine_abstract: str) -> None:
         self._conn.execute(
             """
@@ -157,6 +341,499 @@ class DataStore:
         )
         return cur.fetchall()
 
+    def list_library_refs(self) -> dict[str, str]:
+        return dict(self._conn.execute("SELECT file_path, ref_id FROM library_index").fetchall())
+
+    def list_library_manifest(self) -> dict[str, sqlite3.Row]:
+        cur = self._conn.execute(
+            "SELECT file_path, ref_id, size_bytes, mtime_ns, content_hash FROM library_manifest"
+        )
+        return {row["file_path"]: row for row in cur.fetchall()}
+
+    def upsert_library_manifest(self, entries: list[dict[str, Any]]) -> None:
+        now = self.now_iso()
+        self._conn.executemany(
+            """
+            INSERT INTO library_manifest (file_path, ref_id, size_bytes, mtime_ns, content_hash, indexed_at)
+            VALUES (:file_path, :ref_id, :size_bytes, :mtime_ns, :content_hash, :indexed_at)
+            ON CONFLICT(file_path) DO UPDATE SET
+                ref_id=excluded.ref_id,
+                size_bytes=excluded.size_bytes,
+                mtime_ns=excluded.mtime_ns,
+                content_hash=excluded.content_hash,
+                indexed_at=excluded.indexed_at
+            """,
+            [{**entry, "indexed_at": now} for entry in entries],
+        )
+        self._commit_if_needed()
+
+    def move_library_entry(self, old_path: str, new_path: Path, title: str) -> None:
+        """Point an existing abstract at a renamed file, keeping its ref_id."""
+        self._conn.execute("DELETE FROM library_manifest WHERE file_path = ?", (old_path,))
+        self._conn.execute("DELETE FROM library_index WHERE file_path = ?", (str(new_path),))
+        self._conn.execute(
+            "UPDATE library_index SET file_path = ?, title = ? WHERE file_path = ?",
+            (str(new_path), title, old_path),
+        )
+        self._commit_if_needed()
+
+    def delete_library_paths(self, file_paths: list[str]) -> None:
+        params = [(path,) for path in file_paths]
+        self._conn.executemany("DELETE FROM library_index WHERE file_path = ?", params)
+        self._conn.executemany("DELETE FROM library_manifest WHERE file_path = ?", params)
+        self._commit_if_needed()
+
+    def get_text_extract(self, content_hash: str) -> sqlite3.Row | None:
+        self.flush()
+        cur = self._conn.execute("SELECT * FROM text_extracts WHERE content_hash = ?", (content_hash,))
+        return cur.fetchone()
+
+    def upsert_text_extract(self, content_hash: str, text: str, char_budget: int, truncated: bool) -> None:
+        self._shared_write(
+            """
+            INSERT INTO text_extracts (content_hash, text, char_budget, truncated, extracted_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(content_hash) DO UPDATE SET
+                text=excluded.text,
+                char_budget=excluded.char_budget,
+                truncated=excluded.truncated,
+                extracted_at=excluded.extracted_at
+            """,
+            (content_hash, text, char_budget, int(truncated), self.now_iso()),
+        )
+
+    def get_blob(self, content_hash: str) -> sqlite3.Row | None:
+        cur = self._conn.execute("SELECT * FROM blobs WHERE content_hash = ?", (content_hash,))
+        return cur.fetchone()
+
+    def find_blob_ref(self, deal_id: str, content_hash: str) -> sqlite3.Row | None:
+        cur = self._conn.execute(
+            "SELECT * FROM blob_refs WHERE deal_id = ? AND content_hash = ? ORDER BY created_at LIMIT 1",
+            (deal_id, content_hash),
+        )
+        return cur.fetchone()
+
+    def add_blob_ref(self, content_hash: str, blob_path: Path, size_bytes: int, file_path: Path, deal_id: str) -> None:
+        now = self.now_iso()
+        self._conn.execute(
+            """
+            INSERT INTO blobs (content_hash, blob_path, size_bytes, ref_count, created_at)
+            VALUES (?, ?, ?, 1, ?)
+            ON CONFLICT(content_hash) DO UPDATE SET
+                blob_path=excluded.blob_path,
+                ref_count=blobs.ref_count + 1
+            """,
+            (content_hash, str(blob_path), size_bytes, now),
+        )
+        self._conn.execute(
+            "INSERT INTO blob_refs (file_path, content_hash, deal_id, created_at) VALUES (?, ?, ?, ?)",
+            (str(file_path), content_hash, deal_id, now),
+        )
+        self._commit_if_needed()
+
+    def set_blob_summary(self, content_hash: str, summary: str) -> None:
+        self._conn.execute("UPDATE blobs SET summary = ? WHERE content_hash = ?", (summary, content_hash))
+        self._commit_if_needed()
+
+    def get_media_metadata(self, content_hash: str) -> sqlite3.Row | None:
+        self.flush()
+        cur = self._conn.execute("SELECT * FROM media_metadata WHERE content_hash = ?", (content_hash,))
+        return cur.fetchone()
+
+    def upsert_media_metadata(self, content_hash: str, metadata: dict[str, Any]) -> None:
+        columns = ["content_hash", *metadata, "extracted_at"]
+        updates = ", ".join(f"{column}=excluded.{column}" for column in columns[1:])
+        self._shared_write(
+            f"""
+            INSERT INTO media_metadata ({", ".join(columns)})
+            VALUES ({", ".join("?" * len(columns))})
+            ON CONFLICT(content_hash) DO UPDATE SET {updates}
+            """,
+            (content_hash, *metadata.values(), self.now_iso()),
+        )
+
+    def list_deal_media(self, deal_id: str, kind: str | None = None) -> list[sqlite3.Row]:
+        """Media filed in a deal's jacket, joined to its metadata, oldest capture first."""
+        self.flush()
+        cur = self._conn.execute(
+            """
+            SELECT r.file_path, m.*
+            FROM blob_refs r
+            JOIN media_metadata m ON m.content_hash = r.content_hash
+            WHERE r.deal_id = ? AND (? IS NULL OR m.kind = ?)
+            ORDER BY m.captured_at IS NULL, m.captured_at, r.created_at
+            """,
+            (deal_id, kind, kind),
+        )
+        return cur.fetchall()
+
+    def get_chunk_source_hash(self, source_path: Path) -> str | None:
+        cur = self._conn.execute("SELECT content_hash FROM chunks WHERE source_path = ? LIMIT 1", (str(source_path),))
+        row = cur.fetchone()
+        return row["content_hash"] if row else None
+
+    def replace_chunks(
+        self, source_path: Path, deal_id: str | None, content_hash: str, passages: list[tuple[int, int, str]]
+    ) -> None:
+        """Swap the passages indexed for `source_path`; the FTS index follows via triggers."""
+        self._conn.execute("DELETE FROM chunks WHERE source_path = ?", (str(source_path),))
+        self._conn.executemany(
+            """
+            INSERT INTO chunks (source_path, deal_id, content_hash, ordinal, start_offset, end_offset, text)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (str(source_path), deal_id, content_hash, ordinal, start, end, text)
+                for ordinal, (start, end, text) in enumerate(passages)
+            ],
+        )
+        self._commit_if_needed()
+
+    def move_chunks(self, old_path: str, new_path: Path) -> None:
+        self._conn.execute("DELETE FROM chunks WHERE source_path = ?", (str(new_path),))
+        self._conn.execute("UPDATE chunks SET source_path = ? WHERE source_path = ?", (str(new_path), old_path))
+        self._commit_if_needed()
+
+    def delete_chunks(self, source_paths: list[str]) -> None:
+        self._conn.executemany("DELETE FROM chunks WHERE source_path = ?", [(path,) for path in source_paths])
+        self._commit_if_needed()
+
+    def search_chunks(
+        self, match: str, deal_id: str | None, include_library: bool = True, limit: int = 24
+    ) -> list[sqlite3.Row]:
+        """Best FTS matches (lowest bm25 first) among a deal's chunks and, optionally, the firm library's."""
+        cur = self._conn.execute(
+            """
+            SELECT c.chunk_id, c.source_path, c.deal_id, c.ordinal, c.start_offset, c.end_offset, c.text,
+                   bm25(chunks_fts) AS score
+            FROM chunks_fts
+            JOIN chunks c ON c.chunk_id = chunks_fts.rowid
+            WHERE chunks_fts MATCH ? AND (c.deal_id IS ? OR (? AND c.deal_id IS NULL))
+            ORDER BY score
+            LIMIT ?
+            """,
+            (match, deal_id, int(include_library), limit),
+        )
+        return cur.fetchall()
+
+    def get_chunks(self, keys: list[tuple[str, int]]) -> list[sqlite3.Row]:
+        """Chunks by `(source_path, ordinal)`, in no particular order."""
+        rows: list[sqlite3.Row] = []
+        for source_path, ordinal in keys:
+            cur = self._conn.execute(
+                "SELECT * FROM chunks WHERE source_path = ? AND ordinal = ?", (source_path, ordinal)
+            )
+            rows.extend(cur.fetchall())
+        return rows
+
+    def get_library_entries(self, file_paths: list[str]) -> list[sqlite3.Row]:
+        rows: list[sqlite3.Row] = []
+        for start in range(0, len(file_paths), SQL_PARAM_BATCH):
+            batch = file_paths[start : start + SQL_PARAM_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            cur = self._conn.execute(f"SELECT * FROM library_index WHERE file_path IN ({placeholders})", batch)
+            rows.extend(cur.fetchall())
+        return rows
+
+    def insert_vector_rows(self, rows: list[tuple[int, str, str, int, str | None]]) -> None:
+        self._conn.executemany(
+            "INSERT INTO vector_rows (row_id, kind, source_path, ordinal, deal_id) VALUES (?, ?, ?, ?, ?)", rows
+        )
+        self._commit_if_needed()
+
+    def deactivate_vector_rows(self, source_paths: list[str], kind: str | None = None) -> list[int]:
+        """Mark the active rows of `source_paths` (optionally of one `kind`) inactive; returns their row ids."""
+        row_ids: list[int] = []
+        for source_path in source_paths:
+            cur = self._conn.execute(
+                "SELECT row_id FROM vector_rows WHERE source_path = ? AND active = 1 AND (? IS NULL OR kind = ?)",
+                (source_path, kind, kind),
+            )
+            row_ids.extend(row["row_id"] for row in cur.fetchall())
+        self._conn.executemany("UPDATE vector_rows SET active = 0 WHERE row_id = ?", [(row_id,) for row_id in row_ids])
+        self._commit_if_needed()
+        return row_ids
+
+    def move_vector_rows(self, old_path: str, new_path: Path) -> None:
+        self._conn.execute(
+            "UPDATE vector_rows SET source_path = ? WHERE source_path = ? AND active = 1", (str(new_path), old_path)
+        )
+        self._commit_if_needed()
+
+    def get_vector_rows(
+        self,
+        row_ids: list[int],
+        deal_id: str | None,
+        include_library: bool = True,
+        kinds: tuple[str, ...] | None = None,
+    ) -> list[sqlite3.Row]:
+        """Active rows among `row_ids` in scope: the deal's, plus deal-less rows with `include_library`."""
+        rows: list[sqlite3.Row] = []
+        for start in range(0, len(row_ids), SQL_PARAM_BATCH):
+            batch = row_ids[start : start + SQL_PARAM_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            cur = self._conn.execute(
+                f"""
+                SELECT * FROM vector_rows
+                WHERE row_id IN ({placeholders}) AND active = 1 AND (deal_id IS ? OR (? AND deal_id IS NULL))
+                """,
+                (*batch, deal_id, int(include_library)),
+            )
+            rows.extend(row for row in cur.fetchall() if kinds is None or row["kind"] in kinds)
+        return rows
+
+    def count_vector_rows(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM vector_rows WHERE active = 1").fetchone()[0]
+
+    def get_vector_df(self) -> dict[int, int]:
+        return dict(self._conn.execute("SELECT bucket, df FROM vector_df").fetchall())
+
+    def add_vector_df(self, deltas: dict[int, int]) -> None:
+        self._conn.executemany(
+            """
+            INSERT INTO vector_df (bucket, df) VALUES (?, ?)
+            ON CONFLICT(bucket) DO UPDATE SET df = vector_df.df + excluded.df
+            """,
+            list(deltas.items()),
+        )
+        self._commit_if_needed()
+
+    def get_search_cache(self, cache_key: str) -> sqlite3.Row | None:
+        self.flush()
+        cur = self._conn.execute("SELECT * FROM search_cache WHERE cache_key = ?", (cache_key,))
+        return cur.fetchone()
+
+    def upsert_search_cache(self, cache_key: str, query: str, claims: list[dict[str, Any]], fetched_at: str) -> None:
+        self._shared_write(
+            """
+            INSERT INTO search_cache (cache_key, query, claims_json, fetched_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(cache_key) DO UPDATE SET
+                query=excluded.query,
+                claims_json=excluded.claims_json,
+                fetched_at=excluded.fetched_at
+            """,
+            (cache_key, query, json.dumps(claims, sort_keys=True), fetched_at),
+        )
+
+    def insert_market_signals(self, signals: list[MarketSignal], deal_id: str | None) -> None:
+        self._conn.executemany(
+            """
+            INSERT OR IGNORE INTO market_signals (
+                deal_id, geography, metric, value, source_url, source_domain, confidence_score, observed_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    deal_id,
+                    signal.geography,
+                    signal.metric,
+                    signal.value,
+                    signal.source_url,
+                    signal.source_domain,
+                    signal.confidence_score,
+                    signal.observed_at,
+                )
+                for signal in signals
+            ],
+        )
+        self._commit_if_needed()
+
+    def list_market_signal_values(
+        self,
+        geography: str,
+        metric: str,
+        since: str,
+        min_confidence: int = 0,
+        limit: int = 5000,
+    ) -> list[float]:
+        cur = self._conn.execute(
+            """
+            SELECT value FROM market_signals
+            WHERE geography = ? AND metric = ? AND observed_at >= ? AND confidence_score >= ?
+            ORDER BY observed_at DESC
+            LIMIT ?
+            """,
+            (geography, metric, since, min_confidence, limit),
+        )
+        return [float(row["value"]) for row in cur.fetchall()]
+
+    def upsert_parcels(self, parcels: list[dict[str, Any]]) -> None:
+        """Upsert parcel attributes and their bounding boxes into the R-tree index."""
+        now = self.now_iso()
+        self._conn.executemany(
+            """
+            INSERT INTO parcels (
+                parcel_id, property_address, zoning_code, lot_size_sf, year_built, building_sqft,
+                land_value, building_value, rings_json, imported_at
+            ) VALUES (
+                :parcel_id, :property_address, :zoning_code, :lot_size_sf, :year_built, :building_sqft,
+                :land_value, :building_value, :rings_json, :imported_at
+            )
+            ON CONFLICT(parcel_id) DO UPDATE SET
+                property_address=excluded.property_address,
+                zoning_code=excluded.zoning_code,
+                lot_size_sf=excluded.lot_size_sf,
+                year_built=excluded.year_built,
+                building_sqft=excluded.building_sqft,
+                land_value=excluded.land_value,
+                building_value=excluded.building_value,
+                rings_json=excluded.rings_json,
+                imported_at=excluded.imported_at
+            """,
+            [{**parcel, "imported_at": now} for parcel in parcels],
+        )
+        self._conn.executemany(
+            """
+            INSERT OR REPLACE INTO parcel_rtree (id, min_x, max_x, min_y, max_y)
+            SELECT id, :min_x, :max_x, :min_y, :max_y FROM parcels WHERE parcel_id = :parcel_id
+            """,
+            parcels,
+        )
+        self._commit_if_needed()
+
+    def list_parcels_at(self, x: float, y: float) -> list[sqlite3.Row]:
+        """Parcels whose bounding box contains the point (R-tree candidates, not yet refined)."""
+        cur = self._conn.execute(
+            """
+            SELECT p.* FROM parcel_rtree r
+            JOIN parcels p ON p.id = r.id
+            WHERE r.min_x <= ? AND r.max_x >= ? AND r.min_y <= ? AND r.max_y >= ?
+            """,
+            (x, x, y, y),
+        )
+        return cur.fetchall()
+
+    def get_parcel(self, parcel_id: str) -> sqlite3.Row | None:
+        cur = self._conn.execute("SELECT * FROM parcels WHERE parcel_id = ?", (parcel_id,))
+        return cur.fetchone()
+
+    def count_parcels(self) -> int:
+        return int(self._conn.execute("SELECT COUNT(*) FROM parcels").fetchone()[0])
+
+    def get_geocode_cache(self, address_key: str) -> sqlite3.Row | None:
+        self.flush()
+        cur = self._conn.execute("SELECT * FROM geocode_cache WHERE address_key = ?", (address_key,))
+        return cur.fetchone()
+
+    def upsert_geocode_cache(
+        self,
+        address_key: str,
+        input_address: str,
+        x: float | None,
+        y: float | None,
+        wkid: int | None,
+        score: float | None,
+        matched_address: str | None,
+        parcel_id: str | None = None,
+    ) -> None:
+        self._shared_write(
+            """
+            INSERT INTO geocode_cache (
+                address_key, input_address, x, y, wkid, score, matched_address, parcel_id, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(address_key) DO UPDATE SET
+                input_address=excluded.input_address,
+                x=excluded.x,
+                y=excluded.y,
+                wkid=excluded.wkid,
+                score=excluded.score,
+                matched_address=excluded.matched_address,
+                parcel_id=COALESCE(excluded.parcel_id, geocode_cache.parcel_id),
+                updated_at=excluded.updated_at
+            """,
+            (address_key, input_address, x, y, wkid, score, matched_address, parcel_id, self.now_iso()),
+        )
+
+    def set_geocode_cache_parcel(self, address_key: str, parcel_id: str) -> None:
+        self._shared_write(
+            "UPDATE geocode_cache SET parcel_id = ?, updated_at = ? WHERE address_key = ?",
+            (parcel_id, self.now_iso(), address_key),
+        )
+
+    def record_cache_lookup(self, cache_name: str, hit: bool) -> None:
+        self._shared_write(
+            """
+            INSERT INTO cache_metrics (cache_name, hits, misses) VALUES (?, ?, ?)
+            ON CONFLICT(cache_name) DO UPDATE SET
+                hits = cache_metrics.hits + excluded.hits,
+                misses = cache_metrics.misses + excluded.misses
+            """,
+            (cache_name, int(hit), int(not hit)),
+        )
+
+    def get_cache_metrics(self, cache_name: str) -> dict[str, float]:
+        self.flush()
+        row = self._conn.execute("SELECT hits, misses FROM cache_metrics WHERE cache_name = ?", (cache_name,)).fetchone()
+        hits, misses = (row["hits"], row["misses"]) if row else (0, 0)
+        total = hits + misses
+        return {"hits": hits, "misses": misses, "hit_rate": round(hits / total, 4) if total else 0.0}
+
+    def get_deal_by_address_key(self, address_key: str) -> sqlite3.Row | None:
+        cur = self._conn.execute(
+            """
+            SELECT d.* FROM deal_addresses a
+            JOIN deals d ON d.deal_id = a.deal_id
+            WHERE a.address_key = ?
+            """,
+            (address_key,),
+        )
+        return cur.fetchone()
+
+    def list_unlinked_deals(self) -> list[sqlite3.Row]:
+        """Deals with no `deal_addresses` row (created before the table existed), oldest first."""
+        cur = self._conn.execute(
+            """
+            SELECT d.* FROM deals d
+            WHERE NOT EXISTS (SELECT 1 FROM deal_addresses a WHERE a.deal_id = d.deal_id)
+            ORDER BY d.created_at ASC
+            """
+        )
+        return cur.fetchall()
+
+    def link_deal_address(self, address_key: str, deal_id: str) -> None:
+        self._conn.execute(
+            "INSERT OR IGNORE INTO deal_addresses (address_key, deal_id) VALUES (?, ?)",
+            (address_key, deal_id),
+        )
+        self._commit_if_needed()
+
+    def upsert_comp_sales(self, sales: list[dict[str, Any]]) -> None:
+        now = self.now_iso()
+        self._conn.executemany(
+            """
+            INSERT INTO comp_sales (
+                sale_id, address, latitude, longitude, sale_price, sale_date, building_sqft, year_built, imported_at
+            ) VALUES (
+                :sale_id, :address, :latitude, :longitude, :sale_price, :sale_date, :building_sqft, :year_built,
+                :imported_at
+            )
+            ON CONFLICT(sale_id) DO UPDATE SET
+                address=excluded.address,
+                latitude=excluded.latitude,
+                longitude=excluded.longitude,
+                sale_price=excluded.sale_price,
+                sale_date=excluded.sale_date,
+                building_sqft=excluded.building_sqft,
+                year_built=excluded.year_built,
+                imported_at=excluded.imported_at
+            """,
+            [{**sale, "imported_at": now} for sale in sales],
+        )
+        self._commit_if_needed()
+
+    def list_comp_sales(self) -> list[sqlite3.Row]:
+        cur = self._conn.execute(
+            """
+            SELECT sale_id, address, latitude, longitude, sale_price, sale_date, building_sqft, year_built
+            FROM comp_sales ORDER BY sale_id
+            """
+        )
+        return cur.fetchall()
+
+    def count_comp_sales(self) -> int:
+        return int(self._conn.execute("SELECT COUNT(*) FROM comp_sales").fetchone()[0])
+
     def insert_task(self, task_id: str, deal_id: str, task_type: str, payload: dict[str, Any], status: str) -> None:
         now = self.now_iso()
         self._conn.execute(
@@ -262,7 +939,7 @@ class DataStore:
         details: dict[str, Any] | None = None,
     ) -> str:
         call_id = str(uuid.uuid4())
-        self._conn.execute(
+        self._shared_write(
             """
             INSERT INTO api_calls (
                 call_id, timestamp, provider, model, endpoint, request_type, status,
@@ -287,12 +964,42 @@ class DataStore:
                 json.dumps(details or {}, sort_keys=True),
             ),
         )
-        self._commit_if_needed()
         return call_id
 
+    def latency_percentile(
+        self,
+        model: str,
+        request_type: str,
+        percentile: float = 0.95,
+        window: int = 200,
+        min_samples: int = 20,
+    ) -> int | None:
+        """Latency percentile (ms) over recent successful calls; None until enough samples exist."""
+        self.flush()
+        cur = self._conn.execute(
+            """
+            SELECT latency_ms FROM api_calls
+            WHERE model = ? AND request_type = ? AND status = 'success'
+            ORDER BY timestamp DESC
+            LIMIT ?
+            """,
+            (model, request_type, window),
+        )
+        samples = sorted(int(row["latency_ms"]) for row in cur.fetchall())
+        if len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(percentile * len(samples)))]
+
     def list_api_calls(self, limit: int = 200) -> list[sqlite3.Row]:
+        self.flush()
         cur = self._conn.execute(
             "SELECT * FROM api_calls ORDER BY timestamp DESC LIMIT ?",
             (limit,),
         )
         return cur.fetchall()
+
+
+
+def _glob_escape(text: str) -> str:
+    """Match `text` literally inside a GLOB pattern."""
+    return "".join(f"[{char}]" if char in "*?[" else char for char in text)
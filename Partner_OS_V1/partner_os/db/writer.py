@@ -0,0 +1,147 @@
+"""Single-writer funnels for DataStore writes issued off the task thread."""
+
+from __future__ import annotations
+
+import asyncio
+import queue
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from partner_os.db.store import DataStore
+
+
+class StoreWriter:
+    """Queue DataStore writes and apply them from one writer task.
+
+    Coroutines call the same write methods they would call on DataStore
+    (currently `insert_api_call`); the calls are queued without blocking and
+    applied in batches on a worker thread via `asyncio.to_thread`, so sqlite
+    never blocks the event loop. Each write goes through the store's
+    `_shared_write`, which defers it while a task transaction is open on the
+    thread that started the loop.
+    """
+
+    def __init__(self, store: DataStore, batch_size: int = 100):
+        self.store = store
+        self.batch_size = batch_size
+        self._queue: asyncio.Queue[tuple[str, dict[str, Any]] | None] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self.written = 0
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run(self._queue), name="store-writer")
+
+    async def stop(self) -> None:
+        """Flush pending writes and stop the writer task."""
+        if self._task is None or self._queue is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        self._queue = None
+
+    def submit(self, method: str, **kwargs: Any) -> None:
+        if self._queue is None:
+            getattr(self.store, method)(**kwargs)
+            self.written += 1
+            return
+        self._queue.put_nowait((method, kwargs))
+
+    def insert_api_call(self, **kwargs: Any) -> None:
+        self.submit("insert_api_call", **kwargs)
+
+    def latency_percentile(self, **kwargs: Any) -> int | None:
+        return self.store.latency_percentile(**kwargs)
+
+    async def _run(self, queue: asyncio.Queue[tuple[str, dict[str, Any]] | None]) -> None:
+        stopping = False
+        while not stopping:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            stopping = None in batch
+            writes = [item for item in batch if item is not None]
+            if not writes:
+                continue
+            await asyncio.to_thread(self._apply, writes)
+            self.written += len(writes)
+
+    def _apply(self, writes: list[tuple[str, dict[str, Any]]]) -> None:
+        for method, kwargs in writes:
+            getattr(self.store, method)(**kwargs)
+
+
+
+class BackgroundWriter:
+    """Apply deferred SQL writes on one daemon thread with its own connection.
+
+    DataStore hands it writes that arrive while a transaction is open on some
+    thread. Each write commits on its own once the database lock frees up, so
+    the submitting worker never blocks on (or joins) the task transaction.
+    Writes that fail for any reason other than a busy database are kept in
+    `errors`.
+    """
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection], retry_seconds: float = 0.05):
+        self._connect = connect
+        self.retry_seconds = retry_seconds
+        self._queue: queue.SimpleQueue[tuple[str, tuple[Any, ...]] | None] = queue.SimpleQueue()
+        self._idle = threading.Condition()
+        self._pending = 0
+        self._thread: threading.Thread | None = None
+        self.errors: list[str] = []
+
+    def submit(self, sql: str, params: tuple[Any, ...]) -> None:
+        with self._idle:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="store-background-writer", daemon=True)
+                self._thread.start()
+            self._pending += 1
+        self._queue.put((sql, params))
+
+    def flush(self, timeout: float | None = None) -> bool:
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self, timeout: float = 10.0) -> None:
+        with self._idle:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self.flush(timeout)
+        self._queue.put(None)
+        thread.join(timeout)
+
+    def _run(self) -> None:
+        conn = self._connect()
+        try:
+            while (item := self._queue.get()) is not None:
+                self._apply(conn, *item)
+                with self._idle:
+                    self._pending -= 1
+                    self._idle.notify_all()
+        finally:
+            conn.close()
+
+    def _apply(self, conn: sqlite3.Connection, sql: str, params: tuple[Any, ...]) -> None:
+        while True:
+            try:
+                conn.execute(sql, params)
+                conn.commit()
+                return
+            except sqlite3.OperationalError as exc:
+                conn.rollback()
+                if "locked" not in str(exc) and "busy" not in str(exc):
+                    self.errors.append(f"{exc}: {sql.split()[0]}")
+                    return
+                time.sleep(self.retry_seconds)
+            except sqlite3.Error as exc:
+                conn.rollback()
+                self.errors.append(f"{exc}: {sql.split()[0]}")
+                return
@@ -1,10 +1,24 @@
 """Typed models for Partner OS."""
 
-from partner_os.models.types import AgentResult, CFOInput, ScoutClaim, StagedFile, Task, TaskStatus, TaskType
+from partner_os.models.types import (
+    AgentResult,
+    CFOInput,
+    GeocodeResult,
+    MarketSignal,
+    ParcelRecord,
+    ScoutClaim,
+    StagedFile,
+    Task,
+    TaskStatus,
+    TaskType,
+)
 
 __all__ = [
     "AgentResult",
     "CFOInput",
+    "GeocodeResult",
+    "MarketSignal",
+    "ParcelRecord",
     "ScoutClaim",
     "StagedFile",
     "Task",
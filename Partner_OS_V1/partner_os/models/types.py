@@ -19,6 +19,7 @@ class TaskStatus(str, Enum):
 class TaskType(str, Enum):
     create_deal_jacket = "create_deal_jacket"
     triage_file = "triage_file"
+    triage_batch = "triage_batch"
     run_cfo = "run_cfo"
     run_scout = "run_scout"
     append_firm_inbox = "append_firm_inbox"
@@ -64,6 +65,44 @@ class ScoutClaim:
     timestamp_utc: str
     confidence_label: str
     confidence_score: int
+    cache_age_seconds: int | None = None
+
+
+@dataclass(slots=True)
+class MarketSignal:
+    geography: str
+    metric: str
+    value: float
+    source_url: str
+    source_domain: str
+    confidence_score: int
+    observed_at: str
+
+
+@dataclass(slots=True)
+class GeocodeResult:
+    address: str
+    x: float
+    y: float
+    score: float
+    matched_address: str
+    wkid: int | None = None
+
+
+@dataclass(slots=True)
+class ParcelRecord:
+    parcel_id: str
+    property_address: str
+    zoning_code: str | None = None
+    lot_size_sf: float | None = None
+    year_built: int | None = None
+    building_sqft: float | None = None
+    land_value: float = 0.0
+    building_value: float = 0.0
+
+    @property
+    def assessed_value(self) -> float:
+        return self.land_value + self.building_value
 
 
 @dataclass(slots=True)
@@ -9,10 +9,26 @@ from partner_os.agents import CFOAgent, LibrarianAgent, ManagerAgent, ScoutAgent
 from partner_os.config import AppConfig, load_config
 from partner_os.db import DataStore
 from partner_os.models import TaskType
+from partner_os.services.address import GeocodeCache, link_legacy_deals
+from partner_os.services.async_runner import AsyncFanout
+from partner_os.services.blobs import BlobStore
+from partner_os.services.chunks import ChunkIndex
+from partner_os.services.comps import CompsEngine
+from partner_os.services.extract import TextExtractor
 from partner_os.services.filesystem import ensure_runtime_layout
 from partner_os.services.llm import GeminiClient, NullLLMClient
+from partner_os.services.media import MediaProcessor
+from partner_os.services.memory import ConversationMemory
+from partner_os.services.pages import PageFetcher
+from partner_os.services.parcel_db import ParcelIndex
+from partner_os.services.parcels import ParcelClient
 from partner_os.services.queue import SequentialTaskQueue
+from partner_os.services.reputation import DomainReputationIndex, set_default_index
 from partner_os.services.search import WebSearchClient
+from partner_os.services.search_cache import CachedSearchClient
+from partner_os.services.semantic import SemanticIndex
+
+SEARCH_REFRESH_SHUTDOWN_SECONDS = 20.0
 
 
 @dataclass(slots=True)
@@ -26,6 +42,14 @@ class AppRuntime:
     scout: ScoutAgent
 
     def close(self) -> None:
+        if isinstance(self.scout.search_client, CachedSearchClient):
+            self.scout.search_client.wait_for_refreshes(timeout=SEARCH_REFRESH_SHUTDOWN_SECONDS)
+        if self.librarian.extractor is not None:
+            self.librarian.extractor.close()
+        if self.librarian.media is not None:
+            self.librarian.media.close()
+        if self.librarian.chunks.vectors is not None:
+            self.librarian.chunks.vectors.close()
         self.store.close()
 
 
@@ -34,18 +58,69 @@ def build_runtime(root_override: Path | None = None, use_llm: bool = True) -> Ap
     config = load_config(root_override=root_override)
     ensure_runtime_layout(config)
 
+    if config.domain_reputation_path:
+        set_default_index(DomainReputationIndex.from_defaults().load_file(config.domain_reputation_path))
+
     store = DataStore(config.database_path)
+    link_legacy_deals(store)
     queue = SequentialTaskQueue(store=store)
 
     llm_client = GeminiClient(config=config, store=store) if use_llm else NullLLMClient()
+    chunks = ChunkIndex(store, vectors=SemanticIndex(store, config.vector_index_path))
+    fanout = AsyncFanout(config, store, max_in_flight=config.async_max_in_flight) if config.async_io else None
 
-    librarian = LibrarianAgent(name="Librarian", config=config, store=store, llm_client=llm_client)
-    cfo = CFOAgent(name="CFO", config=config, store=store)
-    scout = ScoutAgent(name="Scout", config=config, store=store, search_client=WebSearchClient())
-    manager = ManagerAgent(name="Manager", config=config, store=store, queue=queue, llm_client=llm_client)
+    librarian = LibrarianAgent(
+        name="Librarian",
+        config=config,
+        store=store,
+        llm_client=llm_client,
+        blobs=BlobStore(store, config.blob_store_dir),
+        chunks=chunks,
+        extractor=TextExtractor(store, max_workers=config.extract_workers),
+        media=MediaProcessor(store, config.thumbnail_cache_dir, max_workers=config.media_workers),
+        fanout=fanout if use_llm else None,
+    )
+    cfo = CFOAgent(name="CFO", config=config, store=store, comps=CompsEngine(store))
+    scout = ScoutAgent(
+        name="Scout",
+        config=config,
+        store=store,
+        search_client=CachedSearchClient(
+            inner=WebSearchClient(endpoint=config.search_endpoint),
+            store=store,
+            ttl_seconds=config.search_cache_ttl_seconds,
+            stale_seconds=config.search_cache_stale_seconds,
+        ),
+        page_fetcher=(
+            PageFetcher(cache_dir=config.page_cache_dir, per_host=config.page_fetch_per_host)
+            if config.scout_fetch_pages
+            else None
+        ),
+        parcel_client=(
+            ParcelClient(local=ParcelIndex(store), cache=GeocodeCache(store)) if config.parcel_lookup_enabled else None
+        ),
+        chunks=chunks,
+        fanout=fanout,
+    )
+    memory = ConversationMemory(
+        store=store,
+        llm_client=llm_client,
+        recent_turns=config.chat_memory_turns,
+        summary_max_chars=config.chat_memory_summary_chars,
+    )
+    manager = ManagerAgent(
+        name="Manager",
+        config=config,
+        store=store,
+        queue=queue,
+        llm_client=llm_client,
+        memory=memory,
+        chunks=chunks,
+    )
 
     queue.register_handler(TaskType.create_deal_jacket, "Librarian", librarian.create_deal_jacket_task)
     queue.register_handler(TaskType.triage_file, "Librarian", librarian.triage_staged_file_task)
+    queue.register_handler(TaskType.triage_batch, "Librarian", librarian.triage_staged_batch_task)
     queue.register_handler(TaskType.run_cfo, "CFO", cfo.run_underwrite_task)
     queue.register_handler(TaskType.run_scout, "Scout", scout.run_market_scan_task)
     queue.register_handler(TaskType.append_firm_inbox, "Manager", manager.append_firm_inbox_task)
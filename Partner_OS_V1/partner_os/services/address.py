@@ -0,0 +1,141 @@
+"""USPS-style address normalization and the shared geocode cache."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from partner_os.db.store import DataStore
+from partner_os.models import GeocodeResult
+
+# USPS Publication 28, Appendix C1 (common suffixes) and B (secondary unit designators).
+STREET_SUFFIXES = {
+    "ALLEY": "ALY", "AVENUE": "AVE", "AV": "AVE", "AVEN": "AVE", "BOULEVARD": "BLVD", "BOUL": "BLVD",
+    "CIRCLE": "CIR", "CIRC": "CIR", "COURT": "CT", "CRT": "CT", "COVE": "CV", "CRESCENT": "CRES",
+    "DRIVE": "DR", "DRV": "DR", "EXPRESSWAY": "EXPY", "FREEWAY": "FWY", "HIGHWAY": "HWY", "HIWAY": "HWY",
+    "LANE": "LN", "LOOP": "LOOP", "PARKWAY": "PKWY", "PKY": "PKWY", "PLACE": "PL", "PLAZA": "PLZ",
+    "POINT": "PT", "ROAD": "RD", "ROUTE": "RTE", "SQUARE": "SQ", "STREET": "ST", "STR": "ST",
+    "TERRACE": "TER", "TRAIL": "TRL", "WAY": "WAY",
+}
+DIRECTIONALS = {
+    "NORTH": "N", "SOUTH": "S", "EAST": "E", "WEST": "W",
+    "NORTHEAST": "NE", "NORTHWEST": "NW", "SOUTHEAST": "SE", "SOUTHWEST": "SW",
+}
+UNIT_DESIGNATORS = {
+    "APARTMENT": "APT", "APT": "APT", "SUITE": "STE", "STE": "STE", "UNIT": "UNIT",
+    "BUILDING": "BLDG", "BLDG": "BLDG", "FLOOR": "FL", "FL": "FL", "ROOM": "RM", "RM": "RM", "#": "#",
+}
+STATE_CODES = {"WASHINGTON": "WA", "OREGON": "OR", "IDAHO": "ID", "CALIFORNIA": "CA"}
+ZIP_PATTERN = re.compile(r"^(\d{5})(?:-?\d{4})?$")
+
+
+def normalize_address(raw: str) -> str:
+    """Canonical form for matching: `123 north main street, vancouver, washington 98660-1234`
+    -> `123 N MAIN ST, VANCOUVER, WA 98660`.
+    """
+    parts = [" ".join(re.sub(r"[^\w#\s-]", " ", part.upper()).split()) for part in raw.split(",")]
+    parts = [part for part in parts if part]
+    if not parts:
+        return ""
+
+    tail = parts[-1].split() if len(parts) > 1 else []
+    if tail:
+        zip_code = ZIP_PATTERN.match(tail[-1])
+        if zip_code:
+            tail[-1] = zip_code.group(1)
+        state_tokens = tail[:-1] if zip_code else tail
+        state = STATE_CODES.get(" ".join(state_tokens), " ".join(state_tokens))
+        parts[-1] = " ".join(token for token in (state, tail[-1] if zip_code else "") if token)
+
+    parts[0] = _normalize_street(parts[0])
+    return ", ".join(parts)
+
+
+
+def _normalize_street(street: str) -> str:
+    tokens = street.replace("#", " # ").split()
+    unit: list[str] = []
+    for idx, token in enumerate(tokens):
+        if token in UNIT_DESIGNATORS and idx > 1:
+            unit = [UNIT_DESIGNATORS[token], *tokens[idx + 1 :]]
+            tokens = tokens[:idx]
+            break
+    if unit[:1] == ["#"] and len(unit) > 1:
+        unit = [f"#{unit[1]}", *unit[2:]]
+
+    # Directionals are abbreviated only when a street name remains, so
+    # `123 NORTH ST` keeps NORTH as the name while `123 NORTH MAIN ST` becomes `123 N MAIN ST`.
+    post_directional = len(tokens) >= 4 and tokens[-1] in DIRECTIONALS
+    if len(tokens) >= 4 and tokens[1] in DIRECTIONALS:
+        tokens[1] = DIRECTIONALS[tokens[1]]
+    if post_directional:
+        tokens[-1] = DIRECTIONALS[tokens[-1]]
+    suffix_at = len(tokens) - (2 if post_directional else 1)
+    if suffix_at > 1 and tokens[suffix_at] in STREET_SUFFIXES:
+        tokens[suffix_at] = STREET_SUFFIXES[tokens[suffix_at]]
+    return " ".join(tokens + unit)
+
+
+
+def link_legacy_deals(store: DataStore) -> int:
+    """Index deals created before `deal_addresses` existed under their normalized address.
+
+    Without this, a new message about an existing deal's address would open
+    a duplicate. When two old deals normalize to the same key, the oldest
+    keeps it. Returns the number of deals examined.
+    """
+    deals = store.list_unlinked_deals()
+    for deal in deals:
+        address_key = normalize_address(deal["property_address"])
+        if address_key:
+            store.link_deal_address(address_key, deal["deal_id"])
+    return len(deals)
+
+
+
+@dataclass(slots=True)
+class GeocodeCache:
+    """Persistent normalized-address -> coordinates/parcel cache with hit-rate counters.
+
+    Misses are cached too (coordinates left NULL) so an address the locator
+    cannot resolve is not retried on every scan.
+    """
+
+    store: DataStore
+    metric_name: str = "geocode"
+
+    def get(self, address: str) -> tuple[bool, GeocodeResult | None, str | None]:
+        """Return `(cached, geocode, parcel_id)`; `cached` is False on a miss."""
+        row = self.store.get_geocode_cache(normalize_address(address))
+        self.store.record_cache_lookup(self.metric_name, hit=row is not None)
+        if row is None:
+            return False, None, None
+        if row["x"] is None:
+            return True, None, None
+        geocode = GeocodeResult(
+            address=address,
+            x=row["x"],
+            y=row["y"],
+            score=row["score"],
+            matched_address=row["matched_address"],
+            wkid=row["wkid"],
+        )
+        return True, geocode, row["parcel_id"]
+
+    def put(self, address: str, geocode: GeocodeResult | None, parcel_id: str | None = None) -> None:
+        self.store.upsert_geocode_cache(
+            address_key=normalize_address(address),
+            input_address=address,
+            x=geocode.x if geocode else None,
+            y=geocode.y if geocode else None,
+            wkid=geocode.wkid if geocode else None,
+            score=geocode.score if geocode else None,
+            matched_address=geocode.matched_address if geocode else None,
+            parcel_id=parcel_id,
+        )
+
+    def set_parcel(self, address: str, parcel_id: str) -> None:
+        self.store.set_geocode_cache_parcel(normalize_address(address), parcel_id)
+
+    def stats(self) -> dict[str, float]:
+        return self.store.get_cache_metrics(self.metric_name)
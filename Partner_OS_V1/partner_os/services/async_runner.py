@@ -0,0 +1,133 @@
+"""Asyncio execution path for high fan-out Scout and LLM work."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterable, TypeVar
+
+import httpx
+
+from partner_os.config import AppConfig
+from partner_os.db.store import DataStore
+from partner_os.db.writer import StoreWriter
+from partner_os.models import ScoutClaim
+from partner_os.services.llm import AsyncGeminiClient, SummaryResult
+from partner_os.services.search import AsyncWebSearchClient
+
+T = TypeVar("T")
+
+
+class AsyncTaskRunner:
+    """Keep many network requests in flight on one event-loop thread.
+
+    The LLM and search clients share one pooled HTTP client, and every
+    `api_calls` row is funnelled through a single StoreWriter task.
+    """
+
+    def __init__(
+        self,
+        config: AppConfig,
+        store: DataStore,
+        max_in_flight: int = 200,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.config = config
+        self.store = store
+        self.max_in_flight = max(1, max_in_flight)
+        self.transport = transport
+        self.writer = StoreWriter(store)
+        self._http: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self.llm: AsyncGeminiClient | None = None
+        self.search: AsyncWebSearchClient | None = None
+
+    async def __aenter__(self) -> AsyncTaskRunner:
+        self._http = httpx.AsyncClient(
+            transport=self.transport,
+            limits=httpx.Limits(
+                max_connections=self.max_in_flight,
+                max_keepalive_connections=self.max_in_flight,
+            )
+        )
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        await self.writer.start()
+        self.llm = AsyncGeminiClient(config=self.config, store=self.writer, http=self._http)
+        self.search = AsyncWebSearchClient(endpoint=self.config.search_endpoint, http=self._http)
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        await self.writer.stop()
+
+    async def gather(self, jobs: Iterable[Awaitable[T]]) -> list[T | BaseException]:
+        """Run awaitables with at most `max_in_flight` active; results keep input order."""
+        if self._semaphore is None:
+            raise RuntimeError("AsyncTaskRunner must be entered with `async with` before use.")
+        semaphore = self._semaphore
+
+        async def bounded(job: Awaitable[T]) -> T:
+            async with semaphore:
+                return await job
+
+        return list(await asyncio.gather(*(bounded(job) for job in jobs), return_exceptions=True))
+
+    async def search_many(self, queries: list[str], limit: int = 6) -> list[list[ScoutClaim] | BaseException]:
+        if self.search is None:
+            raise RuntimeError("AsyncTaskRunner must be entered with `async with` before use.")
+        search = self.search
+        return await self.gather(search.search(query, limit=limit) for query in queries)
+
+    async def summarize_many(self, texts: list[str], deal_id: str | None = None) -> list[SummaryResult]:
+        if self.llm is None:
+            raise RuntimeError("AsyncTaskRunner must be entered with `async with` before use.")
+        return await self.llm.summarize_many(texts, deal_id=deal_id, max_concurrency=self.max_in_flight)
+
+
+
+def run_async(
+    config: AppConfig,
+    store: DataStore,
+    work: Callable[[AsyncTaskRunner], Awaitable[T]],
+    max_in_flight: int = 200,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> T:
+    """Run `work` on a fresh event loop from synchronous code."""
+
+    async def main() -> T:
+        async with AsyncTaskRunner(config, store, max_in_flight=max_in_flight, transport=transport) as runner:
+            return await work(runner)
+
+    return asyncio.run(main())
+
+
+
+@dataclass(slots=True)
+class AsyncFanout:
+    """Synchronous front for `AsyncTaskRunner`, used by agents that run on task threads.
+
+    Each call runs one batch on a fresh event loop, so a Scout scan or a
+    Librarian summary batch keeps all of its requests in flight on one
+    thread instead of one thread per request. Enabled with `ASYNC_IO=1`.
+    """
+
+    config: AppConfig
+    store: DataStore
+    max_in_flight: int = 200
+    transport: httpx.AsyncBaseTransport | None = None
+
+    def search_many(self, queries: list[str], limit: int = 6) -> list[list[ScoutClaim] | BaseException]:
+        return self._run(lambda runner: runner.search_many(queries, limit=limit))
+
+    def summarize_many(
+        self, texts: list[str], deal_id: str | None = None, max_concurrency: int | None = None
+    ) -> list[SummaryResult]:
+        """Same contract as `GeminiClient.summarize_many`; concurrency is capped by `max_in_flight`."""
+        if not texts:
+            return []
+        return self._run(lambda runner: runner.summarize_many(texts, deal_id=deal_id))
+
+    def _run(self, work: Callable[[AsyncTaskRunner], Awaitable[T]]) -> T:
+        return run_async(self.config, self.store, work, max_in_flight=self.max_in_flight, transport=self.transport)
@@ -0,0 +1,67 @@
+"""Content-addressed upload store: one copy per distinct file, linked into every Deal Jacket that uses it."""
+
+from __future__ import annotations
+
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+
+from partner_os.db.store import DataStore
+
+
+@dataclass(slots=True)
+class BlobStore:
+    """Blobs live at `root/<hash[:2]>/<hash>`; Deal Jacket files are hard links to them.
+
+    The first upload of some content is renamed into the store, later uploads
+    of the same bytes are dropped, so each distinct file occupies disk once
+    however many deals reference it. Jacket files share the blob's inode and
+    should be treated as read-only.
+    """
+
+    store: DataStore
+    root: Path
+
+    def path_for(self, content_hash: str) -> Path:
+        return self.root / content_hash[:2] / content_hash
+
+    def place(self, source: Path, content_hash: str, target: Path, deal_id: str) -> bool:
+        """Move `source` into the store (or discard it as a duplicate) and link it at `target`.
+
+        Returns True when the content was new. Callers undo a placement by
+        moving `target` back to `source` and, for new content, unlinking the blob.
+        """
+        blob = self.path_for(content_hash)
+        created = not blob.exists()
+        if created:
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            source.replace(blob)
+        try:
+            link_or_copy(blob, target)
+        except OSError:
+            if created:
+                blob.replace(source)
+            raise
+        if not created:
+            source.unlink()
+        self.store.add_blob_ref(
+            content_hash, blob_path=blob, size_bytes=blob.stat().st_size, file_path=target, deal_id=deal_id
+        )
+        return created
+
+
+
+def link_or_copy(source: Path, target: Path) -> None:
+    """Hard-link `source` to `target`, copying when the filesystem refuses links.
+
+    An existing `target` raises FileExistsError and is never overwritten:
+    names come from the document catalog, so a file it does not know about
+    is left alone and the caller picks another name.
+    """
+    try:
+        os.link(source, target)
+    except FileExistsError:
+        raise
+    except OSError:
+        shutil.copyfile(source, target)
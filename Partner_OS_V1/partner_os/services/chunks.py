@@ -0,0 +1,199 @@
+"""Passage store: split documents into overlapping passages and retrieve the best ones for a prompt."""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+
+from partner_os.db.store import DataStore
+from partner_os.services.extract import CHARS_PER_TOKEN
+from partner_os.services.semantic import SemanticIndex, content_terms
+
+PASSAGE_CHARS = 1200
+PASSAGE_OVERLAP_CHARS = 150
+MAX_QUERY_TERMS = 24
+RRF_K = 60
+_SENTENCE_END = re.compile(r"[.!?]\s")
+
+
+@dataclass(slots=True)
+class Passage:
+    start: int
+    end: int
+    text: str
+
+
+@dataclass(slots=True)
+class RetrievedPassage:
+    source_path: str
+    deal_id: str | None
+    start: int
+    end: int
+    text: str
+    score: float
+
+    def render(self) -> str:
+        return f"[{Path(self.source_path).name} @{self.start}-{self.end}] {' '.join(self.text.split())}"
+
+
+
+def split_passages(
+    text: str, max_chars: int = PASSAGE_CHARS, overlap_chars: int = PASSAGE_OVERLAP_CHARS
+) -> list[Passage]:
+    """Cut `text` into passages of at most `max_chars` that overlap by up to `overlap_chars`.
+
+    Cuts prefer a paragraph break, then a sentence end, then whitespace in
+    the back half of the window, and the overlap starts on a sentence where
+    one begins, so passages rarely split a sentence.
+    Offsets index into `text` and bound the stripped passage.
+    """
+    passages: list[Passage] = []
+    length = len(text)
+    start = 0
+    while start < length:
+        end = min(start + max_chars, length)
+        if end < length:
+            end = _break_before(text, start + max_chars // 2, end)
+        raw = text[start:end]
+        stripped = raw.strip()
+        if stripped:
+            lead = len(raw) - len(raw.lstrip())
+            passages.append(Passage(start + lead, start + lead + len(stripped), stripped))
+        if end >= length:
+            break
+        start = _restart_after(text, max(end - overlap_chars, start + 1), end)
+    return passages
+
+
+
+def _break_before(text: str, low: int, high: int) -> int:
+    paragraph = text.rfind("\n\n", low, high)
+    if paragraph >= 0:
+        return paragraph + 2
+    sentence = None
+    for sentence in _SENTENCE_END.finditer(text, low, high):
+        pass
+    if sentence is not None:
+        return sentence.end()
+    space = max(text.rfind(" ", low, high), text.rfind("\n", low, high))
+    return space + 1 if space >= 0 else high
+
+
+
+def _restart_after(text: str, low: int, high: int) -> int:
+    """Start of the overlap: the first sentence beginning in `[low, high)`, else the first word."""
+    sentence = _SENTENCE_END.search(text, low, high)
+    if sentence is not None and sentence.end() < high:
+        return sentence.end()
+    space = text.find(" ", low, high)
+    return space + 1 if space >= 0 else low
+
+
+
+def fts_query(text: str) -> str:
+    """OR of the distinct content words in `text`, each quoted so user input cannot break FTS5 syntax."""
+    terms = list(dict.fromkeys(content_terms(text)))[:MAX_QUERY_TERMS]
+    return " OR ".join(f'"{term}"' for term in terms)
+
+
+
+@dataclass(slots=True)
+class ChunkIndex:
+    """Passages of deal documents (keyed by deal) and library doctrine (deal_id NULL).
+
+    Passages are searchable with bm25 and, when `vectors` is set, by cosine
+    similarity too; `retrieve` fuses the two rankings. Re-indexing a path
+    whose content hash is unchanged is a no-op, so callers can index on every
+    triage or library pass without re-splitting.
+    """
+
+    store: DataStore
+    vectors: SemanticIndex | None = None
+    passage_chars: int = PASSAGE_CHARS
+    overlap_chars: int = PASSAGE_OVERLAP_CHARS
+
+    def index_text(self, source_path: Path, text: str, deal_id: str | None, content_hash: str) -> int:
+        """Index `text` as the contents of `source_path`; returns the passage count written (0 when unchanged)."""
+        if self.store.get_chunk_source_hash(source_path) == content_hash:
+            return 0
+        passages = split_passages(text, self.passage_chars, self.overlap_chars)
+        self.store.replace_chunks(
+            source_path, deal_id, content_hash, [(item.start, item.end, item.text) for item in passages]
+        )
+        if self.vectors is not None:
+            self.vectors.add("chunk", source_path, [item.text for item in passages], deal_id)
+        return len(passages)
+
+    def index_abstract(self, source_path: Path, abstract: str) -> None:
+        """Embed a library abstract for semantic library search; abstracts are not split into passages."""
+        if self.vectors is not None:
+            self.vectors.add("abstract", source_path, [abstract], deal_id=None)
+
+    def move(self, old_path: str, new_path: Path) -> None:
+        self.store.move_chunks(old_path, new_path)
+        if self.vectors is not None:
+            self.vectors.move(old_path, new_path)
+
+    def remove(self, source_paths: list[str]) -> None:
+        self.store.delete_chunks(source_paths)
+        if self.vectors is not None:
+            self.vectors.remove(source_paths)
+
+    def retrieve(
+        self,
+        deal_id: str | None,
+        query: str,
+        k: int = 6,
+        token_budget: int = 800,
+        include_library: bool = True,
+    ) -> list[RetrievedPassage]:
+        """Up to `k` best passages for `query` that fit in `token_budget`, best first.
+
+        Candidates come from the deal's documents and, with `include_library`,
+        the firm library. bm25 and vector rankings are merged by reciprocal
+        rank fusion, so `score` is higher-is-better. A passage repeating one
+        already chosen (the same file filed twice) is skipped, as is one too
+        long for the remaining budget.
+        """
+        match = fts_query(query)
+        if not match or k <= 0:
+            return []
+        fused: dict[tuple[str, int], float] = {}
+        rows: dict[tuple[str, int], sqlite3.Row] = {}
+        for rank, row in enumerate(self.store.search_chunks(match, deal_id, include_library, limit=k * 4)):
+            key = (row["source_path"], row["ordinal"])
+            rows[key] = row
+            fused[key] = 1.0 / (RRF_K + rank + 1)
+        if self.vectors is not None:
+            hits = self.vectors.search(query, k * 4, deal_id, include_library=include_library, kinds=("chunk",))
+            for rank, hit in enumerate(hits):
+                key = (hit.source_path, hit.ordinal)
+                fused[key] = fused.get(key, 0.0) + 1.0 / (RRF_K + rank + 1)
+            missing = [key for key in fused if key not in rows]
+            rows.update({(row["source_path"], row["ordinal"]): row for row in self.store.get_chunks(missing)})
+
+        chosen: list[RetrievedPassage] = []
+        remaining = token_budget
+        for key in sorted(fused, key=fused.__getitem__, reverse=True):
+            row = rows.get(key)
+            if row is None:
+                continue
+            cost = -(-len(row["text"]) // CHARS_PER_TOKEN)
+            if cost > remaining or any(item.text == row["text"] for item in chosen):
+                continue
+            chosen.append(
+                RetrievedPassage(
+                    source_path=row["source_path"],
+                    deal_id=row["deal_id"],
+                    start=row["start_offset"],
+                    end=row["end_offset"],
+                    text=row["text"],
+                    score=fused[key],
+                )
+            )
+            remaining -= cost
+            if len(chosen) == k:
+                break
+        return chosen
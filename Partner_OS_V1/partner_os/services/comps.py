@@ -0,0 +1,387 @@
+"""Comparable-sales import, KD-tree index and ARV estimation."""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import heapq
+import json
+import math
+import statistics
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from partner_os.db.store import DataStore
+from partner_os.services.address import normalize_address
+
+KM_PER_DEGREE_LAT = 110.574
+KM_PER_DEGREE_LON_EQUATOR = 111.320
+KM_PER_MILE = 1.609344
+SQFT_LOG_SCALE = 0.25  # a 25% size difference weighs like 1 km of distance
+YEAR_SCALE = 15.0  # so does 15 years of construction age
+
+CSV_ALIASES = {
+    "sale_id": ("sale_id", "id", "doc_id", "excise_id"),
+    "address": ("address", "situs", "property_address", "situsaddrsfull"),
+    "latitude": ("latitude", "lat", "y"),
+    "longitude": ("longitude", "lon", "lng", "long", "x"),
+    "sale_price": ("sale_price", "price", "saleprice", "sold_price"),
+    "sale_date": ("sale_date", "date", "saledate", "sold_date"),
+    "building_sqft": ("building_sqft", "sqft", "assrsqft", "living_area"),
+    "year_built": ("year_built", "yearbuilt", "bldgyrblt"),
+}
+
+
+@dataclass(slots=True)
+class CompSale:
+    sale_id: str
+    address: str
+    latitude: float
+    longitude: float
+    sale_price: float
+    sale_date: str
+    building_sqft: float | None = None
+    year_built: int | None = None
+
+
+@dataclass(slots=True)
+class CompSubject:
+    latitude: float
+    longitude: float
+    building_sqft: float | None = None
+    year_built: int | None = None
+    as_of: str | None = None
+
+
+@dataclass(slots=True)
+class CompMatch:
+    sale: CompSale
+    distance_miles: float
+    similarity_distance: float
+    adjusted_price: float
+
+
+@dataclass(slots=True)
+class CompsEstimate:
+    arv: float | None
+    low: float | None
+    high: float | None
+    stdev: float | None
+    comps: list[CompMatch] = field(default_factory=list)
+
+    @property
+    def summary(self) -> str:
+        if self.arv is None:
+            return "No comparable sales within the search window."
+        lines = [
+            f"ARV ${self.arv:,.0f} (IQR ${self.low:,.0f}-${self.high:,.0f}) from {len(self.comps)} comps:",
+        ]
+        lines.extend(
+            f"- {match.sale.address}: ${match.sale.sale_price:,.0f} on {match.sale.sale_date}, "
+            f"{match.distance_miles:.2f} mi, adj ${match.adjusted_price:,.0f}"
+            for match in self.comps
+        )
+        return "\n".join(lines)
+
+
+
+def read_sales_csv(path: Path) -> Iterable[CompSale]:
+    """Stream sales from a CSV, matching common county export column names case-insensitively."""
+    with path.open(newline="", encoding="utf-8-sig") as handle:
+        reader = csv.DictReader(handle)
+        columns = {name.strip().lower(): name for name in reader.fieldnames or []}
+        mapping = {
+            key: next((columns[alias] for alias in aliases if alias in columns), None)
+            for key, aliases in CSV_ALIASES.items()
+        }
+        missing = [key for key in ("latitude", "longitude", "sale_price", "sale_date") if mapping[key] is None]
+        if missing:
+            raise ValueError(f"{path}: missing required columns {', '.join(missing)}")
+
+        for row in reader:
+            def value(key: str) -> str:
+                column = mapping[key]
+                return (row.get(column) or "").strip() if column else ""
+
+            try:
+                price = float(value("sale_price").replace("$", "").replace(",", ""))
+                latitude, longitude = float(value("latitude")), float(value("longitude"))
+                sale_date = date.fromisoformat(value("sale_date")[:10]).isoformat()
+            except ValueError:
+                continue
+            if price <= 0:
+                continue
+            sqft = _positive_number(value("building_sqft").replace(",", ""))
+            year = _positive_number(value("year_built"))
+            address = value("address")
+            sale_id = value("sale_id") or hashlib.sha1(f"{address}|{sale_date}|{price}".encode()).hexdigest()[:16]
+            yield CompSale(
+                sale_id=sale_id,
+                address=address,
+                latitude=latitude,
+                longitude=longitude,
+                sale_price=price,
+                sale_date=sale_date,
+                building_sqft=sqft,
+                year_built=int(year) if year else None,
+            )
+
+
+
+def _positive_number(raw: str) -> float | None:
+    """Optional numeric column: blanks, `N/A` and non-positive values become None."""
+    try:
+        number = float(raw)
+    except ValueError:
+        return None
+    return number if number > 0 else None
+
+
+
+def subject_from_cache(store: DataStore, address: str) -> CompSubject | None:
+    """Subject location from the geocode cache and size/age from the offline parcel index, if known."""
+    row = store.get_geocode_cache(normalize_address(address))
+    if row is None or row["x"] is None or row["wkid"] not in (None, 4326):
+        return None
+    parcel = store.get_parcel(row["parcel_id"]) if row["parcel_id"] else None
+    return CompSubject(
+        latitude=row["y"],
+        longitude=row["x"],
+        building_sqft=parcel["building_sqft"] if parcel else None,
+        year_built=parcel["year_built"] if parcel else None,
+    )
+
+
+
+def write_analysis_comps(analysis_path: Path, estimate: CompsEstimate) -> bool:
+    """Merge an estimate into a Scout `analysis.json` under `valuation`, where the underwriter reads it.
+
+    Returns False when the deal has not been scouted yet (no file) or there were no comps.
+    """
+    if estimate.arv is None or not analysis_path.exists():
+        return False
+    data = json.loads(analysis_path.read_text(encoding="utf-8"))
+    data.setdefault("valuation", {}).update(
+        {
+            "comps_arv": estimate.arv,
+            "comps_arv_low": estimate.low,
+            "comps_arv_high": estimate.high,
+            "comps_count": len(estimate.comps),
+            "comps_summary": estimate.summary,
+        }
+    )
+    analysis_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return True
+
+
+
+class KDTree:
+    """Static KD-tree over fixed-dimension tuples with filtered k-nearest search."""
+
+    def __init__(self, points: list[tuple[float, ...]]):
+        self.points = points
+        self.dims = len(points[0]) if points else 0
+        self._nodes: list[tuple[int, int, int, int]] = []
+        self._root = self._build(list(range(len(points))), 0)
+
+    def _build(self, indices: list[int], depth: int) -> int:
+        if not indices:
+            return -1
+        axis = depth % self.dims
+        indices.sort(key=lambda idx: self.points[idx][axis])
+        mid = len(indices) // 2
+        node = len(self._nodes)
+        self._nodes.append((indices[mid], axis, -1, -1))
+        left = self._build(indices[:mid], depth + 1)
+        right = self._build(indices[mid + 1 :], depth + 1)
+        self._nodes[node] = (indices[mid], axis, left, right)
+        return node
+
+    def nearest(
+        self,
+        query: tuple[float, ...],
+        k: int,
+        accept: Callable[[int], bool] = lambda idx: True,
+        axis_limits: dict[int, float] | None = None,
+    ) -> list[tuple[float, int]]:
+        """k nearest accepted points as `(distance, index)`, closest first.
+
+        `axis_limits` caps |query - point| per axis; subtrees beyond a cap are pruned.
+        """
+        heap: list[tuple[float, int]] = []
+        limits = axis_limits or {}
+        # Far subtrees are deferred on a stack and re-checked against the current kth distance when popped.
+        deferred: list[tuple[int, float]] = []
+
+        def descend(node: int) -> None:
+            while node >= 0:
+                idx, axis, left, right = self._nodes[node]
+                point = self.points[idx]
+                if accept(idx):
+                    dist2 = sum((a - b) ** 2 for a, b in zip(query, point))
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-dist2, idx))
+                    elif dist2 < -heap[0][0]:
+                        heapq.heapreplace(heap, (-dist2, idx))
+                diff = query[axis] - point[axis]
+                near, far = (left, right) if diff < 0 else (right, left)
+                if far >= 0 and abs(diff) <= limits.get(axis, math.inf):
+                    deferred.append((far, diff))
+                node = near
+
+        descend(self._root)
+        while deferred:
+            far, diff = deferred.pop()
+            if len(heap) < k or diff * diff < -heap[0][0]:
+                descend(far)
+
+        return sorted((math.sqrt(-neg), idx) for neg, idx in heap)
+
+
+
+@dataclass(slots=True)
+class CompsEngine:
+    """Nearest similar sales within a radius and date window, and an ARV estimate from them.
+
+    Sales live in the `comp_sales` table; the KD-tree over projected location,
+    log size and year built is rebuilt lazily whenever the row count changes.
+    """
+
+    store: DataStore
+    _sales: list[CompSale] = field(default_factory=list, init=False)
+    _tree: KDTree | None = field(default=None, init=False)
+    _origin_lat: float = field(default=0.0, init=False)
+    _median_sqft: float = field(default=1500.0, init=False)
+    _median_year: float = field(default=1980.0, init=False)
+
+    def import_csv(self, path: Path, batch_size: int = 5000) -> int:
+        imported = 0
+        batch: list[CompSale] = []
+        for sale in read_sales_csv(path):
+            batch.append(sale)
+            if len(batch) >= batch_size:
+                imported += self._flush(batch)
+        imported += self._flush(batch)
+        self._tree = None
+        return imported
+
+    def find(
+        self,
+        subject: CompSubject,
+        k: int = 6,
+        radius_miles: float = 1.0,
+        months: int = 12,
+    ) -> list[CompMatch]:
+        self._ensure_index()
+        if self._tree is None:
+            return []
+
+        as_of = date.fromisoformat(subject.as_of) if subject.as_of else date.today()
+        earliest = (as_of - timedelta(days=round(months * 30.44))).isoformat()
+        latest = as_of.isoformat()
+        radius_km = radius_miles * KM_PER_MILE
+        query = self._vector(subject.latitude, subject.longitude, subject.building_sqft, subject.year_built)
+
+        def accept(idx: int) -> bool:
+            sale = self._sales[idx]
+            if not earliest <= sale.sale_date <= latest:
+                return False
+            point = self._tree.points[idx]
+            return (point[0] - query[0]) ** 2 + (point[1] - query[1]) ** 2 <= radius_km**2
+
+        matches = []
+        for distance, idx in self._tree.nearest(query, k, accept, axis_limits={0: radius_km, 1: radius_km}):
+            sale = self._sales[idx]
+            point = self._tree.points[idx]
+            matches.append(
+                CompMatch(
+                    sale=sale,
+                    distance_miles=math.hypot(point[0] - query[0], point[1] - query[1]) / KM_PER_MILE,
+                    similarity_distance=distance,
+                    adjusted_price=self._adjusted_price(sale, subject.building_sqft),
+                )
+            )
+        return matches
+
+    def estimate(self, subject: CompSubject, k: int = 6, radius_miles: float = 1.0, months: int = 12) -> CompsEstimate:
+        return self._estimate_from(self.find(subject, k=k, radius_miles=radius_miles, months=months))
+
+    def estimate_many(
+        self,
+        subjects: list[CompSubject],
+        k: int = 6,
+        radius_miles: float = 1.0,
+        months: int = 12,
+    ) -> list[CompsEstimate]:
+        """Batch estimates sharing one index build."""
+        self._ensure_index()
+        return [self.estimate(subject, k=k, radius_miles=radius_miles, months=months) for subject in subjects]
+
+    @staticmethod
+    def _estimate_from(matches: list[CompMatch]) -> CompsEstimate:
+        if not matches:
+            return CompsEstimate(arv=None, low=None, high=None, stdev=None)
+        prices = [match.adjusted_price for match in matches]
+        weights = [1.0 / (0.25 + match.similarity_distance) for match in matches]
+        arv = sum(price * weight for price, weight in zip(prices, weights)) / sum(weights)
+        if len(prices) >= 2:
+            low, _, high = statistics.quantiles(prices, n=4, method="inclusive")
+            stdev = statistics.stdev(prices)
+        else:
+            low = high = prices[0]
+            stdev = 0.0
+        return CompsEstimate(arv=round(arv, 2), low=round(low, 2), high=round(high, 2), stdev=round(stdev, 2), comps=matches)
+
+    def _adjusted_price(self, sale: CompSale, subject_sqft: float | None) -> float:
+        """Scale by price per square foot when both sizes are known."""
+        if subject_sqft and sale.building_sqft:
+            return round(sale.sale_price / sale.building_sqft * subject_sqft, 2)
+        return sale.sale_price
+
+    def _vector(self, lat: float, lon: float, sqft: float | None, year: int | None) -> tuple[float, float, float, float]:
+        x = lon * KM_PER_DEGREE_LON_EQUATOR * math.cos(math.radians(self._origin_lat))
+        y = lat * KM_PER_DEGREE_LAT
+        size = math.log(sqft or self._median_sqft) / SQFT_LOG_SCALE
+        age = (year or self._median_year) / YEAR_SCALE
+        return (x, y, size, age)
+
+    def _ensure_index(self) -> None:
+        count = self.store.count_comp_sales()
+        if self._tree is not None and len(self._sales) == count:
+            return
+        self._sales = [CompSale(**dict(row)) for row in self.store.list_comp_sales()]
+        if not self._sales:
+            self._tree = None
+            return
+        self._origin_lat = statistics.fmean(sale.latitude for sale in self._sales)
+        sizes = [sale.building_sqft for sale in self._sales if sale.building_sqft]
+        years = [sale.year_built for sale in self._sales if sale.year_built]
+        self._median_sqft = statistics.median(sizes) if sizes else 1500.0
+        self._median_year = statistics.median(years) if years else 1980.0
+        self._tree = KDTree(
+            [self._vector(sale.latitude, sale.longitude, sale.building_sqft, sale.year_built) for sale in self._sales]
+        )
+
+    def _flush(self, batch: list[CompSale]) -> int:
+        if not batch:
+            return 0
+        rows: list[dict[str, Any]] = [
+            {
+                "sale_id": sale.sale_id,
+                "address": sale.address,
+                "latitude": sale.latitude,
+                "longitude": sale.longitude,
+                "sale_price": sale.sale_price,
+                "sale_date": sale.sale_date,
+                "building_sqft": sale.building_sqft,
+                "year_built": sale.year_built,
+            }
+            for sale in batch
+        ]
+        with self.store.transaction():
+            self.store.upsert_comp_sales(rows)
+        count = len(batch)
+        batch.clear()
+        return count
@@ -0,0 +1,82 @@
+"""Bounded excerpt reads: memory stays proportional to the excerpt, not the file."""
+
+from __future__ import annotations
+
+import mmap
+from pathlib import Path
+
+UTF8_MAX_BYTES = 4
+MMAP_THRESHOLD_BYTES = 1 << 20
+STRUCTURED_SUFFIXES = frozenset({".csv", ".tsv", ".json", ".jsonl", ".ndjson", ".log"})
+ELLIPSIS_MARKER = "\n...\n"
+
+
+def read_excerpt(
+    path: Path,
+    head_chars: int,
+    tail_chars: int = 0,
+    mmap_threshold: int = MMAP_THRESHOLD_BYTES,
+) -> tuple[str, bool]:
+    """Return `(text, truncated)` holding at most `head_chars` + `tail_chars` characters.
+
+    Only `chars * 4` bytes (the UTF-8 worst case) are touched at each end.
+    Files above `mmap_threshold` are memory-mapped so the slice is paged in
+    on demand; cuts are moved to UTF-8 character boundaries, and for
+    structured files the tail starts on a fresh line so it begins on a row.
+    """
+    with path.open("rb") as handle:
+        size = handle.seek(0, 2)
+        head_bytes = min(size, head_chars * UTF8_MAX_BYTES)
+        tail_bytes = min(size - head_bytes, tail_chars * UTF8_MAX_BYTES)
+        if size == 0:
+            return "", False
+        if size > mmap_threshold:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                head = view[:head_bytes]
+                tail = view[size - tail_bytes :] if tail_bytes else b""
+        else:
+            handle.seek(0)
+            head = handle.read(head_bytes)
+            handle.seek(size - tail_bytes)
+            tail = handle.read(tail_bytes) if tail_bytes else b""
+
+    head_text = _trim_end(head, complete=head_bytes == size).decode("utf-8", errors="ignore")[:head_chars]
+    truncated = head_bytes + tail_bytes < size or len(head_text) < _char_len(head)
+    if not tail:
+        return head_text, truncated
+
+    tail_text = _trim_start(tail).decode("utf-8", errors="ignore")
+    if len(tail_text) > tail_chars or head_bytes + tail_bytes < size:
+        tail_text = tail_text[-tail_chars:]
+        newline = tail_text.find("\n")
+        if path.suffix.lower() in STRUCTURED_SUFFIXES and 0 <= newline < len(tail_text) - 1:
+            tail_text = tail_text[newline + 1 :]
+    separator = ELLIPSIS_MARKER if truncated else ""
+    return head_text.rstrip("\n") + separator + tail_text, truncated
+
+
+
+def _trim_end(data: bytes, complete: bool) -> bytes:
+    """Drop a multi-byte sequence cut off at the end of `data`."""
+    if complete or not data:
+        return data
+    idx = len(data) - 1
+    while idx > 0 and len(data) - idx < UTF8_MAX_BYTES and data[idx] & 0xC0 == 0x80:
+        idx -= 1
+    lead = data[idx]
+    needed = 2 if lead >> 5 == 0b110 else 3 if lead >> 4 == 0b1110 else 4 if lead >> 3 == 0b11110 else 1
+    return data if len(data) - idx >= needed else data[:idx]
+
+
+
+def _trim_start(data: bytes) -> bytes:
+    """Skip continuation bytes left over from a character that started before the slice."""
+    idx = 0
+    while idx < min(len(data), UTF8_MAX_BYTES - 1) and data[idx] & 0xC0 == 0x80:
+        idx += 1
+    return data[idx:]
+
+
+
+def _char_len(data: bytes) -> int:
+    return sum(1 for byte in data if byte & 0xC0 != 0x80)
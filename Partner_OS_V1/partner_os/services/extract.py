@@ -0,0 +1,240 @@
+"""Budgeted text extraction for PDF, DOCX and plain-text artifacts."""
+
+from __future__ import annotations
+
+import mmap
+import multiprocessing
+import re
+import threading
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+from xml.etree import ElementTree
+
+from partner_os.db.store import DataStore
+from partner_os.services.excerpt import STRUCTURED_SUFFIXES, read_excerpt
+from partner_os.services.library import file_digest
+
+CHARS_PER_TOKEN = 4
+PLAIN_TEXT_SUFFIXES = frozenset({".txt", ".md", ".csv", ".json"})
+DOCUMENT_SUFFIXES = frozenset({".pdf", ".docx"})
+EXTRACTABLE_SUFFIXES = PLAIN_TEXT_SUFFIXES | DOCUMENT_SUFFIXES
+
+MAX_PDF_STREAM_BYTES = 4_000_000
+_PDF_STREAM_START = re.compile(rb"(?<!end)stream\r?\n")
+_PDF_SKIP_MARKERS = (b"/Image", b"/Length1", b"/Length2", b"/XRef", b"/ObjStm", b"/Metadata", b"/EmbeddedFile")
+_PDF_TEXT_TOKEN = re.compile(rb"\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>|\[|\]|T[Jj*dD]|ET|'|\"", re.S)
+_PDF_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+_PDF_ESCAPE = re.compile(rb"\\([0-7]{1,3}|\r\n|[\s\S])")
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def iter_pdf_text(path: Path) -> Iterator[str]:
+    """Yield the text of each content stream in file order.
+
+    This walks streams, not pages: the page tree is never read, so a page
+    split over several streams yields several pieces, and stream order is the
+    order objects appear in the file, which need not be reading order. The
+    file is memory-mapped and streams are inflated one at a time, so parsing
+    stops as soon as the caller's budget is met.
+
+    Handles uncompressed and FlateDecode content streams with literal or
+    single-byte hex strings. Fonts, images and object streams are skipped.
+    Text set in CID fonts (Identity-H and friends) is not decoded, because no
+    ToUnicode map is applied; it is dropped rather than emitted as mojibake.
+    Scanned PDFs and CID-only PDFs therefore yield nothing, and callers
+    should treat an empty result as "needs review", not "blank document".
+    """
+    with path.open("rb") as handle:
+        if path.stat().st_size == 0:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from _iter_pdf_streams(data)
+
+
+
+def _iter_pdf_streams(data: mmap.mmap) -> Iterator[str]:
+    for match in _PDF_STREAM_START.finditer(data):
+        header = data[max(0, match.start() - 1024) : match.start()]
+        header = header[header.rfind(b"obj") + 1 :]
+        if any(marker in header for marker in _PDF_SKIP_MARKERS):
+            continue
+        end = data.find(b"endstream", match.end())
+        if end < 0:
+            break
+        raw = data[match.end() : end]
+        if b"/FlateDecode" in header or b"/Fl " in header or b"/Fl]" in header:
+            try:
+                raw = zlib.decompressobj().decompress(raw, MAX_PDF_STREAM_BYTES)
+            except zlib.error:
+                continue
+        elif b"/Filter" in header:
+            continue
+        text = _content_stream_text(raw)
+        if text.strip():
+            yield text
+
+
+
+def _content_stream_text(stream: bytes) -> str:
+    lines: list[str] = []
+    line: list[str] = []
+    pending: list[str] = []
+    for token in _PDF_TEXT_TOKEN.findall(stream):
+        if token[:1] == b"(":
+            pending.append(_decode_pdf_string(_PDF_ESCAPE.sub(_unescape, token[1:-1])))
+        elif token[:1] == b"<":
+            digits = b"".join(token[1:-1].split())
+            pending.append(_decode_pdf_string(bytes.fromhex(digits.decode("ascii")) if len(digits) % 2 == 0 else b""))
+        elif token in (b"Tj", b"TJ", b"'", b'"'):
+            if token in (b"'", b'"'):
+                lines.append("".join(line))
+                line = []
+            line.extend(pending)
+            pending = []
+        elif token in (b"T*", b"Td", b"TD", b"ET"):
+            lines.append("".join(line))
+            line = []
+    lines.append("".join(line))
+    return "\n".join(text for text in (" ".join(item.split()) for item in lines) if text)
+
+
+
+def _unescape(match: re.Match[bytes]) -> bytes:
+    value = match.group(1)
+    if value[:1].isdigit():
+        return bytes([int(value, 8) & 0xFF])
+    if value in (b"\n", b"\r", b"\r\n"):
+        return b""
+    return _PDF_ESCAPES.get(value, value)
+
+
+
+def _decode_pdf_string(raw: bytes) -> str:
+    if raw.startswith(b"\xfe\xff"):
+        return raw[2:].decode("utf-16-be", errors="ignore")
+    if b"\x00" in raw:
+        return ""
+    text = raw.decode("latin-1")
+    printable = sum(char.isprintable() or char.isspace() for char in text)
+    return text if printable >= 0.9 * len(text) else ""
+
+
+
+def iter_docx_text(path: Path) -> Iterator[str]:
+    """Yield paragraphs from `word/document.xml`, parsing and discarding elements as they close."""
+    with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as handle:
+        for _, element in ElementTree.iterparse(handle, events=("end",)):
+            if element.tag != f"{_WORD_NS}p":
+                continue
+            parts = []
+            for node in element.iter():
+                if node.tag == f"{_WORD_NS}t" and node.text:
+                    parts.append(node.text)
+                elif node.tag == f"{_WORD_NS}tab":
+                    parts.append("\t")
+                elif node.tag in (f"{_WORD_NS}br", f"{_WORD_NS}cr"):
+                    parts.append("\n")
+            element.clear()
+            text = "".join(parts).strip()
+            if text:
+                yield text
+
+
+
+def extract_text(path: Path, max_chars: int) -> tuple[str, bool]:
+    """Return `(text, truncated)`, pulling PDF streams/paragraphs only until `max_chars` is reached.
+
+    Plain text is a bounded excerpt; CSV/JSON exports keep a quarter of the
+    budget for their last rows.
+    """
+    suffix = path.suffix.lower()
+    if suffix == ".pdf":
+        pieces, separator = iter_pdf_text(path), "\n\n"
+    elif suffix == ".docx":
+        pieces, separator = iter_docx_text(path), "\n"
+    elif suffix in PLAIN_TEXT_SUFFIXES:
+        tail_chars = max_chars // 4 if suffix in STRUCTURED_SUFFIXES else 0
+        try:
+            return read_excerpt(path, head_chars=max_chars - tail_chars, tail_chars=tail_chars)
+        except OSError:
+            return "", False
+    else:
+        return "", False
+
+    collected: list[str] = []
+    size = 0
+    try:
+        for piece in pieces:
+            collected.append(piece)
+            size += len(piece) + len(separator)
+            if size >= max_chars:
+                return separator.join(collected)[:max_chars], True
+    except (OSError, zipfile.BadZipFile, KeyError, ElementTree.ParseError):
+        pass
+    return separator.join(collected), False
+
+
+
+@dataclass(slots=True)
+class TextExtractor:
+    """Extract summarizer input for many files, cached by content hash.
+
+    PDF and DOCX parsing runs in a process pool of `max_workers` (inline when
+    0) so large scans do not hold the GIL against the queue worker. Cached text
+    is reused when it was complete or extracted with at least the requested
+    budget, so a renamed or re-uploaded file is never parsed twice.
+    """
+
+    store: DataStore
+    max_workers: int = 2
+    _pool: ProcessPoolExecutor | None = field(default=None, init=False)
+    _pool_lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def extract_many(self, paths: list[Path], max_tokens: int, hashes: list[str] | None = None) -> list[str]:
+        max_chars = max_tokens * CHARS_PER_TOKEN
+        texts = [""] * len(paths)
+        pending: list[tuple[int, str]] = []
+        for idx, path in enumerate(paths):
+            if path.suffix.lower() not in EXTRACTABLE_SUFFIXES:
+                continue
+            try:
+                digest = hashes[idx] if hashes and hashes[idx] else file_digest(path)
+            except OSError:
+                continue
+            cached = self.store.get_text_extract(digest)
+            if cached is not None and (not cached["truncated"] or cached["char_budget"] >= max_chars):
+                texts[idx] = cached["text"][:max_chars]
+                continue
+            pending.append((idx, digest))
+
+        documents = [(idx, digest) for idx, digest in pending if paths[idx].suffix.lower() in DOCUMENT_SUFFIXES]
+        plain = [(idx, digest) for idx, digest in pending if paths[idx].suffix.lower() in PLAIN_TEXT_SUFFIXES]
+        outcomes = [extract_text(paths[idx], max_chars) for idx, _ in plain]
+        if documents and self.max_workers > 0:
+            pool = self._ensure_pool()
+            outcomes += pool.map(extract_text, [paths[idx] for idx, _ in documents], [max_chars] * len(documents))
+        else:
+            outcomes += [extract_text(paths[idx], max_chars) for idx, _ in documents]
+
+        for (idx, digest), (text, truncated) in zip([*plain, *documents], outcomes):
+            texts[idx] = text
+            self.store.upsert_text_extract(digest, text=text, char_budget=max_chars, truncated=truncated)
+        return texts
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn: forking a process that holds SQLite connections and worker threads is unsafe.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
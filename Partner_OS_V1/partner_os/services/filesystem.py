@@ -5,7 +5,8 @@ from __future__ import annotations
 from pathlib import Path
 
 from partner_os.config import AppConfig
-from partner_os.constants import DEAL_JACKET_SUBDIRS, DEFAULT_FIRM_INBOX_HEADER
+from partner_os.constants import DEAL_JACKET_SUBDIRS, DEFAULT_FIRM_INBOX_HEADER, DOCUMENT_KIND_JACKET
+from partner_os.db.store import DataStore
 
 
 
@@ -14,6 +15,8 @@ def ensure_runtime_layout(config: AppConfig) -> None:
     config.root_dir.mkdir(parents=True, exist_ok=True)
     config.staging_inbox_dir.mkdir(parents=True, exist_ok=True)
     config.firm_library_dir.mkdir(parents=True, exist_ok=True)
+    config.blob_store_dir.mkdir(parents=True, exist_ok=True)
+    config.thumbnail_cache_dir.mkdir(parents=True, exist_ok=True)
     if not config.firm_inbox_path.exists():
         config.firm_inbox_path.write_text(DEFAULT_FIRM_INBOX_HEADER, encoding="utf-8")
 
@@ -24,11 +27,23 @@ def deal_root(config: AppConfig, deal_id: str, slug: str) -> Path:
 
 
 
-def ensure_deal_jacket(config: AppConfig, deal_id: str, slug: str) -> Path:
+def ensure_deal_jacket(config: AppConfig, deal_id: str, slug: str, store: DataStore | None = None) -> Path:
+    """Create the deal's folder contract once and return its root.
+
+    With a `store`, the catalog records the jacket, so later tasks skip the
+    mkdir calls as long as the root is still a directory (one stat). A root
+    deleted or moved by hand is recreated. The row rolls back with a failed
+    task, in which case the next call simply creates the folders again.
+    """
     root = deal_root(config, deal_id, slug)
+    catalogued = store is not None and store.latest_document(deal_id, DOCUMENT_KIND_JACKET) is not None
+    if catalogued and root.is_dir():
+        return root
     root.mkdir(parents=True, exist_ok=True)
     for subdir in DEAL_JACKET_SUBDIRS:
         (root / subdir).mkdir(parents=True, exist_ok=True)
+    if store is not None and not catalogued:
+        store.insert_document(deal_id, DOCUMENT_KIND_JACKET, root, summary=None, kind=DOCUMENT_KIND_JACKET)
     return root
 
 
@@ -38,9 +53,3 @@ def append_firm_inbox(config: AppConfig, content: str) -> None:
         handle.write(content)
         if not content.endswith("\n"):
             handle.write("\n")
-
-
-
-def newest_markdown_files(directory: Path, limit: int = 3) -> list[Path]:
-    files = sorted(directory.glob("*.md"), key=lambda p: p.stat().st_mtime, reverse=True)
-    return files[:limit]
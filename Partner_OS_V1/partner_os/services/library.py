@@ -0,0 +1,157 @@
+"""Firm-library manifest: detect new, changed, renamed and deleted files without re-reading."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import uuid
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping
+
+LIBRARY_EXTENSIONS = frozenset({".txt", ".md", ".pdf"})
+
+
+@dataclass(slots=True)
+class LibraryFile:
+    path: Path
+    size_bytes: int
+    mtime_ns: int
+    content_hash: str = ""
+    ref_id: str = ""
+
+
+@dataclass(slots=True)
+class LibraryScan:
+    """What an index run has to do; `unchanged` files need no reads at all."""
+
+    changed: list[LibraryFile] = field(default_factory=list)
+    renamed: list[tuple[str, LibraryFile]] = field(default_factory=list)
+    touched: list[LibraryFile] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+
+@dataclass(slots=True)
+class IndexProgress:
+    stage: str
+    done: int = 0
+    total: int = 0
+
+    @property
+    def fraction(self) -> float:
+        return self.done / self.total if self.total else 0.0
+
+    @property
+    def label(self) -> str:
+        return f"{self.stage.capitalize()} {self.done}/{self.total}" if self.total else self.stage.capitalize()
+
+
+def walk_files(root: Path, extensions: frozenset[str] = LIBRARY_EXTENSIONS) -> Iterator[LibraryFile]:
+    """Depth-first `os.scandir` walk; the stat comes from the directory entry, so no extra syscalls."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(Path(entry.path))
+            elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in extensions:
+                stat = entry.stat()
+                yield LibraryFile(path=Path(entry.path), size_bytes=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+
+def _safe_digest(path: Path) -> str | None:
+    try:
+        return file_digest(path)
+    except OSError:
+        return None
+
+
+
+def path_ref_id(path: Path) -> str:
+    return "lib-" + hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:12]
+
+
+
+def plan_library_scan(
+    files: Iterable[LibraryFile],
+    manifest: Mapping[str, Mapping[str, Any]],
+    indexed: Mapping[str, str] | None = None,
+    executor: Executor | None = None,
+) -> LibraryScan:
+    """Compare a walk against the manifest.
+
+    Files whose size and mtime match their manifest row are skipped without
+    being opened. Everything else is hashed: an unchanged hash only refreshes
+    the stat (`touched`), a hash that belongs to a path that disappeared is a
+    rename and keeps its ref_id and abstract, and the rest must be re-read.
+    `indexed` maps library_index paths to ref_ids so rows written before the
+    manifest existed keep their ids; any of them not seen are removed too.
+    With an `executor`, stat-changed files are hashed in parallel.
+    """
+    indexed = indexed or {}
+    scan = LibraryScan()
+    seen: set[str] = set()
+    stale_stat: list[LibraryFile] = []
+    for item in files:
+        key = str(item.path)
+        seen.add(key)
+        row = manifest.get(key)
+        if row is not None and row["size_bytes"] == item.size_bytes and row["mtime_ns"] == item.mtime_ns:
+            scan.unchanged += 1
+        else:
+            stale_stat.append(item)
+
+    mapper = executor.map if executor is not None else map
+    candidates: list[LibraryFile] = []
+    for item, digest in zip(stale_stat, mapper(_safe_digest, [item.path for item in stale_stat])):
+        if digest is None:
+            continue
+        item.content_hash = digest
+        row = manifest.get(str(item.path))
+        if row is not None:
+            item.ref_id = row["ref_id"]
+            if row["content_hash"] == item.content_hash:
+                scan.touched.append(item)
+                continue
+        candidates.append(item)
+
+    missing = {path: row for path, row in manifest.items() if path not in seen}
+    by_hash: dict[str, list[str]] = {}
+    for path, row in missing.items():
+        by_hash.setdefault(row["content_hash"], []).append(path)
+
+    taken = {row["ref_id"] for row in manifest.values()} | set(indexed.values())
+    for item in candidates:
+        previous = by_hash.get(item.content_hash)
+        if not item.ref_id and previous:
+            old_path = previous.pop()
+            item.ref_id = missing.pop(old_path)["ref_id"]
+            scan.renamed.append((old_path, item))
+            continue
+        if not item.ref_id:
+            item.ref_id = indexed.get(str(item.path)) or path_ref_id(item.path)
+            # A renamed file keeps the ref_id derived from its old path; never hand that id out twice.
+            if item.ref_id in taken and str(item.path) not in indexed:
+                item.ref_id = f"lib-{uuid.uuid4().hex[:12]}"
+        scan.changed.append(item)
+
+    moved = {old_path for old_path, _ in scan.renamed}
+    stale = set(missing) | {path for path in indexed if path not in seen}
+    scan.removed = sorted(stale - moved)
+    return scan
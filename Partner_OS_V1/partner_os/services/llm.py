@@ -2,58 +2,296 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
 import time
-from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field
 from typing import Any
 
+import httpx
 import requests
 
 from partner_os.config import AppConfig
 from partner_os.db.store import DataStore
+from partner_os.db.writer import StoreWriter
+from partner_os.services.ratelimit import RateLimiter
+
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 
 
 class GeminiAPIError(RuntimeError):
     """Raised when Gemini API calls fail."""
 
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    """Timeouts, connection drops, 429s and 5xx are worth retrying on another model."""
+    if isinstance(exc, GeminiAPIError):
+        return exc.retryable
+    if isinstance(exc, (requests.Timeout, requests.ConnectionError, httpx.TimeoutException, httpx.TransportError)):
+        return True
+    response = getattr(exc, "response", None)
+    return getattr(response, "status_code", None) in RETRYABLE_STATUS_CODES
+
+
+class _HedgeRace:
+    """First successful attempt of a hedged request claims the win."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.winner: str | None = None
+
+    def claim(self, route: str) -> bool:
+        with self._lock:
+            if self.winner is None:
+                self.winner = route
+                return True
+            return False
+
+
+@dataclass(slots=True)
+class SummaryResult:
+    """Outcome of one item in a batch summarization."""
+
+    index: int
+    summary: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def build_summary_prompt(text: str) -> str:
+    return (
+        "Summarize the following real-estate artifact for internal team use. "
+        "Return concise bullets: facts, risks, missing data, next actions.\n\n"
+        f"{text}"
+    )
+
+
+def build_chat_prompt(transcript: list[dict[str, Any]]) -> str:
+    rendered = "\n".join(f"{item['role']}: {item['content']}" for item in transcript)
+    return (
+        "You are The Manager in Partner OS. Provide a concise internal response, "
+        "prioritizing reliability and explicit next step.\n\n"
+        f"{rendered}"
+    )
+
+
+def build_memory_prompt(previous_summary: str, transcript: list[dict[str, Any]], max_chars: int) -> str:
+    rendered = "\n".join(f"{item['role']}: {item['content']}" for item in transcript)
+    return (
+        "Update the running summary of an internal deal conversation. Keep decisions, numbers, "
+        f"open questions and commitments. Reply with the updated summary only, under {max_chars} characters.\n\n"
+        f"Current summary:\n{previous_summary or '(none)'}\n\n"
+        f"New messages:\n{rendered}"
+    )
+
+
+def extract_response_text(data: dict[str, Any]) -> str:
+    candidate = data.get("candidates", [{}])[0]
+    parts = candidate.get("content", {}).get("parts", [])
+    text = "\n".join(part.get("text", "") for part in parts).strip()
+    if not text:
+        raise GeminiAPIError("Gemini returned an empty response.")
+    return text
+
 
 @dataclass(slots=True)
-class GeminiClient:
+class _GeminiBase:
+    """Routing, request shape and api_calls logging shared by the sync and async clients."""
+
     config: AppConfig
-    store: DataStore
+    store: DataStore | StoreWriter
+    rate_limiter: RateLimiter = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.rate_limiter = RateLimiter(self.config.gemini_requests_per_minute)
 
     @property
     def endpoint(self) -> str:
-        return (
-            "https://generativelanguage.googleapis.com/v1beta/models/"
-            f"{self.config.gemini_model}:generateContent"
-        )
+        return self.endpoint_for(self.config.gemini_model)
 
-    def generate_text(self, prompt: str, deal_id: str | None, request_type: str) -> str:
-        if not self.config.gemini_api_key:
-            self.store.insert_api_call(
-                provider="google",
-                model=self.config.gemini_model,
-                endpoint=self.endpoint,
-                request_type=request_type,
-                status="failed",
-                latency_ms=0,
-                deal_id=deal_id,
-                error_message="GEMINI_API_KEY is not configured.",
-                details={"prompt_excerpt": prompt[:200]},
-            )
-            raise GeminiAPIError("GEMINI_API_KEY is not configured.")
+    def endpoint_for(self, model: str) -> str:
+        return f"{self.config.gemini_base_url}/v1beta/models/{model}:generateContent"
 
+    def model_for(self, request_type: str) -> str:
+        return self.config.gemini_model_routes.get(request_type, self.config.gemini_model)
+
+    def _attempt_plan(self, request_type: str) -> list[tuple[str, str]]:
+        """(route, model) pairs: the routed primary, then the fallback model if distinct."""
+        primary = self.model_for(request_type)
+        plan = [("primary", primary)]
+        fallback = self.config.gemini_fallback_model
+        if fallback and fallback != primary:
+            plan.append(("fallback", fallback))
+        return plan
+
+    def _hedge_delay(self, model: str, request_type: str) -> float | None:
+        """Seconds to wait before a hedge request, from recent p95 latency; None disables hedging."""
+        if request_type not in self.config.gemini_hedge_request_types:
+            return None
+        p95 = self.store.latency_percentile(model=model, request_type=request_type, percentile=0.95)
+        if p95 is None:
+            return None
+        return max(p95, self.config.gemini_hedge_min_delay_ms) / 1000
+
+    def _request_parts(self, prompt: str) -> tuple[dict[str, str], dict[str, str], dict[str, Any]]:
         headers = {"Content-Type": "application/json"}
+        params = {"key": self.config.gemini_api_key}
         payload = {
             "contents": [{"parts": [{"text": prompt}]}],
             "generationConfig": {"response_mime_type": "text/plain"},
         }
-        params = {"key": self.config.gemini_api_key}
+        return headers, params, payload
+
+    def _log_missing_key(self, prompt: str, deal_id: str | None, request_type: str) -> GeminiAPIError:
+        model = self.model_for(request_type)
+        self.store.insert_api_call(
+            provider="google",
+            model=model,
+            endpoint=self.endpoint_for(model),
+            request_type=request_type,
+            status="failed",
+            latency_ms=0,
+            deal_id=deal_id,
+            error_message="GEMINI_API_KEY is not configured.",
+            details={"prompt_excerpt": prompt[:200]},
+        )
+        return GeminiAPIError("GEMINI_API_KEY is not configured.")
+
+    def _log_success(
+        self,
+        data: dict[str, Any],
+        model: str,
+        elapsed_ms: int,
+        deal_id: str | None,
+        request_type: str,
+        routing: dict[str, Any],
+    ) -> None:
+        usage = data.get("usageMetadata", {})
+        self.store.insert_api_call(
+            provider="google",
+            model=model,
+            endpoint=self.endpoint_for(model),
+            request_type=request_type,
+            status="success",
+            latency_ms=elapsed_ms,
+            deal_id=deal_id,
+            prompt_tokens=usage.get("promptTokenCount"),
+            completion_tokens=usage.get("candidatesTokenCount"),
+            total_tokens=usage.get("totalTokenCount"),
+            details={"response_id": data.get("responseId", ""), **routing},
+        )
+
+    def _log_failure(
+        self,
+        exc: BaseException,
+        prompt: str,
+        model: str,
+        elapsed_ms: int,
+        deal_id: str | None,
+        request_type: str,
+        routing: dict[str, Any],
+        status: str = "failed",
+    ) -> GeminiAPIError:
+        self.store.insert_api_call(
+            provider="google",
+            model=model,
+            endpoint=self.endpoint_for(model),
+            request_type=request_type,
+            status=status,
+            latency_ms=elapsed_ms,
+            deal_id=deal_id,
+            error_message=str(exc) or type(exc).__name__,
+            details={"prompt_excerpt": prompt[:200], **routing},
+        )
+        return GeminiAPIError(str(exc), retryable=is_retryable_error(exc))
+
+
+@dataclass(slots=True)
+class GeminiClient(_GeminiBase):
+    def generate_text(self, prompt: str, deal_id: str | None, request_type: str) -> str:
+        """Try the routed model (hedged when configured), then the fallback model on retryable errors."""
+        if not self.config.gemini_api_key:
+            raise self._log_missing_key(prompt, deal_id, request_type)
 
+        plan = self._attempt_plan(request_type)
+        for position, (route, model) in enumerate(plan):
+            routing = {"route": route, "fallback_from": plan[0][1]} if position else {"route": route}
+            try:
+                return self._hedged_call(prompt, deal_id, request_type, model, routing)
+            except GeminiAPIError as exc:
+                if not exc.retryable or position == len(plan) - 1:
+                    raise
+        raise GeminiAPIError("No Gemini model configured.")
+
+    def _hedged_call(
+        self,
+        prompt: str,
+        deal_id: str | None,
+        request_type: str,
+        model: str,
+        routing: dict[str, Any],
+    ) -> str:
+        delay = self._hedge_delay(model, request_type)
+        if delay is None:
+            return self._call_model(prompt, deal_id, request_type, model, routing)
+
+        race = _HedgeRace()
+        hedge_ms = int(delay * 1000)
+        pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gemini-hedge")
+        try:
+            futures = [
+                pool.submit(
+                    self._call_model, prompt, deal_id, request_type, model,
+                    {**routing, "hedge_delay_ms": hedge_ms}, race,
+                )
+            ]
+            done, _ = wait(futures, timeout=delay, return_when=FIRST_COMPLETED)
+            if not done:
+                futures.append(
+                    pool.submit(
+                        self._call_model, prompt, deal_id, request_type, model,
+                        {**routing, "route": f"{routing['route']}_hedge", "hedge_delay_ms": hedge_ms}, race, True,
+                    )
+                )
+            last_error: GeminiAPIError | None = None
+            for future in as_completed(futures):
+                try:
+                    return future.result()
+                except GeminiAPIError as exc:
+                    last_error = exc
+            raise last_error or GeminiAPIError("Hedged request produced no result.")
+        finally:
+            pool.shutdown(wait=False)
+
+    def _call_model(
+        self,
+        prompt: str,
+        deal_id: str | None,
+        request_type: str,
+        model: str,
+        routing: dict[str, Any],
+        race: _HedgeRace | None = None,
+        hedge: bool = False,
+    ) -> str:
+        headers, params, payload = self._request_parts(prompt)
+
+        if hedge:
+            self.rate_limiter.charge()
+        else:
+            self.rate_limiter.acquire()
         start = time.perf_counter()
         try:
             response = requests.post(
-                self.endpoint,
+                self.endpoint_for(model),
                 headers=headers,
                 params=params,
                 json=payload,
@@ -62,59 +300,188 @@ class GeminiClient:
             elapsed_ms = int((time.perf_counter() - start) * 1000)
             response.raise_for_status()
             data = response.json()
-
-            candidate = data.get("candidates", [{}])[0]
-            parts = candidate.get("content", {}).get("parts", [])
-            text = "\n".join(part.get("text", "") for part in parts).strip()
-            if not text:
-                raise GeminiAPIError("Gemini returned an empty response.")
-
-            usage = data.get("usageMetadata", {})
-            self.store.insert_api_call(
-                provider="google",
-                model=self.config.gemini_model,
-                endpoint=self.endpoint,
-                request_type=request_type,
-                status="success",
-                latency_ms=elapsed_ms,
-                deal_id=deal_id,
-                prompt_tokens=usage.get("promptTokenCount"),
-                completion_tokens=usage.get("candidatesTokenCount"),
-                total_tokens=usage.get("totalTokenCount"),
-                details={"response_id": data.get("responseId", "")},
-            )
+            text = extract_response_text(data)
+            if race is not None:
+                routing = {**routing, "hedged": True, "won": race.claim(routing["route"])}
+            self._log_success(data, model, elapsed_ms, deal_id, request_type, routing)
             return text
         except Exception as exc:  # noqa: BLE001
             elapsed_ms = int((time.perf_counter() - start) * 1000)
-            self.store.insert_api_call(
-                provider="google",
-                model=self.config.gemini_model,
-                endpoint=self.endpoint,
-                request_type=request_type,
-                status="failed",
-                latency_ms=elapsed_ms,
-                deal_id=deal_id,
-                error_message=str(exc),
-                details={"prompt_excerpt": prompt[:200]},
-            )
-            raise GeminiAPIError(str(exc)) from exc
+            raise self._log_failure(exc, prompt, model, elapsed_ms, deal_id, request_type, routing) from exc
 
     def summarize_text(self, text: str, deal_id: str | None) -> str:
-        prompt = (
-            "Summarize the following real-estate artifact for internal team use. "
-            "Return concise bullets: facts, risks, missing data, next actions.\n\n"
-            f"{text}"
-        )
-        return self.generate_text(prompt=prompt, deal_id=deal_id, request_type="summary")
+        return self.generate_text(prompt=build_summary_prompt(text), deal_id=deal_id, request_type="summary")
+
+    def summarize_many(
+        self,
+        texts: list[str],
+        deal_id: str | None = None,
+        max_concurrency: int | None = None,
+    ) -> list[SummaryResult]:
+        """Summarize texts concurrently; results keep input order and failures stay per-item."""
+        if not texts:
+            return []
+        workers = max(1, min(max_concurrency or self.config.gemini_max_concurrency, len(texts)))
+
+        def run(index: int, text: str) -> SummaryResult:
+            try:
+                return SummaryResult(index=index, summary=self.summarize_text(text, deal_id=deal_id))
+            except GeminiAPIError as exc:
+                return SummaryResult(index=index, error=str(exc))
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gemini-batch") as pool:
+            return list(pool.map(run, range(len(texts)), texts))
 
     def chat_reply(self, transcript: list[dict[str, Any]], deal_id: str | None) -> str:
-        rendered = "\n".join(f"{item['role']}: {item['content']}" for item in transcript)
-        prompt = (
-            "You are The Manager in Partner OS. Provide a concise internal response, "
-            "prioritizing reliability and explicit next step.\n\n"
-            f"{rendered}"
+        return self.generate_text(prompt=build_chat_prompt(transcript), deal_id=deal_id, request_type="chat")
+
+    def update_memory_summary(
+        self,
+        previous_summary: str,
+        transcript: list[dict[str, Any]],
+        deal_id: str | None,
+        max_chars: int,
+    ) -> str:
+        prompt = build_memory_prompt(previous_summary, transcript, max_chars)
+        return self.generate_text(prompt=prompt, deal_id=deal_id, request_type="memory")
+
+
+@dataclass(slots=True)
+class AsyncGeminiClient(_GeminiBase):
+    """Asyncio variant of GeminiClient; many calls share one event-loop thread."""
+
+    http: httpx.AsyncClient | None = None
+
+    async def generate_text(self, prompt: str, deal_id: str | None, request_type: str) -> str:
+        if not self.config.gemini_api_key:
+            raise self._log_missing_key(prompt, deal_id, request_type)
+
+        plan = self._attempt_plan(request_type)
+        for position, (route, model) in enumerate(plan):
+            routing = {"route": route, "fallback_from": plan[0][1]} if position else {"route": route}
+            try:
+                return await self._hedged_call(prompt, deal_id, request_type, model, routing)
+            except GeminiAPIError as exc:
+                if not exc.retryable or position == len(plan) - 1:
+                    raise
+        raise GeminiAPIError("No Gemini model configured.")
+
+    async def _hedged_call(
+        self,
+        prompt: str,
+        deal_id: str | None,
+        request_type: str,
+        model: str,
+        routing: dict[str, Any],
+    ) -> str:
+        delay = self._hedge_delay(model, request_type)
+        if delay is None:
+            return await self._call_model(prompt, deal_id, request_type, model, routing)
+
+        race = _HedgeRace()
+        hedge_ms = int(delay * 1000)
+        tasks = [
+            asyncio.create_task(
+                self._call_model(prompt, deal_id, request_type, model, {**routing, "hedge_delay_ms": hedge_ms}, race)
+            )
+        ]
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            hedge_routing = {**routing, "route": f"{routing['route']}_hedge", "hedge_delay_ms": hedge_ms}
+            tasks.append(
+                asyncio.create_task(self._call_model(prompt, deal_id, request_type, model, hedge_routing, race, True))
+            )
+        try:
+            last_error: GeminiAPIError | None = None
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    return await next_done
+                except GeminiAPIError as exc:
+                    last_error = exc
+            raise last_error or GeminiAPIError("Hedged request produced no result.")
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _call_model(
+        self,
+        prompt: str,
+        deal_id: str | None,
+        request_type: str,
+        model: str,
+        routing: dict[str, Any],
+        race: _HedgeRace | None = None,
+        hedge: bool = False,
+    ) -> str:
+        headers, params, payload = self._request_parts(prompt)
+
+        if hedge:
+            self.rate_limiter.charge()
+        else:
+            await self.rate_limiter.acquire_async()
+        start = time.perf_counter()
+        try:
+            if self.http is None:
+                async with httpx.AsyncClient() as http:
+                    response = await self._post(http, model, headers, params, payload)
+            else:
+                response = await self._post(self.http, model, headers, params, payload)
+            elapsed_ms = int((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+            data = response.json()
+            text = extract_response_text(data)
+            if race is not None:
+                routing = {**routing, "hedged": True, "won": race.claim(routing["route"])}
+            self._log_success(data, model, elapsed_ms, deal_id, request_type, routing)
+            return text
+        except asyncio.CancelledError as exc:
+            elapsed_ms = int((time.perf_counter() - start) * 1000)
+            self._log_failure(exc, prompt, model, elapsed_ms, deal_id, request_type, routing, status="cancelled")
+            raise
+        except Exception as exc:  # noqa: BLE001
+            elapsed_ms = int((time.perf_counter() - start) * 1000)
+            raise self._log_failure(exc, prompt, model, elapsed_ms, deal_id, request_type, routing) from exc
+
+    async def _post(
+        self,
+        http: httpx.AsyncClient,
+        model: str,
+        headers: dict[str, str],
+        params: dict[str, str],
+        payload: dict[str, Any],
+    ) -> httpx.Response:
+        return await http.post(
+            self.endpoint_for(model),
+            headers=headers,
+            params=params,
+            json=payload,
+            timeout=self.config.gemini_timeout_seconds,
         )
-        return self.generate_text(prompt=prompt, deal_id=deal_id, request_type="chat")
+
+    async def summarize_text(self, text: str, deal_id: str | None) -> str:
+        return await self.generate_text(prompt=build_summary_prompt(text), deal_id=deal_id, request_type="summary")
+
+    async def summarize_many(
+        self,
+        texts: list[str],
+        deal_id: str | None = None,
+        max_concurrency: int | None = None,
+    ) -> list[SummaryResult]:
+        """Async counterpart of GeminiClient.summarize_many."""
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or self.config.gemini_max_concurrency))
+
+        async def run(index: int, text: str) -> SummaryResult:
+            async with semaphore:
+                try:
+                    return SummaryResult(index=index, summary=await self.summarize_text(text, deal_id=deal_id))
+                except GeminiAPIError as exc:
+                    return SummaryResult(index=index, error=str(exc))
+
+        return list(await asyncio.gather(*(run(index, text) for index, text in enumerate(texts))))
+
+    async def chat_reply(self, transcript: list[dict[str, Any]], deal_id: str | None) -> str:
+        return await self.generate_text(prompt=build_chat_prompt(transcript), deal_id=deal_id, request_type="chat")
 
 
 @dataclass(slots=True)
@@ -124,5 +491,22 @@ class NullLLMClient:
     def summarize_text(self, text: str, deal_id: str | None) -> str:  # noqa: ARG002
         raise GeminiAPIError("LLM unavailable")
 
+    def summarize_many(
+        self,
+        texts: list[str],
+        deal_id: str | None = None,  # noqa: ARG002
+        max_concurrency: int | None = None,  # noqa: ARG002
+    ) -> list[SummaryResult]:
+        return [SummaryResult(index=index, error="LLM unavailable") for index in range(len(texts))]
+
     def chat_reply(self, transcript: list[dict[str, Any]], deal_id: str | None) -> str:  # noqa: ARG002
         raise GeminiAPIError("LLM unavailable")
+
+    def update_memory_summary(
+        self,
+        previous_summary: str,  # noqa: ARG002
+        transcript: list[dict[str, Any]],  # noqa: ARG002
+        deal_id: str | None,  # noqa: ARG002
+        max_chars: int,  # noqa: ARG002
+    ) -> str:
+        raise GeminiAPIError("LLM unavailable")
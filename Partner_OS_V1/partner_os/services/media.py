@@ -0,0 +1,381 @@
+"""Media metadata and thumbnails for photos, video and audio, parsed from container headers."""
+
+from __future__ import annotations
+
+import mmap
+import multiprocessing
+import struct
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from partner_os.constants import EXTENSION_TO_SUBDIR
+from partner_os.db.store import DataStore
+
+MEDIA_KINDS = {"01_Intel_Photos": "photo", "02_Intel_Video": "video", "03_Intel_Audio": "audio"}
+MEDIA_SUFFIXES = frozenset(suffix for suffix, subdir in EXTENSION_TO_SUBDIR.items() if subdir in MEDIA_KINDS)
+THUMBNAIL_PX = 320
+MP3_PROBE_BYTES = 64 * 1024
+_MP4_CONTAINERS = frozenset({b"moov", b"trak"})
+_MP4_EPOCH = datetime(1904, 1, 1, tzinfo=timezone.utc)
+_TIFF_TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 7: 1, 9: 4, 10: 8}
+_JPEG_SOF = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+_MP3_BITRATES = {
+    3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+@dataclass(slots=True)
+class MediaInfo:
+    kind: str
+    width: int | None = None
+    height: int | None = None
+    duration_seconds: float | None = None
+    captured_at: str | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    camera: str | None = None
+    thumbnail_path: str | None = None
+
+    @classmethod
+    def from_row(cls, row: Any) -> MediaInfo:
+        return cls(**{name: row[name] for name in cls.__dataclass_fields__})
+
+    def describe(self) -> str:
+        """One-line summary used in place of an LLM summary for media artifacts."""
+        parts = [self.kind.capitalize()]
+        if self.width and self.height:
+            parts.append(f"{self.width}x{self.height}")
+        if self.duration_seconds is not None:
+            minutes, seconds = divmod(round(self.duration_seconds), 60)
+            parts.append(f"{minutes}:{seconds:02d} long")
+        if self.captured_at:
+            parts.append(f"captured {self.captured_at}")
+        if self.latitude is not None and self.longitude is not None:
+            parts.append(f"GPS {self.latitude:.5f}, {self.longitude:.5f}")
+        if self.camera:
+            parts.append(self.camera)
+        return "; ".join(parts)
+
+
+
+def probe_media(path: Path, thumbnail_path: Path) -> MediaInfo:
+    """Read metadata from headers only and write a thumbnail for photos; runs in a worker process.
+
+    JPEG EXIF (capture time, GPS, camera, embedded thumbnail), PNG IHDR,
+    MP4/MOV `mvhd`/`tkhd`, WAV `fmt`/`data` and MP3 frame headers are
+    parsed directly, so large videos are never read past their box headers.
+    """
+    suffix = path.suffix.lower()
+    kind = MEDIA_KINDS[EXTENSION_TO_SUBDIR[suffix]]
+    info = MediaInfo(kind=kind)
+    embedded: bytes | None = None
+    try:
+        with path.open("rb") as handle:
+            size = handle.seek(0, 2)
+            if size == 0:
+                return info
+            if suffix in {".jpg", ".jpeg"}:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    embedded = _read_jpeg(data, info)
+            elif suffix == ".png":
+                handle.seek(0)
+                header = handle.read(24)
+                if header[:8] == b"\x89PNG\r\n\x1a\n" and header[12:16] == b"IHDR":
+                    info.width, info.height = struct.unpack(">II", header[16:24])
+            elif suffix in {".mp4", ".mov"}:
+                _read_mp4(handle, 0, size, info)
+            elif suffix == ".wav":
+                _read_wav(handle, size, info)
+            elif suffix == ".mp3":
+                handle.seek(0)
+                _read_mp3(handle.read(MP3_PROBE_BYTES), size, info)
+    except (OSError, ValueError, IndexError, struct.error):
+        # A truncated or malformed header leaves whatever was parsed before it.
+        return info
+    if kind == "photo" and _write_thumbnail(path, embedded, thumbnail_path):
+        info.thumbnail_path = str(thumbnail_path)
+    return info
+
+
+
+def _read_jpeg(data: mmap.mmap, info: MediaInfo) -> bytes | None:
+    """Walk JPEG segments up to the scan data; returns the EXIF embedded thumbnail, if any."""
+    if data[:2] != b"\xff\xd8":
+        return None
+    embedded = None
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            break
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            pos += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            pos += 2
+            continue
+        if marker in (0xDA, 0xD9):
+            break
+        (length,) = struct.unpack(">H", data[pos + 2 : pos + 4])
+        segment = data[pos + 4 : pos + 2 + length]
+        if marker == 0xE1 and segment[:6] == b"Exif\x00\x00":
+            try:
+                embedded = _read_exif(segment[6:], info)
+            except (struct.error, IndexError, KeyError):
+                embedded = None
+        elif marker in _JPEG_SOF and len(segment) >= 5:
+            height, width = struct.unpack(">HH", segment[1:5])
+            info.width, info.height = info.width or width, info.height or height
+        pos += 2 + length
+    return embedded
+
+
+
+def _read_exif(tiff: bytes, info: MediaInfo) -> bytes | None:
+    if tiff[:2] not in (b"II", b"MM"):
+        return None
+    endian = "<" if tiff[:2] == b"II" else ">"
+    ifd0, ifd1 = _read_ifd(tiff, struct.unpack_from(endian + "I", tiff, 4)[0], endian)
+    exif = _ifd_entries(tiff, ifd0[0x8769][0], endian) if 0x8769 in ifd0 else {}
+    gps = _ifd_entries(tiff, ifd0[0x8825][0], endian) if 0x8825 in ifd0 else {}
+
+    camera = " ".join(str(ifd0[tag]).strip() for tag in (0x010F, 0x0110) if ifd0.get(tag))
+    info.camera = camera or None
+    stamp = exif.get(0x9003) or ifd0.get(0x0132)
+    if isinstance(stamp, str) and len(stamp) >= 19:
+        info.captured_at = stamp[:10].replace(":", "-") + "T" + stamp[11:19]
+    if 0xA002 in exif and 0xA003 in exif:
+        info.width, info.height = exif[0xA002][0], exif[0xA003][0]
+    if ifd0.get(0x0112, (1,))[0] in (5, 6, 7, 8) and info.width and info.height:
+        info.width, info.height = info.height, info.width
+    for ref_tag, value_tag, negative, attr in ((1, 2, "S", "latitude"), (3, 4, "W", "longitude")):
+        value = gps.get(value_tag)
+        if isinstance(value, tuple) and len(value) == 3:
+            degrees = value[0] + value[1] / 60 + value[2] / 3600
+            setattr(info, attr, -degrees if str(gps.get(ref_tag, "")).upper() == negative else degrees)
+
+    if ifd1 and 0x0201 in ifd1 and 0x0202 in ifd1:
+        start, length = ifd1[0x0201][0], ifd1[0x0202][0]
+        thumbnail = tiff[start : start + length]
+        if thumbnail[:2] == b"\xff\xd8" and len(thumbnail) == length:
+            return thumbnail
+    return None
+
+
+
+def _read_ifd(tiff: bytes, offset: int, endian: str) -> tuple[dict[int, Any], dict[int, Any]]:
+    """Entries of the IFD at `offset` and of the IFD chained after it (IFD1 for IFD0)."""
+    entries = _ifd_entries(tiff, offset, endian)
+    count = struct.unpack_from(endian + "H", tiff, offset)[0]
+    (next_offset,) = struct.unpack_from(endian + "I", tiff, offset + 2 + 12 * count)
+    chained = _ifd_entries(tiff, next_offset, endian) if 0 < next_offset < len(tiff) else {}
+    return entries, chained
+
+
+
+def _ifd_entries(tiff: bytes, offset: int, endian: str) -> dict[int, Any]:
+    entries: dict[int, Any] = {}
+    (count,) = struct.unpack_from(endian + "H", tiff, offset)
+    for idx in range(count):
+        entry = offset + 2 + 12 * idx
+        tag, kind, items = struct.unpack_from(endian + "HHI", tiff, entry)
+        size = _TIFF_TYPE_SIZES.get(kind, 0) * items
+        if size == 0:
+            continue
+        start = entry + 8 if size <= 4 else struct.unpack_from(endian + "I", tiff, entry + 8)[0]
+        raw = tiff[start : start + size]
+        if len(raw) < size:
+            continue
+        if kind == 2:
+            entries[tag] = raw.split(b"\x00", 1)[0].decode("latin-1")
+        elif kind == 3:
+            entries[tag] = struct.unpack(f"{endian}{items}H", raw)
+        elif kind == 4:
+            entries[tag] = struct.unpack(f"{endian}{items}I", raw)
+        elif kind == 5:
+            pairs = struct.unpack(f"{endian}{2 * items}I", raw)
+            entries[tag] = tuple(num / den if den else 0.0 for num, den in zip(pairs[::2], pairs[1::2]))
+    return entries
+
+
+
+def _read_mp4(handle: BinaryIO, start: int, end: int, info: MediaInfo) -> None:
+    """Seek through ISO-BMFF boxes, descending into moov/trak; `mdat` payloads are skipped, not read."""
+    pos = start
+    while pos + 8 <= end:
+        handle.seek(pos)
+        box_size, box_type = struct.unpack(">I4s", handle.read(8))
+        header = 8
+        if box_size == 1:
+            (box_size,) = struct.unpack(">Q", handle.read(8))
+            header = 16
+        elif box_size == 0:
+            box_size = end - pos
+        if box_size < header:
+            return
+        if box_type in _MP4_CONTAINERS:
+            _read_mp4(handle, pos + header, pos + box_size, info)
+        elif box_type == b"mvhd":
+            body = handle.read(min(box_size - header, 32))
+            if len(body) < 20 or (body[0] == 1 and len(body) < 32):
+                return
+            if body[0] == 1:
+                created, _, timescale, duration = struct.unpack_from(">QQIQ", body, 4)
+            else:
+                created, _, timescale, duration = struct.unpack_from(">IIII", body, 4)
+            if timescale:
+                info.duration_seconds = round(duration / timescale, 3)
+            if created:
+                info.captured_at = (_MP4_EPOCH + timedelta(seconds=created)).strftime("%Y-%m-%dT%H:%M:%S")
+        elif box_type == b"tkhd" and not info.width:
+            body = handle.read(min(box_size - header, 96))
+            offset = 88 if body[:1] == b"\x01" else 76
+            if len(body) < offset + 8:
+                return
+            width, height = struct.unpack_from(">II", body, offset)
+            if width and height:
+                info.width, info.height = width >> 16, height >> 16
+        pos += box_size
+
+
+
+def _read_wav(handle: BinaryIO, size: int, info: MediaInfo) -> None:
+    handle.seek(0)
+    if handle.read(12)[8:12] != b"WAVE":
+        return
+    byte_rate = 0
+    pos = 12
+    while pos + 8 <= size:
+        handle.seek(pos)
+        chunk_id, chunk_size = struct.unpack("<4sI", handle.read(8))
+        if chunk_id == b"fmt ":
+            byte_rate = struct.unpack("<I", handle.read(12)[8:12])[0]
+        elif chunk_id == b"data" and byte_rate:
+            info.duration_seconds = round(min(chunk_size, size - pos - 8) / byte_rate, 3)
+            return
+        pos += 8 + chunk_size + (chunk_size & 1)
+
+
+
+def _read_mp3(head: bytes, size: int, info: MediaInfo) -> None:
+    """Duration from the Xing/Info frame count when present, else from the first frame's constant bitrate."""
+    start = 0
+    if head[:3] == b"ID3" and len(head) >= 10:
+        start = 10 + (head[6] << 21 | head[7] << 14 | head[8] << 7 | head[9]) + (10 if head[5] & 0x10 else 0)
+    for pos in range(start, len(head) - 4):
+        if head[pos] != 0xFF or head[pos + 1] & 0xE0 != 0xE0:
+            continue
+        word = int.from_bytes(head[pos : pos + 4], "big")
+        version, layer = word >> 19 & 3, word >> 17 & 3
+        bitrate_idx, rate_idx, mono = word >> 12 & 15, word >> 10 & 3, (word >> 6 & 3) == 3
+        if layer != 1 or version == 1 or bitrate_idx in (0, 15) or rate_idx == 3:
+            continue
+        bitrate = _MP3_BITRATES[3 if version == 3 else 2][bitrate_idx] * 1000
+        sample_rate = _MP3_SAMPLE_RATES[version][rate_idx]
+        samples = 1152 if version == 3 else 576
+        side_info = (17 if mono else 32) if version == 3 else (9 if mono else 17)
+        xing = pos + 4 + side_info
+        if head[xing : xing + 4] in (b"Xing", b"Info") and len(head) >= xing + 12 and head[xing + 7] & 1:
+            (frames,) = struct.unpack(">I", head[xing + 8 : xing + 12])
+            info.duration_seconds = round(frames * samples / sample_rate, 3)
+        else:
+            info.duration_seconds = round((size - pos) * 8 / bitrate, 3)
+        return
+
+
+
+def _write_thumbnail(path: Path, embedded: bytes | None, target: Path) -> bool:
+    """Prefer the camera's embedded EXIF thumbnail (no decoding); otherwise downscale with Pillow.
+
+    Pillow ships with Streamlit; where it is missing, photos without an
+    embedded thumbnail simply have none.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_suffix(".part")
+    if embedded:
+        partial.write_bytes(embedded)
+        partial.replace(target)
+        return True
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return False
+    try:
+        with Image.open(path) as image:
+            # draft() lets the JPEG decoder scale by up to 1/8 while decoding.
+            image.draft("RGB", (THUMBNAIL_PX, THUMBNAIL_PX))
+            thumbnail = ImageOps.exif_transpose(image).convert("RGB")
+            thumbnail.thumbnail((THUMBNAIL_PX, THUMBNAIL_PX))
+            thumbnail.save(partial, "JPEG", quality=80)
+    except (OSError, ValueError):
+        partial.unlink(missing_ok=True)
+        return False
+    partial.replace(target)
+    return True
+
+
+
+@dataclass(slots=True)
+class MediaProcessor:
+    """Extract media metadata for many files, cached by content hash.
+
+    Parsing and thumbnailing run in a process pool of `max_workers` (inline
+    when 0), like `TextExtractor`. Thumbnails are cached at
+    `thumbnail_dir/<hash[:2]>/<hash>.jpg`, so a photo is decoded at most once
+    however often it is uploaded or displayed.
+    """
+
+    store: DataStore
+    thumbnail_dir: Path
+    max_workers: int = 2
+    _pool: ProcessPoolExecutor | None = field(default=None, init=False)
+    _pool_lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def thumbnail_path(self, content_hash: str) -> Path:
+        return self.thumbnail_dir / content_hash[:2] / f"{content_hash}.jpg"
+
+    def process_many(self, paths: list[Path], hashes: list[str]) -> list[MediaInfo | None]:
+        """Metadata per path (None for non-media files), parsing only hashes not seen before."""
+        infos: list[MediaInfo | None] = [None] * len(paths)
+        pending: dict[str, Path] = {}
+        for idx, (path, content_hash) in enumerate(zip(paths, hashes)):
+            if path.suffix.lower() not in MEDIA_SUFFIXES:
+                continue
+            cached = self.store.get_media_metadata(content_hash)
+            if cached is not None:
+                infos[idx] = MediaInfo.from_row(cached)
+            else:
+                pending.setdefault(content_hash, path)
+
+        targets = [self.thumbnail_path(content_hash) for content_hash in pending]
+        if pending and self.max_workers > 0:
+            outcomes = list(self._ensure_pool().map(probe_media, pending.values(), targets))
+        else:
+            outcomes = [probe_media(path, target) for path, target in zip(pending.values(), targets)]
+
+        probed = dict(zip(pending, outcomes))
+        for content_hash, info in probed.items():
+            self.store.upsert_media_metadata(content_hash, asdict(info))
+        for idx, content_hash in enumerate(hashes):
+            if infos[idx] is None and content_hash in probed:
+                infos[idx] = probed[content_hash]
+        return infos
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
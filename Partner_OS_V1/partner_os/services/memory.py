@@ -0,0 +1,71 @@
+"""Rolling per-deal conversation memory for bounded chat prompts."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from partner_os.db.store import DataStore
+from partner_os.services.llm import GeminiAPIError, GeminiClient, NullLLMClient
+
+
+@dataclass(slots=True)
+class ConversationMemory:
+    """Keep the last `recent_turns` messages verbatim and fold older ones into a summary.
+
+    The summary and the id of the last folded message live in
+    `conversation_memory`, so each call only reads messages newer than that
+    watermark and the rendered transcript stays bounded however long a deal
+    thread runs.
+    """
+
+    store: DataStore
+    llm_client: GeminiClient | NullLLMClient
+    recent_turns: int = 8
+    summary_max_chars: int = 2000
+
+    def build_transcript(self, deal_id: str) -> list[dict[str, Any]]:
+        memory = self.store.get_conversation_memory(deal_id)
+        summary = memory["summary"] if memory else ""
+        watermark = int(memory["summarized_through_id"]) if memory else 0
+
+        messages = self.store.list_deal_chat_messages(deal_id, after_message_id=watermark)
+        keep = max(self.recent_turns, 0)
+        overflow = messages[: len(messages) - keep] if len(messages) > keep else []
+        recent = messages[len(overflow):]
+
+        if overflow:
+            summary = self._fold(deal_id, summary, [self._as_turn(row) for row in overflow])
+            self.store.upsert_conversation_memory(
+                deal_id=deal_id,
+                summary=summary,
+                summarized_through_id=int(overflow[-1]["message_id"]),
+            )
+
+        transcript: list[dict[str, Any]] = []
+        if summary:
+            transcript.append({"role": "system", "content": f"Earlier conversation summary:\n{summary}"})
+        transcript.extend(self._as_turn(row) for row in recent)
+        return transcript
+
+    def _fold(self, deal_id: str, summary: str, turns: list[dict[str, Any]]) -> str:
+        try:
+            updated = self.llm_client.update_memory_summary(
+                previous_summary=summary,
+                transcript=turns,
+                deal_id=deal_id,
+                max_chars=self.summary_max_chars,
+            ).strip()
+        except GeminiAPIError:
+            updated = ""
+        if not updated:
+            lines = [summary] if summary else []
+            lines.extend(f"- {turn['role']}: {' '.join(str(turn['content']).split())[:160]}" for turn in turns)
+            updated = "\n".join(lines)
+        if len(updated) > self.summary_max_chars:
+            updated = updated[-self.summary_max_chars :]
+        return updated
+
+    @staticmethod
+    def _as_turn(row: Any) -> dict[str, Any]:
+        return {"role": row["role"], "content": row["content"]}
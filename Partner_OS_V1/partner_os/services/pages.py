@@ -0,0 +1,217 @@
+"""Concurrent source-page fetcher with a conditional-GET disk cache for Scout citations."""
+
+from __future__ import annotations
+
+import codecs
+import gzip
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Iterable
+from urllib.parse import urlparse
+
+import requests
+
+SKIPPED_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "svg", "iframe", "template"}
+BLOCK_TAGS = {"p", "div", "li", "br", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article", "td", "th"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+CHUNK_BYTES = 16 * 1024
+TEXT_CONTENT_TYPES = frozenset({"text/html", "text/plain", "application/xhtml+xml"})
+
+
+class MainTextExtractor(HTMLParser):
+    """Incremental visible-text extractor; keeps at most `max_chars` characters."""
+
+    def __init__(self, max_chars: int = 20000):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self._skip_depth = 0
+        self._parts: list[str] = []
+        self._size = 0
+
+    @property
+    def full(self) -> bool:
+        return self._size >= self.max_chars
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:  # noqa: ARG002
+        if tag in VOID_TAGS:
+            if tag == "br":
+                self._append("\n")
+            return
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self._append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in BLOCK_TAGS:
+            self._append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self._append(data.replace("\n", " "))
+
+    def text(self) -> str:
+        lines = (" ".join(line.split()) for line in "".join(self._parts).splitlines())
+        return "\n".join(line for line in lines if line)[: self.max_chars]
+
+    def _append(self, value: str) -> None:
+        if self._size < self.max_chars:
+            self._parts.append(value)
+            self._size += len(value)
+
+
+
+@dataclass(slots=True)
+class FetchedPage:
+    """`status` is fetched, revalidated, skipped (not an HTML/text body) or failed."""
+
+    url: str
+    status: str
+    text: str = ""
+    error: str | None = None
+
+
+
+@dataclass(slots=True)
+class PageFetcher:
+    """Fetch pages concurrently with per-host politeness and ETag/Last-Modified revalidation.
+
+    Bodies are streamed in fixed-size chunks into both the text extractor and a
+    gzip file in `cache_dir`, so memory stays bounded by `max_text_chars`
+    regardless of page size; downloads stop after `max_bytes`.
+    """
+
+    cache_dir: Path
+    max_workers: int = 8
+    per_host: int = 2
+    per_host_delay_seconds: float = 0.25
+    max_bytes: int = 2_000_000
+    max_text_chars: int = 20000
+    timeout_seconds: int = 10
+    user_agent: str = "PartnerOS-Scout/1.0"
+    _host_slots: dict[str, threading.Semaphore] = field(default_factory=dict, init=False)
+    _host_last: dict[str, float] = field(default_factory=dict, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    _session: requests.Session = field(default_factory=requests.Session, init=False)
+
+    def fetch_many(self, urls: Iterable[str]) -> dict[str, FetchedPage]:
+        unique = list(dict.fromkeys(urls))
+        if not unique:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique)), thread_name_prefix="page-fetch") as pool:
+            return dict(zip(unique, pool.map(self.fetch, unique)))
+
+    def fetch(self, url: str) -> FetchedPage:
+        host = (urlparse(url).hostname or "").lower()
+        if not host:
+            return FetchedPage(url=url, status="failed", error="URL has no host.")
+
+        with self._host_slot(host):
+            try:
+                return self._fetch(url)
+            except Exception as exc:  # noqa: BLE001
+                return FetchedPage(url=url, status="failed", error=str(exc))
+
+    def _fetch(self, url: str) -> FetchedPage:
+        meta_path, body_path = self._cache_paths(url)
+        meta = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() and body_path.exists() else {}
+
+        headers = {"User-Agent": self.user_agent}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+        with self._session.get(url, headers=headers, timeout=self.timeout_seconds, stream=True) as response:
+            if response.status_code == 304 and meta:
+                text = self._extract_cached(body_path, meta.get("encoding") or "utf-8")
+                return FetchedPage(url=url, status="revalidated", text=text)
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            if content_type and content_type not in TEXT_CONTENT_TYPES:
+                return FetchedPage(url=url, status="skipped", error=f"Unsupported content type {content_type}.")
+
+            extractor = MainTextExtractor(self.max_text_chars)
+            decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="ignore")
+            tmp_path = body_path.with_suffix(".tmp")
+            received = 0
+            with gzip.open(tmp_path, "wb") as sink:
+                for chunk in response.iter_content(CHUNK_BYTES):
+                    sink.write(chunk)
+                    if not extractor.full:
+                        extractor.feed(decoder.decode(chunk))
+                    received += len(chunk)
+                    if received >= self.max_bytes:
+                        break
+            tmp_path.replace(body_path)
+            meta_path.write_text(
+                json.dumps(
+                    {
+                        "url": url,
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                        "encoding": response.encoding,
+                        "bytes": received,
+                        "fetched_at": time.time(),
+                    }
+                ),
+                encoding="utf-8",
+            )
+        extractor.close()
+        return FetchedPage(url=url, status="fetched", text=extractor.text())
+
+    def _extract_cached(self, body_path: Path, encoding: str) -> str:
+        extractor = MainTextExtractor(self.max_text_chars)
+        decoder = codecs.getincrementaldecoder(encoding)(errors="ignore")
+        with gzip.open(body_path, "rb") as source:
+            while not extractor.full:
+                chunk = source.read(CHUNK_BYTES)
+                if not chunk:
+                    break
+                extractor.feed(decoder.decode(chunk))
+        extractor.close()
+        return extractor.text()
+
+    def _cache_paths(self, url: str) -> tuple[Path, Path]:
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        shard = self.cache_dir / digest[:2]
+        shard.mkdir(parents=True, exist_ok=True)
+        return shard / f"{digest}.json", shard / f"{digest}.html.gz"
+
+    def _host_slot(self, host: str) -> _HostSlot:
+        with self._lock:
+            slot = self._host_slots.setdefault(host, threading.Semaphore(max(1, self.per_host)))
+        return _HostSlot(self, host, slot)
+
+    def _wait_politely(self, host: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._host_last.get(host, 0.0) + self.per_host_delay_seconds)
+            self._host_last[host] = start
+        if start > now:
+            time.sleep(start - now)
+
+
+
+class _HostSlot:
+    """Holds one of a host's concurrency slots and spaces request starts per host."""
+
+    def __init__(self, fetcher: PageFetcher, host: str, slot: threading.Semaphore):
+        self._fetcher = fetcher
+        self._host = host
+        self._slot = slot
+
+    def __enter__(self) -> None:
+        self._slot.acquire()
+        self._fetcher._wait_politely(self._host)
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._slot.release()
@@ -0,0 +1,140 @@
+"""Offline parcel index: bulk GeoJSON import into SQLite with R-tree lookup."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from partner_os.db.store import DataStore
+from partner_os.models import ParcelRecord
+from partner_os.services.parcels import parcel_from_attributes, point_in_rings
+
+
+def iter_features(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield features from a FeatureCollection or, streamed line by line, from GeoJSONSeq."""
+    with path.open(encoding="utf-8") as handle:
+        first = handle.readline().lstrip("\x1e").strip()
+        try:
+            head = json.loads(first) if first else None
+        except json.JSONDecodeError:
+            head = None
+
+        if isinstance(head, dict) and head.get("type") == "Feature":
+            yield head
+            for line in handle:
+                line = line.lstrip("\x1e").strip()
+                if line:
+                    yield json.loads(line)
+            return
+
+        handle.seek(0)
+        data = json.load(handle)
+    if data.get("type") == "Feature":
+        yield data
+    else:
+        yield from data.get("features") or []
+
+
+
+def feature_rings(geometry: dict[str, Any] | None) -> list[list[list[float]]]:
+    """Flatten Polygon/MultiPolygon coordinates into one ring list for even-odd testing."""
+    if not geometry:
+        return []
+    if geometry.get("type") == "Polygon":
+        return geometry["coordinates"]
+    if geometry.get("type") == "MultiPolygon":
+        return [ring for polygon in geometry["coordinates"] for ring in polygon]
+    return []
+
+
+
+@dataclass(slots=True)
+class ParcelIndex:
+    """Point-to-parcel lookups against a locally imported taxlot export.
+
+    Bounding boxes live in an SQLite R-tree, so a lookup reads only the few
+    parcels whose box contains the point and refines them by point-in-polygon.
+    Coordinates are compared as imported, so points must use the export's
+    spatial reference (WGS84 for GeoJSON).
+    """
+
+    store: DataStore
+    _count: int | None = field(default=None, init=False)
+
+    @property
+    def available(self) -> bool:
+        if self._count is None:
+            self._count = self.store.count_parcels()
+        return self._count > 0
+
+    def import_geojson(self, path: Path, batch_size: int = 2000) -> int:
+        imported = 0
+        batch: list[dict[str, Any]] = []
+        for feature in iter_features(path):
+            row = self._row(feature)
+            if row is None:
+                continue
+            batch.append(row)
+            if len(batch) >= batch_size:
+                imported += self._flush(batch)
+        imported += self._flush(batch)
+        self._count = None
+        return imported
+
+    def parcel_at(self, x: float, y: float) -> ParcelRecord | None:
+        for row in self.store.list_parcels_at(x, y):
+            if point_in_rings(x, y, json.loads(row["rings_json"])):
+                return self._record(row)
+        return None
+
+    def get(self, parcel_id: str) -> ParcelRecord | None:
+        row = self.store.get_parcel(parcel_id)
+        return self._record(row) if row else None
+
+    def _flush(self, batch: list[dict[str, Any]]) -> int:
+        if not batch:
+            return 0
+        with self.store.transaction():
+            self.store.upsert_parcels(batch)
+        count = len(batch)
+        batch.clear()
+        return count
+
+    @staticmethod
+    def _row(feature: dict[str, Any]) -> dict[str, Any] | None:
+        rings = feature_rings(feature.get("geometry"))
+        record = parcel_from_attributes(feature.get("properties") or {})
+        if not rings or not record.parcel_id:
+            return None
+        xs = [point[0] for ring in rings for point in ring]
+        ys = [point[1] for ring in rings for point in ring]
+        return {
+            "parcel_id": record.parcel_id,
+            "property_address": record.property_address,
+            "zoning_code": record.zoning_code,
+            "lot_size_sf": record.lot_size_sf,
+            "year_built": record.year_built,
+            "building_sqft": record.building_sqft,
+            "land_value": record.land_value,
+            "building_value": record.building_value,
+            "rings_json": json.dumps([[[x, y] for x, y, *_ in ring] for ring in rings], separators=(",", ":")),
+            "min_x": min(xs),
+            "max_x": max(xs),
+            "min_y": min(ys),
+            "max_y": max(ys),
+        }
+
+    @staticmethod
+    def _record(row: Any) -> ParcelRecord:
+        return ParcelRecord(
+            parcel_id=row["parcel_id"],
+            property_address=row["property_address"],
+            zoning_code=row["zoning_code"],
+            lot_size_sf=row["lot_size_sf"],
+            year_built=row["year_built"],
+            building_sqft=row["building_sqft"],
+            land_value=row["land_value"],
+            building_value=row["building_value"],
+        )
@@ -0,0 +1,224 @@
+"""Clark County GIS geocoding and parcel lookup."""
+
+from __future__ import annotations
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Iterable
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from partner_os.models import GeocodeResult, ParcelRecord
+
+if TYPE_CHECKING:
+    from partner_os.services.address import GeocodeCache
+    from partner_os.services.parcel_db import ParcelIndex
+
+GEOCODE_URL = (
+    "https://gis.clark.wa.gov/arcgisfedpw/rest/services/Geocoders/SitusStreetsParks/GeocodeServer/findAddressCandidates"
+)
+PARCEL_URL = "https://gis.clark.wa.gov/arcgisfed/rest/services/ClarkView_Public/TaxlotsPublic/MapServer/0/query"
+PARCEL_FIELDS = ("Prop_id", "SitusAddrsFull", "GISSqft", "BldgYrBlt", "Zone1", "AssrSqFt", "MktLandVal", "MktBldgVal")
+
+
+def robust_session(pool_size: int = 8) -> requests.Session:
+    """Session with retry/backoff on 429/5xx and a connection pool sized for concurrent use."""
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        respect_retry_after_header=True,
+        allowed_methods=frozenset({"GET", "POST"}),
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+
+def parcel_from_attributes(attrs: dict[str, Any], fallback_address: str = "") -> ParcelRecord:
+    parcel_id = attrs.get("Prop_id")
+    return ParcelRecord(
+        parcel_id="" if parcel_id is None else str(parcel_id),
+        property_address=attrs.get("SitusAddrsFull") or fallback_address,
+        zoning_code=attrs.get("Zone1"),
+        lot_size_sf=attrs.get("GISSqft"),
+        year_built=attrs.get("BldgYrBlt") or None,
+        building_sqft=attrs.get("AssrSqFt"),
+        land_value=float(attrs.get("MktLandVal") or 0),
+        building_value=float(attrs.get("MktBldgVal") or 0),
+    )
+
+
+
+def point_in_rings(x: float, y: float, rings: list[list[list[float]]]) -> bool:
+    """Even-odd ray cast over every ring, so holes in Esri polygons are excluded."""
+    inside = False
+    for ring in rings:
+        for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]):
+            if (y1 > y) != (y2 > y) and x < (x2 - x1) * (y - y1) / (y2 - y1) + x1:
+                inside = not inside
+    return inside
+
+
+
+@dataclass(slots=True)
+class ParcelClient:
+    """Batch geocoding and parcel queries over one pooled, retrying session.
+
+    Geocoding fans out over `max_concurrency` workers (the county locator has no
+    public batch endpoint); parcel lookups go out `batch_size` at a time as one
+    multipoint intersect or one `Prop_id IN (...)` query per batch. With a
+    `local` ParcelIndex, parcels are resolved offline first and only misses
+    reach the live service; with a `cache`, `lookup_many` skips geocoding for
+    any address already resolved under its normalized form.
+    """
+
+    geocode_url: str = GEOCODE_URL
+    parcel_url: str = PARCEL_URL
+    timeout_seconds: int = 10
+    max_concurrency: int = 4
+    batch_size: int = 50
+    min_geocode_score: float = 80.0
+    out_wkid: int | None = 4326
+    session: requests.Session | None = None
+    local: ParcelIndex | None = None
+    cache: GeocodeCache | None = None
+    _session: requests.Session = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._session = self.session or robust_session(pool_size=max(self.max_concurrency, 1))
+
+    def geocode(self, address: str) -> GeocodeResult | None:
+        params: dict[str, Any] = {"SingleLine": address, "outFields": "*", "maxLocations": 1, "f": "pjson"}
+        if self.out_wkid:
+            params["outSR"] = self.out_wkid
+        response = self._session.get(self.geocode_url, params=params, timeout=self.timeout_seconds)
+        response.raise_for_status()
+        data = response.json()
+        candidates = data.get("candidates") or []
+        if not candidates or float(candidates[0].get("score", 100)) < self.min_geocode_score:
+            return None
+        best = candidates[0]
+        return GeocodeResult(
+            address=address,
+            x=float(best["location"]["x"]),
+            y=float(best["location"]["y"]),
+            score=float(best.get("score", 100)),
+            matched_address=best.get("address") or address,
+            wkid=(data.get("spatialReference") or {}).get("wkid"),
+        )
+
+    def geocode_many(self, addresses: Iterable[str]) -> dict[str, GeocodeResult | None]:
+        unique = list(dict.fromkeys(addresses))
+        if not unique:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(unique)), thread_name_prefix="geocode") as pool:
+            return dict(zip(unique, pool.map(self.geocode, unique)))
+
+    def parcels_at(self, points: list[GeocodeResult]) -> dict[str, ParcelRecord | None]:
+        """Parcel containing each geocoded point, keyed by the point's input address."""
+        found: dict[str, ParcelRecord | None] = {point.address: None for point in points}
+        if self.local is not None and self.local.available:
+            for point in points:
+                found[point.address] = self.local.parcel_at(point.x, point.y)
+            points = [point for point in points if found[point.address] is None]
+
+        for batch in _chunks(points, self.batch_size):
+            geometry: dict[str, Any] = {"points": [[point.x, point.y] for point in batch]}
+            params = {
+                "geometryType": "esriGeometryMultipoint",
+                "spatialRel": "esriSpatialRelIntersects",
+                "returnGeometry": "true",
+            }
+            if batch[0].wkid:
+                geometry["spatialReference"] = {"wkid": batch[0].wkid}
+                params["outSR"] = str(batch[0].wkid)
+            features = self._query({"geometry": json.dumps(geometry), **params})
+            for point in batch:
+                match = next(
+                    (
+                        feature
+                        for feature in features
+                        if point_in_rings(point.x, point.y, (feature.get("geometry") or {}).get("rings") or [])
+                    ),
+                    features[0] if len(batch) == 1 and features else None,
+                )
+                if match is not None:
+                    found[point.address] = parcel_from_attributes(match["attributes"], point.matched_address)
+        return found
+
+    def parcels_by_ids(self, parcel_ids: Iterable[str]) -> dict[str, ParcelRecord]:
+        records: dict[str, ParcelRecord] = {}
+        pending = list(dict.fromkeys(parcel_ids))
+        if self.local is not None and self.local.available:
+            for pid in pending:
+                record = self.local.get(pid)
+                if record is not None:
+                    records[pid] = record
+            pending = [pid for pid in pending if pid not in records]
+
+        for batch in _chunks(pending, self.batch_size):
+            values = ",".join(pid if pid.isdigit() else "'" + pid.replace("'", "''") + "'" for pid in batch)
+            for feature in self._query({"where": f"Prop_id IN ({values})", "returnGeometry": "false"}):
+                record = parcel_from_attributes(feature["attributes"])
+                records[record.parcel_id] = record
+        return records
+
+    def lookup_many(self, addresses: Iterable[str]) -> dict[str, ParcelRecord | None]:
+        unique = list(dict.fromkeys(addresses))
+        geocoded: dict[str, GeocodeResult | None] = {}
+        cached_parcels: dict[str, str] = {}
+        pending: list[str] = []
+        for address in unique:
+            cached, geocode, parcel_id = self.cache.get(address) if self.cache else (False, None, None)
+            if not cached:
+                pending.append(address)
+                continue
+            geocoded[address] = geocode
+            if parcel_id:
+                cached_parcels[address] = parcel_id
+
+        for address, geocode in self.geocode_many(pending).items():
+            geocoded[address] = geocode
+            if self.cache:
+                self.cache.put(address, geocode)
+
+        results: dict[str, ParcelRecord | None] = dict.fromkeys(unique)
+        if cached_parcels:
+            by_id = self.parcels_by_ids(cached_parcels.values())
+            for address, parcel_id in cached_parcels.items():
+                results[address] = by_id.get(parcel_id)
+
+        unresolved = [geocoded[address] for address in unique if geocoded.get(address) and results[address] is None]
+        for address, record in self.parcels_at(unresolved).items():
+            results[address] = record
+            if record and self.cache:
+                self.cache.set_parcel(address, record.parcel_id)
+        return results
+
+    def lookup(self, address: str) -> ParcelRecord | None:
+        return self.lookup_many([address]).get(address)
+
+    def _query(self, params: dict[str, str]) -> list[dict[str, Any]]:
+        response = self._session.post(
+            self.parcel_url,
+            data={"outFields": ",".join(PARCEL_FIELDS), "f": "pjson", **params},
+            timeout=self.timeout_seconds,
+        )
+        response.raise_for_status()
+        data = response.json()
+        if "error" in data:
+            raise requests.HTTPError(f"Parcel query failed: {data['error'].get('message', data['error'])}")
+        return data.get("features") or []
+
+
+
+def _chunks(items: list, size: int) -> Iterable[list]:
+    for start in range(0, len(items), max(size, 1)):
+        yield items[start : start + size]
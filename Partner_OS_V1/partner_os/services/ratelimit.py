@@ -0,0 +1,48 @@
+"""Thread-safe request pacing for provider rate limits."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """Space requests evenly so at most `requests_per_minute` start per minute."""
+
+    def __init__(self, requests_per_minute: int):
+        self.requests_per_minute = max(0, requests_per_minute)
+        self._interval = 60.0 / self.requests_per_minute if self.requests_per_minute else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until the next request slot opens; return seconds waited."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Event-loop friendly variant of acquire()."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def charge(self) -> None:
+        """Count a request against the budget without waiting for its slot.
+
+        Used for hedge requests, which are only useful if sent right away; the
+        slot they take delays the next paced request instead.
+        """
+        self._reserve()
+
+    def _reserve(self) -> float:
+        if not self._interval:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        return slot - now
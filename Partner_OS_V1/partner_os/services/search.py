@@ -2,68 +2,197 @@
 
 from __future__ import annotations
 
-import re
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
-from html import unescape
-from urllib.parse import urlparse
+from html.parser import HTMLParser
+from urllib.parse import parse_qs, urlencode, urlparse
 
+import httpx
 import requests
 
-from partner_os.constants import HIGH_CONFIDENCE_DOMAINS, MEDIUM_CONFIDENCE_DOMAINS
 from partner_os.models import ScoutClaim
+from partner_os.services.reputation import DomainReputationIndex, default_index
+
+
+SEARCH_ENDPOINT = "https://duckduckgo.com/html/"
+PARSE_CHUNK_CHARS = 8192
 
 
 @dataclass(slots=True)
 class WebSearchClient:
     timeout_seconds: int = 15
+    endpoint: str = SEARCH_ENDPOINT
 
     def search(self, query: str, limit: int = 6) -> list[ScoutClaim]:
         """Fetch web results using DuckDuckGo HTML endpoint."""
         response = requests.get(
-            "https://duckduckgo.com/html/",
+            self.endpoint,
             params={"q": query},
             timeout=self.timeout_seconds,
         )
         response.raise_for_status()
-        html = response.text
+        return parse_results(response.text, limit)
 
-        claims: list[ScoutClaim] = []
-        pattern = re.compile(
-            r'<a rel="nofollow" class="result__a" href="(?P<url>.*?)">(?P<title>.*?)</a>.*?'
-            r'<a class="result__snippet".*?>(?P<snippet>.*?)</a>',
-            re.DOTALL,
-        )
 
-        for match in pattern.finditer(html):
-            url = unescape(match.group("url"))
-            title = re.sub(r"<.*?>", "", unescape(match.group("title"))).strip()
-            snippet = re.sub(r"<.*?>", "", unescape(match.group("snippet"))).strip()
-            label, score = classify_confidence(url)
-            claims.append(
-                ScoutClaim(
-                    title=title,
-                    url=url,
-                    summary=snippet,
-                    timestamp_utc=datetime.now(timezone.utc).isoformat(),
-                    confidence_label=label,
-                    confidence_score=score,
-                )
+@dataclass(slots=True)
+class AsyncWebSearchClient:
+    """Asyncio variant of WebSearchClient."""
+
+    timeout_seconds: int = 15
+    endpoint: str = SEARCH_ENDPOINT
+    http: httpx.AsyncClient | None = None
+
+    async def search(self, query: str, limit: int = 6) -> list[ScoutClaim]:
+        if self.http is None:
+            async with httpx.AsyncClient() as http:
+                response = await http.get(self.endpoint, params={"q": query}, timeout=self.timeout_seconds)
+        else:
+            response = await self.http.get(self.endpoint, params={"q": query}, timeout=self.timeout_seconds)
+        response.raise_for_status()
+        return parse_results(response.text, limit)
+
+
+
+class ResultParser(HTMLParser):
+    """Incremental DuckDuckGo HTML result parser.
+
+    Collects `(url, title, snippet)` from `result__a` / `result__snippet`
+    elements keyed on class tokens rather than exact markup, and sets `done`
+    once `limit` results are complete so callers can stop feeding.
+    """
+
+    def __init__(self, limit: int):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.results: list[tuple[str, str, str]] = []
+        self._url = ""
+        self._title: list[str] | None = None
+        self._snippet: list[str] | None = None
+        self._capture_tag = ""
+        self._capture_depth = 0
+
+    @property
+    def done(self) -> bool:
+        return len(self.results) >= self.limit
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if self._capture_tag:
+            if tag == self._capture_tag:
+                self._capture_depth += 1
+            return
+        classes = set((dict(attrs).get("class") or "").split())
+        if "result__a" in classes:
+            self._flush()
+            self._url = resolve_redirect(dict(attrs).get("href") or "")
+            self._title = []
+            self._begin(tag)
+        elif "result__snippet" in classes and self._title is not None:
+            self._snippet = []
+            self._begin(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag != self._capture_tag:
+            return
+        self._capture_depth -= 1
+        if self._capture_depth == 0:
+            self._capture_tag = ""
+            if self._snippet is not None:
+                self._flush()
+
+    def handle_data(self, data: str) -> None:
+        if not self._capture_tag:
+            return
+        target = self._snippet if self._snippet is not None else self._title
+        if target is not None:
+            target.append(data)
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+
+    def _begin(self, tag: str) -> None:
+        self._capture_tag = tag
+        self._capture_depth = 1
+
+    def _flush(self) -> None:
+        if self._title is not None and self._url and not self.done:
+            self.results.append(
+                (self._url, " ".join("".join(self._title).split()), " ".join("".join(self._snippet or []).split()))
             )
-            if len(claims) >= limit:
-                break
+        self._url, self._title, self._snippet = "", None, None
+
+
+
+def parse_results(html: str, limit: int) -> list[ScoutClaim]:
+    parser = ResultParser(limit)
+    first = html.find("result__a")
+    start = max(html.rfind("<", 0, first), 0) if first >= 0 else len(html)
+    for offset in range(start, len(html), PARSE_CHUNK_CHARS):
+        parser.feed(html[offset : offset + PARSE_CHUNK_CHARS])
+        if parser.done:
+            break
+    else:
+        parser.close()
+
+    timestamp = datetime.now(timezone.utc).isoformat()
+    claims = [
+        ScoutClaim(
+            title=title,
+            url=url,
+            summary=snippet,
+            timestamp_utc=timestamp,
+            confidence_label="",
+            confidence_score=0,
+        )
+        for url, title, snippet in parser.results
+    ]
+    return score_claims(claims)
+
+
 
-        return claims
+def resolve_redirect(url: str) -> str:
+    """Unwrap DuckDuckGo `/l/?uddg=` redirect links to the target URL."""
+    parsed = urlparse(url if "//" in url else f"//{url}")
+    if parsed.netloc.endswith("duckduckgo.com") and parsed.path.startswith("/l/"):
+        target = parse_qs(parsed.query).get("uddg", [""])[0]
+        if target:
+            return target
+    if url.startswith("//"):
+        return f"https:{url}"
+    return url
 
 
 
 def classify_confidence(url: str) -> tuple[str, int]:
-    domain = urlparse(url).netloc.lower()
-    if domain.startswith("www."):
-        domain = domain[4:]
-
-    if any(domain.endswith(item) for item in HIGH_CONFIDENCE_DOMAINS):
-        return ("High", 90)
-    if any(domain.endswith(item) for item in MEDIUM_CONFIDENCE_DOMAINS):
-        return ("Medium", 70)
-    return ("Low", 40)
+    return default_index().lookup(url)
+
+
+
+def score_claims(claims: list[ScoutClaim], index: DomainReputationIndex | None = None) -> list[ScoutClaim]:
+    """Assign confidence labels to a whole claim set in one pass."""
+    scores = (index or default_index()).lookup_many([claim.url for claim in claims])
+    return [
+        replace(claim, confidence_label=label, confidence_score=score)
+        for claim, (label, score) in zip(claims, scores)
+    ]
+
+
+
+def canonical_url(url: str) -> str:
+    """Collapse scheme, `www.`, fragments, tracking params and DuckDuckGo redirects for dedup."""
+    resolved = resolve_redirect(url)
+    parsed = urlparse(resolved if "//" in resolved else f"//{resolved}")
+    host = parsed.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, values in parse_qs(parsed.query).items()
+            if not key.lower().startswith("utm_") and key.lower() not in {"fbclid", "gclid"}
+            for value in values
+        )
+    )
+    path = parsed.path.rstrip("/") or "/"
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
@@ -0,0 +1,129 @@
+"""Persistent search-result cache with TTL and stale-while-revalidate."""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Callable
+
+from partner_os.db.store import DataStore
+from partner_os.models import ScoutClaim
+from partner_os.services.search import WebSearchClient
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(re.sub(r"[^\w%.]+", " ", query.lower()).split())
+
+
+
+@dataclass(slots=True)
+class CachedSearchClient:
+    """Serve cached claims while fresh; past the TTL, serve them and refresh in the background.
+
+    Entries older than `stale_seconds` (or missing) are fetched synchronously.
+    Cached claims carry `cache_age_seconds` so reports can show how old they are.
+    Failed background refreshes are recorded in `api_calls`.
+    """
+
+    inner: WebSearchClient
+    store: DataStore
+    ttl_seconds: int = 3600
+    stale_seconds: int = 86400
+    _refreshing: dict[str, threading.Thread] = field(default_factory=dict, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def search(self, query: str, limit: int = 6) -> list[ScoutClaim]:
+        cache_key = f"{limit}:{normalize_query(query)}"
+        cached = self._cached(cache_key, query, limit)
+        return self._fetch(cache_key, query, limit) if cached is None else cached
+
+    def search_many(
+        self,
+        queries: list[str],
+        limit: int,
+        fetch_many: Callable[[list[str], int], list[list[ScoutClaim] | BaseException]],
+    ) -> list[list[ScoutClaim] | BaseException]:
+        """Answer cache hits directly and fetch every miss in one `fetch_many` batch.
+
+        Outcomes line up with `queries`; a failed fetch is returned as its exception.
+        """
+        keys = [f"{limit}:{normalize_query(query)}" for query in queries]
+        outcomes: list[list[ScoutClaim] | BaseException | None] = [
+            self._cached(key, query, limit) for key, query in zip(keys, queries)
+        ]
+        missing = [index for index, outcome in enumerate(outcomes) if outcome is None]
+        if missing:
+            fetched = fetch_many([queries[index] for index in missing], limit)
+            for index, result in zip(missing, fetched):
+                outcomes[index] = result
+                if not isinstance(result, BaseException):
+                    self._store(keys[index], queries[index], result)
+        return outcomes  # type: ignore[return-value]
+
+    def wait_for_refreshes(self, timeout: float | None = None) -> None:
+        with self._lock:
+            threads = list(self._refreshing.values())
+        for thread in threads:
+            thread.join(timeout)
+
+    def _cached(self, cache_key: str, query: str, limit: int) -> list[ScoutClaim] | None:
+        """Claims to serve for `cache_key`, or None when the entry is missing or too stale."""
+        row = self.store.get_search_cache(cache_key)
+        if row is None:
+            return None
+
+        age = int((datetime.now(timezone.utc) - datetime.fromisoformat(row["fetched_at"])).total_seconds())
+        if age > self.stale_seconds:
+            return None
+        if age > self.ttl_seconds:
+            self._refresh_in_background(cache_key, query, limit)
+
+        return [replace(ScoutClaim(**item), cache_age_seconds=age) for item in json.loads(row["claims_json"])]
+
+    def _fetch(self, cache_key: str, query: str, limit: int) -> list[ScoutClaim]:
+        claims = self.inner.search(query=query, limit=limit)
+        self._store(cache_key, query, claims)
+        return claims
+
+    def _store(self, cache_key: str, query: str, claims: list[ScoutClaim]) -> None:
+        self.store.upsert_search_cache(
+            cache_key=cache_key,
+            query=query,
+            claims=[asdict(claim) for claim in claims],
+            fetched_at=datetime.now(timezone.utc).isoformat(),
+        )
+
+    def _refresh_in_background(self, cache_key: str, query: str, limit: int) -> None:
+        with self._lock:
+            if cache_key in self._refreshing:
+                return
+
+            def run() -> None:
+                started = time.perf_counter()
+                try:
+                    self._fetch(cache_key, query, limit)
+                except Exception as exc:  # noqa: BLE001
+                    # Keep serving the stale entry; the next search retries.
+                    self.store.insert_api_call(
+                        provider="web_search",
+                        model="html",
+                        endpoint=self.inner.endpoint,
+                        request_type="search_refresh",
+                        status="failed",
+                        latency_ms=int((time.perf_counter() - started) * 1000),
+                        deal_id=None,
+                        error_message=f"{type(exc).__name__}: {exc}",
+                        details={"query": query, "cache_key": cache_key},
+                    )
+                finally:
+                    with self._lock:
+                        self._refreshing.pop(cache_key, None)
+
+            thread = threading.Thread(target=run, name=f"search-refresh-{cache_key[:24]}", daemon=True)
+            self._refreshing[cache_key] = thread
+            thread.start()
+
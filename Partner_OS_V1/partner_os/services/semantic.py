@@ -0,0 +1,338 @@
+"""Offline semantic index: hashed TF-IDF vectors in memory-mapped files, searched with cosine top-k."""
+
+from __future__ import annotations
+
+import heapq
+import math
+import mmap
+import os
+import re
+import sys
+import threading
+import zlib
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from operator import mul
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from partner_os.db.store import DataStore
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, so only one process may write the index.
+    fcntl = None
+
+DIM = 256
+ROW_BYTES = DIM * 4
+BLOCK_ROWS = 8192
+QUERY_DIMS = 24
+QUANT_SCALE = 254.0
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have how i in is it its me my of on or our so that the "
+    "this to was we what when where which who why will with you your".split()
+)
+_WORD = re.compile(r"[^\W_]+")
+_NEGATE = bytes(255 - value for value in range(256))
+
+
+def content_terms(text: str) -> list[str]:
+    """Lower-cased words of two or more characters, stopwords removed, in order."""
+    return [term for term in _WORD.findall(text.lower()) if len(term) > 1 and term not in STOPWORDS]
+
+
+
+def embed(text: str) -> array | None:
+    """L2-normalised float32 vector of `DIM` signed hash buckets, or None for text without content words.
+
+    Features are the words plus their character trigrams, so inflections
+    and typos ("refinance"/"refinancing") still land close; an exact word
+    match scores its word feature on top. Counts are damped with
+    1 + log(tf), and the bucket and sign come from crc32.
+    """
+    features: Counter[str] = Counter()
+    for term in content_terms(text):
+        features["w " + term] += 1
+        padded = f"<{term}>"
+        for idx in range(len(padded) - 2):
+            features["t " + padded[idx : idx + 3]] += 1
+    if not features:
+        return None
+    vector = [0.0] * DIM
+    for feature, count in features.items():
+        digest = zlib.crc32(feature.encode("utf-8"))
+        weight = 1.0 + math.log(count)
+        vector[digest % DIM] += -weight if digest & 0x80000000 else weight
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return array("f", [value / norm for value in vector])
+
+
+
+@dataclass(slots=True)
+class SemanticHit:
+    kind: str
+    source_path: str
+    ordinal: int
+    deal_id: str | None
+    score: float
+
+
+@dataclass(slots=True)
+class SemanticIndex:
+    """Vectors for library abstracts and document passages, kept beside the database.
+
+    `path` holds float32 rows of `DIM` in native byte order, appended as
+    documents are indexed (`numpy.memmap(path, "float32").reshape(-1, DIM)`
+    reads it as is). A second file (`.i8`) keeps an int8 copy laid out
+    column-major in blocks of `BLOCK_ROWS`, so a query reads only the
+    columns it uses as contiguous runs. Each column is scored for a whole
+    block at once by packing it into 32-bit lanes of one Python integer.
+    The best candidates are then re-ranked exactly against the float32 rows.
+    IDF is applied on the query side, from per-bucket document frequencies,
+    so appending never rewrites stored rows.
+
+    Row metadata lives in `vector_rows`. Replaced or removed documents leave
+    inactive rows in the files, and rows written by a rolled-back transaction
+    have no metadata; both are skipped at query time.
+    """
+
+    store: DataStore
+    path: Path
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    _maps: dict[Path, mmap.mmap] = field(default_factory=dict, init=False)
+    _idf: list[float] | None = field(default=None, init=False)
+
+    def __post_init__(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._locked() as fd:
+            size = os.fstat(fd).st_size
+            if size % ROW_BYTES:
+                # A crash mid-append leaves a partial row; drop it so rows stay aligned.
+                os.ftruncate(fd, size - size % ROW_BYTES)
+            self._reconcile_scan(os.fstat(fd).st_size // ROW_BYTES)
+
+    @property
+    def scan_path(self) -> Path:
+        return self.path.with_suffix(".i8")
+
+    @property
+    def rows(self) -> int:
+        return self.path.stat().st_size // ROW_BYTES
+
+    def add(self, kind: str, source_path: Path, texts: list[str], deal_id: str | None) -> int:
+        """Replace the `kind` rows for `source_path` with one vector per text; returns the rows written."""
+        self.remove([str(source_path)], kind=kind)
+        embedded = [(ordinal, embed(text)) for ordinal, text in enumerate(texts)]
+        vectors = [(ordinal, vector) for ordinal, vector in embedded if vector is not None]
+        if not vectors:
+            return 0
+        first = self._append([vector for _, vector in vectors])
+        self.store.insert_vector_rows(
+            [(first + idx, kind, str(source_path), ordinal, deal_id) for idx, (ordinal, _) in enumerate(vectors)]
+        )
+        self.store.add_vector_df(_bucket_counts(vector for _, vector in vectors))
+        self._idf = None
+        return len(vectors)
+
+    def remove(self, source_paths: list[str], kind: str | None = None) -> None:
+        row_ids = self.store.deactivate_vector_rows(source_paths, kind=kind)
+        if not row_ids:
+            return
+        counts = _bucket_counts(self._row(row_id) for row_id in row_ids)
+        self.store.add_vector_df({bucket: -count for bucket, count in counts.items()})
+        self._idf = None
+
+    def move(self, old_path: str, new_path: Path) -> None:
+        self.store.move_vector_rows(old_path, new_path)
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        deal_id: str | None = None,
+        include_library: bool = True,
+        kinds: tuple[str, ...] | None = None,
+    ) -> list[SemanticHit]:
+        """Top-`k` active rows by cosine similarity to `query`, best first.
+
+        Scope matches `ChunkIndex.retrieve`: the deal's rows plus, with
+        `include_library`, rows without a deal.
+        """
+        vector = embed(query)
+        rows = self.rows
+        if vector is None or rows == 0 or k <= 0:
+            return []
+        idf = self._query_idf()
+        weighted = [value * weight for value, weight in zip(vector, idf)]
+        norm = math.sqrt(sum(value * value for value in weighted)) or 1.0
+        query_vector = [value / norm for value in weighted]
+
+        approx = self._scan(query_vector, rows)
+        pool = max(k * 10, 100)
+        while True:
+            candidates = heapq.nlargest(min(pool, rows), range(rows), key=approx.__getitem__)
+            meta = self.store.get_vector_rows(candidates, deal_id, include_library=include_library, kinds=kinds)
+            if len(meta) >= k or pool >= rows:
+                break
+            pool *= 4
+
+        hits = [
+            SemanticHit(
+                kind=row["kind"],
+                source_path=row["source_path"],
+                ordinal=row["ordinal"],
+                deal_id=row["deal_id"],
+                score=sum(map(mul, query_vector, self._row(row["row_id"]))),
+            )
+            for row in meta
+        ]
+        return heapq.nlargest(k, hits, key=lambda hit: hit.score)
+
+    def search_library(self, query: str, k: int = 5) -> list[dict[str, object]]:
+        """Library entries ranked by their best-matching abstract or passage; the semantic `search_library`."""
+        hits = self.search(query, k=k * 4, deal_id=None)
+        best: dict[str, float] = {}
+        for hit in hits:
+            best[hit.source_path] = max(best.get(hit.source_path, -1.0), hit.score)
+        entries = {row["file_path"]: row for row in self.store.get_library_entries(list(best))}
+        ranked = sorted((path for path in best if path in entries), key=best.__getitem__, reverse=True)[:k]
+        return [{**dict(entries[path]), "score": round(best[path], 4)} for path in ranked]
+
+    def close(self) -> None:
+        with self._lock:
+            for view in self._maps.values():
+                view.close()
+            self._maps.clear()
+
+    @contextmanager
+    def _locked(self) -> Iterator[int]:
+        """Descriptor of the float file, held under an exclusive lock shared with other processes.
+
+        The CLI watcher and the Streamlit app append to the same files; the
+        flock serializes them, `_lock` the threads of this process.
+        """
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                yield fd
+            finally:
+                os.close(fd)  # closing releases the flock
+
+    def _append(self, vectors: list[array]) -> int:
+        """Append `vectors` and return the first new row id.
+
+        The int8 copy is written first and the float rows last, so a row
+        counts (`rows` is the float file size) only once both are on disk.
+        """
+        with self._locked() as fd:
+            first = os.fstat(fd).st_size // ROW_BYTES
+            self._write_scan(first, vectors)
+            os.pwrite(fd, b"".join(vector.tobytes() for vector in vectors), first * ROW_BYTES)
+        return first
+
+    def _write_scan(self, first: int, vectors: list[array]) -> None:
+        # Offset binary: stored byte = round(x * QUANT_SCALE) + 128, saturating at |x| = 0.5.
+        quantized = [
+            bytes(min(255, max(0, round(value * QUANT_SCALE) + 128)) for value in vector) for vector in vectors
+        ]
+        block_bytes = DIM * BLOCK_ROWS
+        fd = os.open(self.scan_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            row = first
+            while quantized:
+                block, offset = divmod(row, BLOCK_ROWS)
+                run, quantized = quantized[: BLOCK_ROWS - offset], quantized[BLOCK_ROWS - offset :]
+                if os.fstat(fd).st_size < (block + 1) * block_bytes:
+                    os.ftruncate(fd, (block + 1) * block_bytes)
+                base = block * block_bytes + offset
+                for column in range(DIM):
+                    os.pwrite(fd, bytes(values[column] for values in run), base + column * BLOCK_ROWS)
+                row += len(run)
+        finally:
+            os.close(fd)
+
+    def _reconcile_scan(self, rows: int) -> None:
+        """Make the int8 copy cover exactly the float rows' blocks; called under `_locked`.
+
+        Blocks past the last row are cut off. Missing blocks, and the last
+        (possibly partly written) block, are re-quantized from the float rows.
+        """
+        block_bytes = DIM * BLOCK_ROWS
+        blocks = -(-rows // BLOCK_ROWS)
+        self.scan_path.touch(exist_ok=True)
+        size = self.scan_path.stat().st_size
+        if size > blocks * block_bytes:
+            os.truncate(self.scan_path, blocks * block_bytes)
+        start = min(size // block_bytes, max(blocks - 1, 0)) * BLOCK_ROWS
+        with self.path.open("rb") as handle:
+            handle.seek(start * ROW_BYTES)
+            for first in range(start, rows, BLOCK_ROWS):
+                vectors = []
+                for _ in range(min(BLOCK_ROWS, rows - first)):
+                    vector = array("f")
+                    vector.frombytes(handle.read(ROW_BYTES))
+                    vectors.append(vector)
+                self._write_scan(first, vectors)
+
+    def _scan(self, query_vector: list[float], rows: int) -> array:
+        """Approximate dot products for every row from the int8 copy, over the query's largest dimensions."""
+        dims = sorted(range(DIM), key=lambda dim: abs(query_vector[dim]), reverse=True)[:QUERY_DIMS]
+        dims = [dim for dim in dims if query_vector[dim]]
+        top = abs(query_vector[dims[0]]) if dims else 1.0
+        weights = [max(1, round(255 * abs(query_vector[dim]) / top)) for dim in dims]
+        view = self._map(self.scan_path)
+
+        scores = array("I")
+        for start in range(0, rows, BLOCK_ROWS):
+            count = min(BLOCK_ROWS, rows - start)
+            base = start * DIM
+            lanes = bytearray(4 * count)
+            total = 0
+            for dim, weight in zip(dims, weights):
+                column = view[base + dim * BLOCK_ROWS : base + dim * BLOCK_ROWS + count]
+                # A negative query weight scores the flipped column; the offset is the same for every row.
+                lanes[0::4] = column.translate(_NEGATE) if query_vector[dim] < 0 else column
+                total += weight * int.from_bytes(lanes, "little")
+            block = array("I")
+            block.frombytes(total.to_bytes(4 * count, "little"))
+            if sys.byteorder == "big":
+                block.byteswap()
+            scores.extend(block)
+        return scores
+
+    def _row(self, row_id: int) -> array:
+        vector = array("f")
+        offset = row_id * ROW_BYTES
+        vector.frombytes(self._map(self.path)[offset : offset + ROW_BYTES])
+        return vector
+
+    def _map(self, path: Path) -> mmap.mmap:
+        """Read-only map of `path`, re-mapped when the file has grown since it was mapped."""
+        with self._lock:
+            size = path.stat().st_size
+            view = self._maps.get(path)
+            if view is None or len(view) != size:
+                if view is not None:
+                    view.close()
+                with path.open("rb") as handle:
+                    view = self._maps[path] = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            return view
+
+    def _query_idf(self) -> list[float]:
+        if self._idf is None:
+            total = self.store.count_vector_rows()
+            df = self.store.get_vector_df()
+            self._idf = [math.log((1 + total) / (1 + max(0, df.get(dim, 0)))) + 1.0 for dim in range(DIM)]
+        return self._idf
+
+
+
+def _bucket_counts(vectors: Iterable[array]) -> dict[int, int]:
+    counts: Counter[int] = Counter()
+    for vector in vectors:
+        counts.update(dim for dim, value in enumerate(vector) if value)
+    return dict(counts)
@@ -0,0 +1,150 @@
+"""Numeric market-signal extraction and history statistics for Scout."""
+
+from __future__ import annotations
+
+import re
+import statistics
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+
+from partner_os.db.store import DataStore
+from partner_os.models import MarketSignal, ScoutClaim
+from partner_os.services.address import normalize_address
+from partner_os.services.ids import slugify
+
+NATIONAL_GEOGRAPHY = "us"
+
+SIGNAL_PATTERNS: dict[str, tuple[re.Pattern[str], float, float]] = {
+    "cap_rate": (
+        re.compile(r"cap(?:italization)?\s+rates?\D{0,40}?(\d{1,2}(?:\.\d+)?)\s*%", re.IGNORECASE),
+        1.0,
+        20.0,
+    ),
+    "sofr": (re.compile(r"\bSOFR\b\D{0,30}?(\d{1,2}(?:\.\d+)?)\s*%", re.IGNORECASE), 0.0, 15.0),
+    "treasury_10y": (
+        re.compile(r"10[- ]year(?:\s+treasury)?\D{0,40}?(\d{1,2}(?:\.\d+)?)\s*%", re.IGNORECASE),
+        0.0,
+        15.0,
+    ),
+    "rent_monthly": (
+        re.compile(r"\$\s?(\d{1,2},?\d{3})\s*(?:/|per\s+)(?:mo|month)\b", re.IGNORECASE),
+        200.0,
+        20000.0,
+    ),
+}
+
+NATIONAL_METRICS = {"sofr", "treasury_10y"}
+
+METRIC_LABELS = {
+    "cap_rate": ("cap rate", "%"),
+    "sofr": ("SOFR", "%"),
+    "treasury_10y": ("10-year treasury", "%"),
+    "rent_monthly": ("monthly rent", "$"),
+}
+
+
+def geography_for_address(address: str) -> str:
+    """`123 Main St, Vancouver, WA 98660` -> `vancouver-wa`."""
+    parts = [part.strip() for part in normalize_address(address).split(",")]
+    if len(parts) >= 3:
+        state = parts[2].split()[0] if parts[2].split() else ""
+        return slugify(f"{parts[1]} {state}")
+    return slugify(parts[-1]) if parts else "unknown"
+
+
+
+def extract_signals(claims: list[ScoutClaim], geography: str) -> list[MarketSignal]:
+    signals: list[MarketSignal] = []
+    for claim in claims:
+        text = f"{claim.title}. {claim.summary}"
+        domain = (urlparse(claim.url).hostname or "").lower().removeprefix("www.")
+        for metric, (pattern, low, high) in SIGNAL_PATTERNS.items():
+            for raw in pattern.findall(text):
+                value = float(raw.replace(",", ""))
+                if not low <= value <= high:
+                    continue
+                signals.append(
+                    MarketSignal(
+                        geography=NATIONAL_GEOGRAPHY if metric in NATIONAL_METRICS else geography,
+                        metric=metric,
+                        value=value,
+                        source_url=claim.url,
+                        source_domain=domain,
+                        confidence_score=claim.confidence_score,
+                        observed_at=claim.timestamp_utc,
+                    )
+                )
+    return signals
+
+
+
+@dataclass(slots=True)
+class SignalStats:
+    count: int
+    median: float
+    mad: float
+    p25: float
+    p75: float
+
+
+
+def summarize_values(values: list[float]) -> SignalStats | None:
+    if not values:
+        return None
+    median = statistics.median(values)
+    mad = statistics.median(abs(value - median) for value in values)
+    if len(values) >= 2:
+        p25, _, p75 = statistics.quantiles(values, n=4, method="inclusive")
+    else:
+        p25 = p75 = median
+    return SignalStats(count=len(values), median=median, mad=mad, p25=p25, p75=p75)
+
+
+
+def history_stats(
+    store: DataStore,
+    geography: str,
+    metric: str,
+    window_days: int = 180,
+    min_confidence: int = 0,
+) -> SignalStats | None:
+    """Rolling median and dispersion across every deal's scans in the window."""
+    since = (datetime.now(timezone.utc) - timedelta(days=window_days)).isoformat()
+    return summarize_values(store.list_market_signal_values(geography, metric, since, min_confidence=min_confidence))
+
+
+
+def history_conflicts(
+    store: DataStore,
+    signals: list[MarketSignal],
+    window_days: int = 180,
+    min_history: int = 5,
+    mad_multiplier: float = 3.0,
+) -> list[str]:
+    """Flag metrics whose fresh median sits outside the market history band."""
+    notes: list[str] = []
+    grouped: dict[tuple[str, str], list[float]] = {}
+    for signal in signals:
+        grouped.setdefault((signal.geography, signal.metric), []).append(signal.value)
+
+    for (geography, metric), values in sorted(grouped.items()):
+        stats = history_stats(store, geography, metric, window_days=window_days)
+        if stats is None or stats.count < min_history:
+            continue
+        current = statistics.median(values)
+        label, unit = METRIC_LABELS[metric]
+        tolerance = max(mad_multiplier * stats.mad, 0.05 * abs(stats.median))
+        if abs(current - stats.median) > tolerance:
+            notes.append(
+                "Market Conflict: "
+                f"{label} {_fmt(current, unit)} in this scan vs {window_days}-day {geography} median "
+                f"{_fmt(stats.median, unit)} (IQR {_fmt(stats.p25, unit)}-{_fmt(stats.p75, unit)}, "
+                f"n={stats.count}). Manual review required."
+            )
+    return notes
+
+
+
+def _fmt(value: float, unit: str) -> str:
+    return f"${value:,.0f}" if unit == "$" else f"{value:.2f}%"
@@ -0,0 +1,226 @@
+"""Staging-inbox watcher: report uploads once they stop changing, grouped by deal hint."""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+SIDECAR_SUFFIX = ".deal"
+HINT_SEPARATOR = "__"
+PARTIAL_SUFFIXES = frozenset({".part", ".partial", ".crdownload", ".download", ".tmp", ".swp"})
+
+# inotify(7) event bits; the watcher only needs to know that something changed.
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+
+class _Inotify:
+    """Minimal inotify binding via libc; raises OSError where inotify is unavailable."""
+
+    def __init__(self) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify requires Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watched: set[Path] = set()
+
+    def watch(self, directory: Path) -> None:
+        if directory in self._watched:
+            return
+        if self._libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK) < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self._watched.add(directory)
+
+    def wait(self, timeout: float) -> bool:
+        """Block up to `timeout` seconds; True if any event arrived (events are drained, not parsed)."""
+        ready, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+        if not ready:
+            return False
+        try:
+            while os.read(self.fd, 64 * 1024):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+
+@dataclass(slots=True)
+class _Pending:
+    signature: tuple[int, int, int]
+    changed_at: float
+
+
+
+@dataclass(slots=True)
+class StagingWatcher:
+    """Watch `root` and one level of subfolders for files that have finished arriving.
+
+    A file is reported once its size and mtime have held for `settle_seconds`,
+    which debounces scanners and sync tools that write in pieces; partial
+    download names, dotfiles and `.deal` sidecars are never reported. inotify
+    wakes the watcher as soon as something changes; where it is unavailable
+    (or `use_inotify` is False) the directory is re-scanned every
+    `poll_seconds`. A reported file is reported again only if it changes.
+    """
+
+    root: Path
+    settle_seconds: float = 2.0
+    poll_seconds: float = 1.0
+    use_inotify: bool = True
+    _inotify: _Inotify | None = field(default=None, init=False)
+    _pending: dict[Path, _Pending] = field(default_factory=dict, init=False)
+    _reported: dict[Path, tuple[int, int, int]] = field(default_factory=dict, init=False)
+    _scanned: bool = field(default=False, init=False)
+
+    def __post_init__(self) -> None:
+        if self.use_inotify:
+            try:
+                self._inotify = _Inotify()
+                self._inotify.watch(self.root)
+            except OSError:
+                self._inotify = None
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._inotify is not None else "polling"
+
+    def poll(self, timeout: float | None = None) -> list[Path]:
+        """Wait up to `timeout` (default `poll_seconds`) and return newly settled files."""
+        timeout = self.poll_seconds if timeout is None else timeout
+        if self._pending:
+            now = time.monotonic()
+            next_due = min(item.changed_at for item in self._pending.values()) + self.settle_seconds
+            timeout = min(timeout, max(0.0, next_due - now))
+        if self._inotify is not None:
+            changed = self._inotify.wait(timeout)
+            if not changed and not self._pending and self._scanned:
+                return []
+        elif timeout > 0:
+            time.sleep(timeout)
+        self._scanned = True
+        return self._settled(self._scan())
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _scan(self) -> dict[Path, tuple[int, int, int]]:
+        """Signature per candidate: size, mtime and its sidecar's mtime, so adding a sidecar re-reports the file."""
+        found: dict[Path, tuple[int, int, int]] = {}
+        for directory in (self.root, *self._subdirectories()):
+            try:
+                entries = [entry for entry in os.scandir(directory) if entry.is_file(follow_symlinks=False)]
+                stats = {entry.name: entry.stat() for entry in entries}
+            except OSError:
+                continue
+            for name, stat in stats.items():
+                if not _is_candidate(name):
+                    continue
+                sidecar = stats.get(name + SIDECAR_SUFFIX)
+                found[Path(directory) / name] = (stat.st_size, stat.st_mtime_ns, sidecar.st_mtime_ns if sidecar else 0)
+        return found
+
+    def _subdirectories(self) -> list[Path]:
+        try:
+            subdirs = [Path(entry.path) for entry in os.scandir(self.root) if entry.is_dir(follow_symlinks=False)]
+        except OSError:
+            return []
+        subdirs = [path for path in subdirs if not path.name.startswith(".")]
+        if self._inotify is not None:
+            for path in subdirs:
+                try:
+                    self._inotify.watch(path)
+                except OSError:
+                    continue
+        return subdirs
+
+    def _settled(self, found: dict[Path, tuple[int, int, int]]) -> list[Path]:
+        now = time.monotonic()
+        for path in [path for path in self._pending if path not in found]:
+            del self._pending[path]
+        for path in [path for path in self._reported if path not in found]:
+            del self._reported[path]
+
+        ready: list[Path] = []
+        for path, signature in found.items():
+            if self._reported.get(path) == signature:
+                continue
+            pending = self._pending.get(path)
+            if pending is None or pending.signature != signature:
+                self._pending[path] = _Pending(signature, now)
+                continue
+            if now - pending.changed_at >= self.settle_seconds:
+                del self._pending[path]
+                self._reported[path] = signature
+                ready.append(path)
+        return sorted(ready)
+
+
+
+def _is_candidate(name: str) -> bool:
+    if name.startswith(".") or name.startswith("~$"):
+        return False
+    suffix = os.path.splitext(name)[1].lower()
+    return suffix not in PARTIAL_SUFFIXES and suffix != SIDECAR_SUFFIX
+
+
+
+def sidecar_path(path: Path) -> Path:
+    return path.with_name(path.name + SIDECAR_SUFFIX)
+
+
+
+def deal_hint(path: Path, root: Path) -> str | None:
+    """Deal hint for a staged file, most explicit first.
+
+    1. a `<file>.deal` sidecar holding a deal id, slug or address;
+    2. the subfolder of the inbox the file was dropped into;
+    3. a `<hint>__<name>` filename prefix.
+    """
+    sidecar = sidecar_path(path)
+    if sidecar.is_file():
+        try:
+            text = sidecar.read_text(encoding="utf-8").strip()
+        except (OSError, UnicodeDecodeError):
+            text = ""
+        if text:
+            return text.splitlines()[0].strip()
+    if path.parent != root and path.parent.parent == root:
+        return path.parent.name
+    prefix, separator, _ = path.name.partition(HINT_SEPARATOR)
+    if separator and prefix.strip():
+        return prefix.strip()
+    return None
+
+
+
+def original_name(path: Path) -> str:
+    """File name to keep in the Deal Jacket: a `<hint>__` prefix is routing metadata, not part of the name."""
+    prefix, separator, rest = path.name.partition(HINT_SEPARATOR)
+    return rest if separator and prefix.strip() and rest else path.name
+
+
+
+def group_by_hint(paths: list[Path], root: Path) -> dict[str | None, list[Path]]:
+    groups: dict[str | None, list[Path]] = {}
+    for path in paths:
+        groups.setdefault(deal_hint(path, root), []).append(path)
+    return groups
@@ -0,0 +1,337 @@
+"""Local stand-in for the Gemini and DuckDuckGo HTML endpoints.
+
+Serves `POST /v1beta/models/<model>:generateContent` and `GET /html/` with
+configurable latency, error rates and 429 bursts, optionally replaying
+recorded fixtures, so the full pipeline can be load-tested offline. Point a
+runtime at it with the `GEMINI_BASE_URL` and `SEARCH_ENDPOINT` values from
+`StandInServer.env()`.
+
+    python -m partner_os.standin --port 8765 --latency lognormal:180:0.6 --error-rate 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+UPSTREAM_GEMINI_BASE_URL = "https://generativelanguage.googleapis.com"
+UPSTREAM_SEARCH_ENDPOINT = "https://duckduckgo.com/html/"
+
+SYNTHETIC_RESULTS = (
+    ("https://www.clark.wa.gov/community-planning/zoning", "Clark County zoning overview",
+     "Multifamily cap rate near 5.6% in Clark County per county planning data."),
+    ("https://fred.stlouisfed.org/series/DGS10", "10-Year Treasury yield",
+     "The 10-year treasury yield closed at 4.2% this week."),
+    ("https://www.costar.com/article/vancouver-wa", "Vancouver WA multifamily",
+     "Vancouver cap rate averaged 6.1% for small multifamily deals."),
+    ("https://www.columbian.com/news/employers", "Major employers expand",
+     "New employers announce expansion near the I-5 corridor."),
+    ("https://randomblog.example/post", "Investor blog", "Rents up 3% year over year, SOFR at 5.3%."),
+)
+
+
+def content_key(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+
+@dataclass(slots=True)
+class LatencyDistribution:
+    """Parsed from `fixed:MS`, `uniform:LOW:HIGH` or `lognormal:MEDIAN:SIGMA`."""
+
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> LatencyDistribution:
+        kind, _, rest = spec.partition(":")
+        values = [float(item) for item in rest.split(":") if item]
+        if kind == "fixed" and len(values) == 1:
+            return cls("fixed", values[0])
+        if kind in {"uniform", "lognormal"} and len(values) == 2:
+            return cls(kind, values[0], values[1])
+        raise ValueError(f"Unsupported latency spec: {spec!r}")
+
+    def sample_ms(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        if self.kind == "lognormal":
+            return rng.lognormvariate(math.log(max(self.a, 1e-3)), self.b)
+        return self.a
+
+
+
+@dataclass(slots=True)
+class StandInProfile:
+    latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    error_rate: float = 0.0
+    burst_429_every: int = 0
+    burst_429_length: int = 0
+    fixtures_dir: Path | None = None
+    record: bool = False
+    seed: int | None = None
+
+
+
+class StandInServer:
+    """Threaded HTTP stand-in; use as a context manager or call start()/stop()."""
+
+    def __init__(self, profile: StandInProfile | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.profile = profile or StandInProfile()
+        self.stats: Counter[str] = Counter()
+        self._rng = random.Random(self.profile.seed)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._burst_remaining = 0
+        self._playback: dict[str, list[Path]] = {"gemini": [], "search": []}
+        self._cursor: Counter[str] = Counter()
+        if self.profile.fixtures_dir:
+            for kind in self._playback:
+                kind_dir = self.profile.fixtures_dir / kind
+                kind_dir.mkdir(parents=True, exist_ok=True)
+                self._playback[kind] = sorted(kind_dir.iterdir())
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def gemini_base_url(self) -> str:
+        return self.base_url
+
+    @property
+    def search_endpoint(self) -> str:
+        return f"{self.base_url}/html/"
+
+    def env(self) -> dict[str, str]:
+        """Environment overrides that point `build_runtime` at this server."""
+        return {
+            "GEMINI_BASE_URL": self.gemini_base_url,
+            "SEARCH_ENDPOINT": self.search_endpoint,
+            "GEMINI_API_KEY": "stand-in",
+            "SCOUT_FETCH_PAGES": "0",
+            "PARCEL_LOOKUP": "0",
+        }
+
+    def start(self) -> StandInServer:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> StandInServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def _injected_fault(self) -> int | None:
+        """Decide whether this request gets a 429 or 5xx before any latency is applied."""
+        profile = self.profile
+        with self._lock:
+            self._requests += 1
+            if profile.burst_429_every and self._requests % profile.burst_429_every == 0:
+                self._burst_remaining = profile.burst_429_length
+            if self._burst_remaining > 0:
+                self._burst_remaining -= 1
+                return 429
+            if profile.error_rate and self._rng.random() < profile.error_rate:
+                return 503
+            delay_ms = profile.latency.sample_ms(self._rng)
+        time.sleep(delay_ms / 1000)
+        return None
+
+    def _fixture(self, kind: str, key: str) -> bytes | None:
+        if not self.profile.fixtures_dir or self.profile.record:
+            return None
+        exact = [path for path in self._playback[kind] if path.stem == key]
+        if exact:
+            return exact[0].read_bytes()
+        if not self._playback[kind]:
+            return None
+        with self._lock:
+            index = self._cursor[kind] % len(self._playback[kind])
+            self._cursor[kind] += 1
+        return self._playback[kind][index].read_bytes()
+
+    def _save_fixture(self, kind: str, key: str, suffix: str, body: bytes) -> None:
+        if self.profile.fixtures_dir and self.profile.record:
+            (self.profile.fixtures_dir / kind / f"{key}{suffix}").write_bytes(body)
+
+    def gemini_body(self, model: str, payload: dict[str, Any], query: str) -> tuple[int, bytes]:
+        prompt = "".join(
+            part.get("text", "") for item in payload.get("contents", []) for part in item.get("parts", [])
+        )
+        key = content_key(prompt)
+        if self.profile.record:
+            upstream = requests.post(
+                f"{UPSTREAM_GEMINI_BASE_URL}/v1beta/models/{model}:generateContent?{query}",
+                json=payload,
+                timeout=60,
+            )
+            if upstream.ok:
+                self._save_fixture("gemini", key, ".json", upstream.content)
+            return upstream.status_code, upstream.content
+        recorded = self._fixture("gemini", key)
+        if recorded is not None:
+            return 200, recorded
+        prompt_tokens = max(1, len(prompt) // 4)
+        text = f"- Stand-in {model} response for prompt {key}.\n- Facts, risks and next actions pending review."
+        body = {
+            "candidates": [{"content": {"parts": [{"text": text}]}}],
+            "usageMetadata": {
+                "promptTokenCount": prompt_tokens,
+                "candidatesTokenCount": len(text) // 4,
+                "totalTokenCount": prompt_tokens + len(text) // 4,
+            },
+            "responseId": uuid.uuid4().hex,
+        }
+        return 200, json.dumps(body).encode("utf-8")
+
+    def search_body(self, query: str) -> tuple[int, bytes]:
+        key = content_key(query)
+        if self.profile.record:
+            upstream = requests.get(UPSTREAM_SEARCH_ENDPOINT, params={"q": query}, timeout=60)
+            if upstream.ok:
+                self._save_fixture("search", key, ".html", upstream.content)
+            return upstream.status_code, upstream.content
+        recorded = self._fixture("search", key)
+        if recorded is not None:
+            return 200, recorded
+        blocks = [
+            '<div class="result">'
+            f'<a rel="nofollow" class="result__a" href="{escape(url)}">{escape(title)}</a>'
+            f'<a class="result__snippet" href="{escape(url)}">{escape(snippet)}</a>'
+            "</div>"
+            for url, title, snippet in SYNTHETIC_RESULTS
+        ]
+        html = f"<html><body><!-- q={escape(query)} -->{''.join(blocks)}</body></html>"
+        return 200, html.encode("utf-8")
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ARG002
+                return None
+
+            def do_GET(self) -> None:  # noqa: N802
+                parsed = urlparse(self.path)
+                if parsed.path == "/__stats":
+                    self._send(200, json.dumps(dict(server.stats)).encode("utf-8"), "application/json")
+                    return
+                if parsed.path.rstrip("/") != "/html":
+                    self._send(404, b"not found", "text/plain")
+                    return
+                if self._fault("search"):
+                    return
+                query = parse_qs(parsed.query).get("q", [""])[0]
+                status, body = server.search_body(query)
+                self._send(status, body, "text/html; charset=utf-8", kind="search")
+
+            def do_POST(self) -> None:  # noqa: N802
+                parsed = urlparse(self.path)
+                length = int(self.headers.get("Content-Length", "0"))
+                raw = self.rfile.read(length) if length else b"{}"
+                if not (parsed.path.startswith("/v1beta/models/") and parsed.path.endswith(":generateContent")):
+                    self._send(404, b"not found", "text/plain")
+                    return
+                if self._fault("gemini"):
+                    return
+                model = parsed.path[len("/v1beta/models/") : -len(":generateContent")]
+                status, body = server.gemini_body(model, json.loads(raw or b"{}"), parsed.query)
+                self._send(status, body, "application/json", kind="gemini")
+
+            def _fault(self, kind: str) -> bool:
+                code = server._injected_fault()
+                if code is None:
+                    return False
+                headers = {"Retry-After": "1"} if code == 429 else {}
+                self._send(code, json.dumps({"error": {"code": code}}).encode("utf-8"), "application/json", kind, headers)
+                return True
+
+            def _send(
+                self,
+                status: int,
+                body: bytes,
+                content_type: str,
+                kind: str = "other",
+                headers: dict[str, str] | None = None,
+            ) -> None:
+                with server._lock:
+                    server.stats[f"{kind}:{status}"] += 1
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Gemini/DuckDuckGo stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="fixed:0", help="fixed:MS | uniform:LOW:HIGH | lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--burst-429-every", type=int, default=0, help="Start a 429 burst every N requests")
+    parser.add_argument("--burst-429-length", type=int, default=0, help="Requests per 429 burst")
+    parser.add_argument("--fixtures", type=Path, default=None, help="Directory of recorded responses")
+    parser.add_argument("--record", action="store_true", help="Proxy to the real upstreams and save fixtures")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    profile = StandInProfile(
+        latency=LatencyDistribution.parse(args.latency),
+        error_rate=args.error_rate,
+        burst_429_every=args.burst_429_every,
+        burst_429_length=args.burst_429_length,
+        fixtures_dir=args.fixtures,
+        record=args.record,
+        seed=args.seed,
+    )
+    server = StandInServer(profile, host=args.host, port=args.port)
+    print(json.dumps(server.env(), indent=2))
+    try:
+        server.start()
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Micro-benchmark of the DuckDuckGo result parser against the legacy DOTALL regex.
+
+    python scripts/bench_search_parser.py --pages fixtures/search --repeat 200
+
+Pages default to synthetic result pages; point `--pages` at saved `.html`
+responses (e.g. the stand-in server's recorded `search/` fixtures) to measure
+real markup. Reports per-page parse time and peak traced allocations.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from html import unescape
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from partner_os.services.search import ResultParser, parse_results  # noqa: E402
+
+LEGACY_PATTERN = r'<a rel="nofollow" class="result__a" href="(?P<url>.*?)">(?P<title>.*?)</a>.*?' \
+    r'<a class="result__snippet".*?>(?P<snippet>.*?)</a>'
+
+
+def legacy_parse(html: str, limit: int) -> list[tuple[str, str, str]]:
+    """The pre-parser implementation: compile per call, DOTALL scan, three re.sub passes per result."""
+    pattern = re.compile(LEGACY_PATTERN, re.DOTALL)
+    results = []
+    for match in pattern.finditer(html):
+        url = unescape(match.group("url"))
+        title = re.sub(r"<.*?>", "", unescape(match.group("title"))).strip()
+        snippet = re.sub(r"<.*?>", "", unescape(match.group("snippet"))).strip()
+        results.append((url, title, snippet))
+        if len(results) >= limit:
+            break
+    return results
+
+
+
+def parser_only(html: str, limit: int) -> list[tuple[str, str, str]]:
+    parser = ResultParser(limit)
+    parser.feed(html)
+    parser.close()
+    return parser.results
+
+
+
+def synthetic_page(results: int = 30, filler_kb: int = 40, anchor_attrs: str = 'rel="nofollow" class="result__a"') -> str:
+    filler = "<script>" + ("var x = '<a class=\"ad\">';" * (filler_kb * 40)) + "</script>"
+    blocks = [
+        '<div class="result results_links web-result">'
+        f'<h2 class="result__title"><a {anchor_attrs} '
+        f'href="//duckduckgo.com/l/?uddg=https%3A%2F%2Fexample{idx}.com%2Fpage&amp;rut=x">'
+        f"Result <b>{idx}</b></a></h2>"
+        f'<a class="result__snippet" href="https://example{idx}.com/page">Cap rate <b>5.{idx % 10}%</b> '
+        + "context " * 40
+        + "</a></div>"
+        for idx in range(results)
+    ]
+    return f"<html><head>{filler}</head><body>{''.join(blocks)}</body></html>"
+
+
+
+def measure(fn: Callable[[str, int], list], pages: list[str], limit: int, repeat: int) -> dict[str, float]:
+    found = sum(len(fn(html, limit)) for html in pages)
+    timings = []
+    for _ in range(repeat):
+        for html in pages:
+            start = time.perf_counter()
+            fn(html, limit)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    for html in pages:
+        fn(html, limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ordered = sorted(timings)
+    return {
+        "results_found": found,
+        "mean_ms": round(statistics.fmean(timings), 4),
+        "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))], 4),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=Path, default=None, help="Directory of saved result .html pages")
+    parser.add_argument("--limit", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = [path.read_text(encoding="utf-8", errors="ignore") for path in sorted(args.pages.glob("*.html"))]
+        if not pages:
+            parser.error(f"No .html pages found in {args.pages}")
+    else:
+        pages = [synthetic_page(results=30, filler_kb=kb) for kb in (4, 40, 200)]
+        # Same results with attributes reordered, as DuckDuckGo markup drifts; the regex finds none.
+        pages.append(synthetic_page(results=30, filler_kb=40, anchor_attrs='class="result__a" rel="nofollow"'))
+
+    report = {
+        "pages": len(pages),
+        "mean_page_kib": round(statistics.fmean(len(html) for html in pages) / 1024, 1),
+        "limit": args.limit,
+        "legacy_regex": measure(legacy_parse, pages, args.limit, args.repeat),
+        "result_parser_full": measure(parser_only, pages, args.limit, args.repeat),
+        "parse_results": measure(parse_results, pages, args.limit, args.repeat),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Offline load test of the full Manager pipeline against the local stand-in server.
+
+    python scripts/load_test.py --deals 50 --latency lognormal:180:0.6 --error-rate 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from partner_os.runtime import build_runtime  # noqa: E402
+from partner_os.standin import LatencyDistribution, StandInProfile, StandInServer  # noqa: E402
+
+CFO_PAYLOAD = {
+    "purchase_price": 250000.0,
+    "current_noi": 18000.0,
+    "pro_forma_noi": 24000.0,
+    "annual_debt_service": 12000.0,
+    "annual_cash_flow": 6000.0,
+    "total_cash_invested": 50000.0,
+    "arv": 340000.0,
+    "rehab_budget": 50000.0,
+    "market_cap_rate": 0.07,
+    "cash_flows": [-50000.0, 9000.0, 10000.0, 12000.0, 14000.0, 145000.0],
+}
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--deals", type=int, default=20)
+    parser.add_argument("--files-per-deal", type=int, default=2)
+    parser.add_argument("--latency", default="lognormal:150:0.5")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--burst-429-every", type=int, default=0)
+    parser.add_argument("--burst-429-length", type=int, default=0)
+    parser.add_argument("--fixtures", type=Path, default=None)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    profile = StandInProfile(
+        latency=LatencyDistribution.parse(args.latency),
+        error_rate=args.error_rate,
+        burst_429_every=args.burst_429_every,
+        burst_429_length=args.burst_429_length,
+        fixtures_dir=args.fixtures,
+        seed=args.seed,
+    )
+
+    with StandInServer(profile) as server, tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ.update(server.env())
+        os.environ.setdefault("GEMINI_REQUESTS_PER_MINUTE", "0")
+        runtime = build_runtime(root_override=Path(tmp_dir))
+        latencies: list[float] = []
+        started = time.perf_counter()
+        try:
+            for idx in range(args.deals):
+                staged = []
+                for file_idx in range(args.files_per_deal):
+                    path = runtime.config.staging_inbox_dir / f"lead_{idx}_{file_idx}.txt"
+                    path.write_text(f"Seller notes {idx}/{file_idx}: roof, probate, 30 day close.", encoding="utf-8")
+                    staged.append(path)
+                deal_start = time.perf_counter()
+                runtime.manager.handle_user_message(
+                    message=f"New lead at {100 + idx} Main St, Vancouver, WA 98660",
+                    uploaded_paths=staged,
+                    cfo_payload=CFO_PAYLOAD,
+                    run_scout=True,
+                )
+                latencies.append(time.perf_counter() - deal_start)
+            wall = time.perf_counter() - started
+
+            calls = runtime.store.list_api_calls(limit=100000)
+            report = {
+                "deals": args.deals,
+                "wall_seconds": round(wall, 3),
+                "deals_per_second": round(args.deals / wall, 3) if wall else None,
+                "deal_latency_p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+                "deal_latency_p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+                "deal_latency_p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+                "api_calls": dict(Counter(f"{row['request_type']}:{row['status']}" for row in calls)),
+                "api_latency_p95_ms": percentile([row["latency_ms"] for row in calls], 0.95) if calls else None,
+                "upstream": dict(server.stats),
+            }
+            print(json.dumps(report, indent=2, sort_keys=True))
+        finally:
+            runtime.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import dataclasses
 from pathlib import Path
+from typing import Any, Callable
 
 import pytest
+import requests
 
+from partner_os.config import load_config
+from partner_os.db.store import DataStore
 from partner_os.runtime import AppRuntime, build_runtime
+from partner_os.services.llm import GeminiClient
+from partner_os.standin import StandInProfile, StandInServer
 
 
 @pytest.fixture
@@ -21,6 +28,61 @@ def runtime_with_gemini(tmp_path: Path) -> AppRuntime:
     runtime.close()
 
 
+class FakeGeminiResponse:
+    """Stand-in for a `requests` response carrying a Gemini generateContent body."""
+
+    def __init__(self, text: str, status: int = 200):
+        self._text = text
+        self.status_code = status
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+    def json(self) -> dict[str, Any]:
+        return {"candidates": [{"content": {"parts": [{"text": self._text}]}}], "usageMetadata": {}}
+
+
+@pytest.fixture
+def fake_gemini_response() -> type[FakeGeminiResponse]:
+    return FakeGeminiResponse
+
+
+@pytest.fixture
+def gemini_client(tmp_path: Path) -> Callable[..., tuple[GeminiClient, DataStore]]:
+    """Factory for an unthrottled GeminiClient with a test key; config fields can be overridden."""
+    stores: list[DataStore] = []
+
+    def make(**overrides: Any) -> tuple[GeminiClient, DataStore]:
+        config = dataclasses.replace(
+            load_config(root_override=tmp_path),
+            **{"gemini_api_key": "test-key", "gemini_requests_per_minute": 0, **overrides},
+        )
+        store = DataStore(config.database_path)
+        stores.append(store)
+        return GeminiClient(config=config, store=store), store
+
+    yield make
+    for store in stores:
+        store.close()
+
+
+@pytest.fixture
+def standin_server() -> StandInServer:
+    with StandInServer(StandInProfile(seed=1)) as server:
+        yield server
+
+
+@pytest.fixture
+def runtime_with_standin(tmp_path: Path, standin_server: StandInServer, monkeypatch: pytest.MonkeyPatch) -> AppRuntime:
+    for name, value in standin_server.env().items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setenv("GEMINI_REQUESTS_PER_MINUTE", "0")
+    runtime = build_runtime(root_override=tmp_path, use_llm=True)
+    yield runtime
+    runtime.close()
+
+
 @pytest.fixture
 def default_cfo_payload() -> dict[str, object]:
     return {
@@ -33,6 +33,8 @@ def test_end_to_end_pipeline(runtime_no_llm, default_cfo_payload):
     inbox_text = runtime_no_llm.config.firm_inbox_path.read_text(encoding="utf-8")
     assert deal_id in inbox_text
     assert "Superintelligence Synthesis" in inbox_text
+    cfo_report = next(path for path in deliverables if path.name.startswith("cfo_underwriting_"))
+    assert f"- CFO Report: `{cfo_report}`" in inbox_text
 
     action_logs = runtime_no_llm.store.list_action_logs(limit=200)
     assert action_logs
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from partner_os.services.llm import SummaryResult
+
 
 def test_librarian_moves_files_and_tracks_pointers(runtime_no_llm):
     staged = runtime_no_llm.config.staging_inbox_dir / "notes.txt"
@@ -29,9 +31,84 @@ def test_librarian_moves_files_and_tracks_pointers(runtime_no_llm):
     doc_paths = {row["file_path"] for row in docs}
     assert str(moved_file) in doc_paths
 
-    summary_files = list((deal_root / "06_AI_Deliverables").glob("notes_summary.md"))
+    summary_files = list((deal_root / "06_AI_Deliverables").glob("notes.txt_summary.md"))
     assert summary_files
 
     tasks = runtime_no_llm.store.list_tasks()
     assert tasks
     assert all(task["status"] == "completed" for task in tasks)
+
+
+def test_librarian_triages_multiple_uploads_as_one_batch(runtime_no_llm):
+    first = runtime_no_llm.config.staging_inbox_dir / "inspection.txt"
+    second = runtime_no_llm.config.staging_inbox_dir / "photo.jpg"
+    first.write_text("Foundation crack on north wall.", encoding="utf-8")
+    second.write_bytes(b"\xff\xd8\xff")
+
+    result = runtime_no_llm.manager.handle_user_message(
+        message="New lead at 55 Elm St, Vancouver, WA 98660",
+        uploaded_paths=[first, second],
+        cfo_payload=None,
+        run_scout=False,
+    )
+
+    deal = runtime_no_llm.store.get_deal(result["deal_id"])
+    deal_root = runtime_no_llm.config.root_dir / f"{result['deal_id']}_{deal['slug']}"
+    assert (deal_root / "04_Intel_Docs" / "inspection.txt").exists()
+    assert (deal_root / "01_Intel_Photos" / "photo.jpg").exists()
+
+    task_types = [task["task_type"] for task in runtime_no_llm.store.list_tasks()]
+    assert task_types.count("triage_batch") == 1
+    assert "triage_file" not in task_types
+
+    docs = runtime_no_llm.store.list_documents(result["deal_id"])
+    assert len(docs) == 4
+
+
+def test_identical_uploads_share_one_blob_and_one_summary(runtime_no_llm):
+    class CountingLLM:
+        def __init__(self) -> None:
+            self.texts: list[str] = []
+
+        def summarize_many(self, texts, deal_id=None, max_concurrency=None):
+            self.texts.extend(texts)
+            return [SummaryResult(index=idx, summary="Roof replaced 2019.") for idx in range(len(texts))]
+
+    llm = CountingLLM()
+    runtime_no_llm.librarian.llm_client = llm
+    staging = runtime_no_llm.config.staging_inbox_dir
+    report = b"Inspection: roof replaced 2019, furnace at end of life.\n" * 200
+
+    jackets = []
+    for address in ("10 Oak St, Vancouver, WA 98660", "22 Pine St, Vancouver, WA 98661"):
+        staged = staging / "inspection.txt"
+        staged.write_bytes(report)
+        result = runtime_no_llm.manager.handle_user_message(
+            message=f"New lead at {address}", uploaded_paths=[staged], cfo_payload=None, run_scout=False
+        )
+        deal = runtime_no_llm.store.get_deal(result["deal_id"])
+        jackets.append(runtime_no_llm.config.root_dir / f"{result['deal_id']}_{deal['slug']}" / "04_Intel_Docs")
+
+    first, second = (jacket / "inspection.txt" for jacket in jackets)
+    assert first.read_bytes() == second.read_bytes() == report
+    assert first.stat().st_ino == second.stat().st_ino
+    assert len(llm.texts) == 1
+    docs = runtime_no_llm.store.list_documents(result["deal_id"])
+    assert any(row["summary"] == "Roof replaced 2019." for row in docs)
+
+    # Re-uploading the same bytes to the same deal is a metadata-only no-op.
+    staged = staging / "inspection (1).txt"
+    staged.write_bytes(report)
+    runtime_no_llm.manager.handle_user_message(
+        message="More intel for 22 Pine St, Vancouver, WA 98661",
+        uploaded_paths=[staged],
+        cfo_payload=None,
+        run_scout=False,
+    )
+    assert not staged.exists()
+    assert sorted(path.name for path in jackets[1].iterdir()) == ["inspection.txt"]
+    assert len(runtime_no_llm.store.list_documents(result["deal_id"])) == len(docs)
+
+    blob = runtime_no_llm.store.get_blob(next(iter(runtime_no_llm.config.blob_store_dir.glob("*/*"))).name)
+    assert blob["ref_count"] == 2
+    assert len(list(runtime_no_llm.config.blob_store_dir.glob("*/*"))) == 1
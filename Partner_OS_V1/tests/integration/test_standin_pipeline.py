@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import random
+
+import requests
+
+from partner_os.agents.scout import MARKET_SUB_QUERIES
+from partner_os.standin import LatencyDistribution, StandInProfile, StandInServer
+
+
+def test_full_pipeline_runs_offline_against_standin(runtime_with_standin, standin_server, default_cfo_payload):
+    staged = runtime_with_standin.config.staging_inbox_dir / "seller_call.txt"
+    staged.write_text("Seller wants a 30 day close; roof is 20 years old.", encoding="utf-8")
+
+    result = runtime_with_standin.manager.handle_user_message(
+        message="Start full analysis for 789 Pine St, Vancouver, WA 98661",
+        uploaded_paths=[staged],
+        cfo_payload=default_cfo_payload,
+        run_scout=True,
+    )
+
+    assert all(item.success for item in result["results"])
+    assert "Stand-in" in result["response"]
+
+    calls = runtime_with_standin.store.list_api_calls(limit=20)
+    assert {call["request_type"] for call in calls} >= {"summary", "chat"}
+    assert all(call["status"] == "success" for call in calls)
+    assert all(call["endpoint"].startswith(standin_server.base_url) for call in calls)
+
+    stats = requests.get(f"{standin_server.base_url}/__stats", timeout=5).json()
+    assert stats["search:200"] == len(MARKET_SUB_QUERIES)
+    assert stats["gemini:200"] == len(calls)
+
+
+def test_standin_injects_429_bursts_and_replays_fixtures(tmp_path):
+    (tmp_path / "gemini").mkdir()
+    (tmp_path / "gemini" / "recorded.json").write_text(
+        '{"candidates": [{"content": {"parts": [{"text": "recorded answer"}]}}]}',
+        encoding="utf-8",
+    )
+    profile = StandInProfile(burst_429_every=3, burst_429_length=2, fixtures_dir=tmp_path, seed=3)
+
+    with StandInServer(profile) as server:
+        url = f"{server.gemini_base_url}/v1beta/models/test-model:generateContent"
+        statuses = [requests.post(url, json={"contents": []}, timeout=5).status_code for _ in range(7)]
+        replay = requests.post(url, json={"contents": []}, timeout=5)
+
+    assert statuses == [200, 200, 429, 429, 200, 429, 429]
+    assert replay.json()["candidates"][0]["content"]["parts"][0]["text"] == "recorded answer"
+
+
+def test_latency_distribution_parsing():
+    rng = random.Random(0)
+    assert LatencyDistribution.parse("fixed:25").sample_ms(rng) == 25
+    assert 10 <= LatencyDistribution.parse("uniform:10:20").sample_ms(rng) <= 20
+    assert LatencyDistribution.parse("lognormal:100:0.5").sample_ms(rng) > 0
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from partner_os.config import load_config
+from partner_os.db.store import DataStore
+from partner_os.runtime import build_runtime
+from partner_os.services.address import GeocodeCache, link_legacy_deals, normalize_address
+from partner_os.services.parcels import ParcelClient
+from partner_os.services.signals import geography_for_address
+
+
+class FakeResponse:
+    def __init__(self, payload: dict):
+        self._payload = payload
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> dict:
+        return self._payload
+
+
+class CountingSession:
+    def __init__(self) -> None:
+        self.geocodes = 0
+        self.parcel_queries: list[dict] = []
+
+    def get(self, url, params=None, timeout=10):
+        self.geocodes += 1
+        if "Nowhere" in params["SingleLine"]:
+            return FakeResponse({"candidates": []})
+        return FakeResponse({"candidates": [{"address": "123 MAIN ST", "score": 99, "location": {"x": 1.0, "y": 1.0}}]})
+
+    def post(self, url, data=None, timeout=10):
+        self.parcel_queries.append(data)
+        return FakeResponse(
+            {
+                "features": [
+                    {
+                        "attributes": {"Prop_id": 555, "SitusAddrsFull": "123 MAIN ST", "MktLandVal": 1, "MktBldgVal": 2},
+                        "geometry": {"rings": [[[0, 0], [2, 0], [2, 2], [0, 2], [0, 0]]]},
+                    }
+                ]
+            }
+        )
+
+
+def test_normalize_address_usps_forms() -> None:
+    assert normalize_address("123 Main Street, Vancouver, WA 98660") == "123 MAIN ST, VANCOUVER, WA 98660"
+    assert normalize_address("123 main st., vancouver, washington 98660-1234") == "123 MAIN ST, VANCOUVER, WA 98660"
+    assert normalize_address("500 North Main Street Suite 200, Vancouver, WA") == "500 N MAIN ST STE 200, VANCOUVER, WA"
+    assert normalize_address("123 North Street, Vancouver, WA") == "123 NORTH ST, VANCOUVER, WA"
+    assert normalize_address("12 NE 5th Avenue East, Camas, WA") == "12 NE 5TH AVE E, CAMAS, WA"
+    assert geography_for_address("9 Elm Road, Vancouver, Washington 98660") == "vancouver-wa"
+
+
+def test_parcel_client_consults_cache_before_network(tmp_path: Path) -> None:
+    store = DataStore(tmp_path / "db.sqlite")
+    session = CountingSession()
+    client = ParcelClient(session=session, cache=GeocodeCache(store))
+
+    first = client.lookup_many(["123 Main Street, Vancouver, WA 98660", "1 Nowhere Rd, Vancouver, WA"])
+    assert first["123 Main Street, Vancouver, WA 98660"].parcel_id == "555"
+    assert session.geocodes == 2
+
+    second = client.lookup_many(["123 Main St, Vancouver, Washington 98660", "1 Nowhere Road, Vancouver, WA"])
+    assert second["123 Main St, Vancouver, Washington 98660"].parcel_id == "555"
+    assert second["1 Nowhere Road, Vancouver, WA"] is None
+    assert session.geocodes == 2
+    assert session.parcel_queries[-1]["where"] == "Prop_id IN (555)"
+    assert GeocodeCache(store).stats() == {"hits": 2, "misses": 2, "hit_rate": 0.5}
+    store.close()
+
+
+def test_manager_reuses_deal_for_equivalent_address(runtime_no_llm) -> None:
+    first = runtime_no_llm.manager.handle_user_message(
+        message="New lead at 123 Main Street, Vancouver, WA 98660", uploaded_paths=[], run_scout=False
+    )
+    second = runtime_no_llm.manager.handle_user_message(
+        message="Follow-up on 123 Main St., Vancouver, Washington 98660", uploaded_paths=[], run_scout=False
+    )
+
+    assert first["deal_id"] == second["deal_id"]
+    assert len(runtime_no_llm.store.list_deals()) == 1
+    assert runtime_no_llm.store.get_deal(first["deal_id"])["slug"] == "123-main-st-vancouver-wa-98660"
+
+
+def test_deals_created_before_address_index_are_reused(tmp_path: Path) -> None:
+    store = DataStore(load_config(root_override=tmp_path).database_path)
+    store.create_deal("deal-old", "77 North Oak Street, Vancouver, WA 98660", "77-oak", jurisdiction_warning=False)
+    store.close()
+
+    runtime = build_runtime(root_override=tmp_path, use_llm=False)
+    try:
+        result = runtime.manager.handle_user_message(
+            message="Any news on 77 N Oak St, Vancouver, Washington 98660?", uploaded_paths=[], run_scout=False
+        )
+        assert result["deal_id"] == "deal-old"
+        assert len(runtime.store.list_deals()) == 1
+        assert link_legacy_deals(runtime.store) == 0
+    finally:
+        runtime.close()
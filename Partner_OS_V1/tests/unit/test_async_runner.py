@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import time
+
+import httpx
+
+from partner_os.agents.scout import MARKET_SUB_QUERIES
+from partner_os.config import load_config
+from partner_os.db.store import DataStore
+from partner_os.services.async_runner import AsyncFanout, run_async
+
+RESULT_HTML = (
+    '<a rel="nofollow" class="result__a" href="https://www.clark.wa.gov/x">Clark <b>County</b></a>'
+    '<a class="result__snippet" href="#">Cap rate 5.5% for multifamily.</a>'
+)
+
+
+async def _handler(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(0.05)
+    if "duckduckgo" in request.url.host:
+        return httpx.Response(200, text=RESULT_HTML)
+    return httpx.Response(200, json={"candidates": [{"content": {"parts": [{"text": "ok"}]}}]})
+
+
+def test_runner_keeps_requests_in_flight_and_logs_every_call(tmp_path):
+    config = dataclasses.replace(
+        load_config(root_override=tmp_path),
+        gemini_api_key="test-key",
+        gemini_requests_per_minute=0,
+    )
+    store = DataStore(config.database_path)
+
+    async def work(runner):
+        summaries = await runner.summarize_many([f"doc {idx}" for idx in range(100)])
+        searches = await runner.search_many([f"query {idx}" for idx in range(100)])
+        return summaries, searches
+
+    start = time.perf_counter()
+    summaries, searches = run_async(
+        config,
+        store,
+        work,
+        max_in_flight=200,
+        transport=httpx.MockTransport(_handler),
+    )
+    elapsed = time.perf_counter() - start
+
+    assert all(result.ok and result.summary == "ok" for result in summaries)
+    assert all(claims[0].title == "Clark County" for claims in searches)
+    assert elapsed < 2.0
+
+    calls = store.list_api_calls(limit=500)
+    assert len(calls) == 100
+    assert all(call["status"] == "success" for call in calls)
+
+    store.close()
+
+
+def test_runner_inside_a_task_transaction_defers_its_writes(tmp_path):
+    config = dataclasses.replace(
+        load_config(root_override=tmp_path),
+        gemini_api_key="test-key",
+        gemini_requests_per_minute=0,
+    )
+    store = DataStore(config.database_path)
+    fanout = AsyncFanout(config, store, transport=httpx.MockTransport(_handler))
+
+    with store.transaction():
+        results = fanout.summarize_many(["doc a", "doc b"], deal_id=None)
+    store.flush()
+
+    assert [result.summary for result in results] == ["ok", "ok"]
+    assert len(store.list_api_calls(limit=10)) == 2
+    store.close()
+
+
+def test_scout_fans_out_cache_misses_on_the_event_loop(runtime_no_llm):
+    requests_seen: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests_seen.append(request.url.params["q"])
+        return httpx.Response(200, text=RESULT_HTML)
+
+    scout = runtime_no_llm.scout
+    scout.fanout = AsyncFanout(runtime_no_llm.config, runtime_no_llm.store, transport=httpx.MockTransport(handler))
+
+    claims, failed = scout._scan("12 Oak St, Vancouver, WA 98660")
+    assert [claim.title for claim in claims] == ["Clark County"]
+    assert failed == []
+    assert len(requests_seen) == len(MARKET_SUB_QUERIES)
+
+    scout._scan("12 Oak St, Vancouver, WA 98660")
+    assert len(requests_seen) == len(MARKET_SUB_QUERIES)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from partner_os.services.chunks import ChunkIndex, fts_query, split_passages
+
+INSPECTION = "\n\n".join(
+    [
+        "General condition is fair for a 1962 fourplex.",
+        "The roof membrane is past its service life and leaks above unit 3. Budget a full tear-off.",
+        " ".join(["Interior finishes are dated but serviceable."] * 40),
+        "Foundation shows a hairline crack on the north wall; monitor rather than repair.",
+    ]
+)
+
+
+def test_passages_keep_offsets_overlap_and_sentence_boundaries():
+    text = " ".join(f"Sentence number {idx} describes the rent roll." for idx in range(120))
+
+    passages = split_passages(text, max_chars=400, overlap_chars=60)
+
+    assert len(passages) > 1
+    assert all(text[item.start : item.end] == item.text for item in passages)
+    assert all(len(item.text) <= 400 for item in passages)
+    assert all(item.text.endswith(".") for item in passages[:-1])
+    assert all(later.start < earlier.end for earlier, later in zip(passages, passages[1:]))
+    assert passages[-1].end == len(text)
+
+
+def test_query_terms_are_quoted_and_stopwords_dropped():
+    assert fts_query('What is the "roof" NOT condition? roof') == '"roof" OR "not" OR "condition"'
+    assert fts_query("is the") == ""
+
+
+def test_retrieve_scopes_to_deal_plus_doctrine_within_budget(runtime_no_llm):
+    index = ChunkIndex(runtime_no_llm.store, passage_chars=200, overlap_chars=20)
+    store = runtime_no_llm.store
+    deal_a = runtime_no_llm.manager.handle_user_message(
+        message="New lead at 12 Birch St, Vancouver, WA 98660", uploaded_paths=[], run_scout=False
+    )["deal_id"]
+    deal_b = runtime_no_llm.manager.handle_user_message(
+        message="New lead at 9 Oak St, Vancouver, WA 98660", uploaded_paths=[], run_scout=False
+    )["deal_id"]
+    assert store.get_deal(deal_a) and store.get_deal(deal_b)
+
+    index.index_text(Path("/deals/a/inspection.txt"), INSPECTION, deal_id=deal_a, content_hash="h-a")
+    index.index_text(Path("/deals/b/roof_quote.txt"), "Roof replacement quote: $38,000.", deal_b, content_hash="h-b")
+    index.index_text(
+        Path("/library/capex_playbook.md"), "Treat any roof past service life as day-one capex.", None, "h-lib"
+    )
+    assert index.index_text(Path("/deals/a/inspection.txt"), INSPECTION, deal_id=deal_a, content_hash="h-a") == 0
+
+    passages = index.retrieve(deal_a, "How bad is the roof?", k=5, token_budget=200)
+
+    sources = [Path(item.source_path).name for item in passages]
+    assert sources[0] in {"inspection.txt", "capex_playbook.md"}
+    assert set(sources) == {"inspection.txt", "capex_playbook.md"}
+    assert sum(len(item.text) for item in passages) <= 200 * 4
+    assert "leaks above unit 3" in " ".join(item.text for item in passages)
+    assert index.retrieve(deal_a, "roof", include_library=False)[0].source_path.endswith("inspection.txt")
+    assert index.retrieve(deal_a, "zebra") == []
+
+
+def test_uploaded_documents_feed_inbox_and_chat_prompt(runtime_no_llm):
+    staged = runtime_no_llm.config.staging_inbox_dir / "inspection.txt"
+    staged.write_text(INSPECTION, encoding="utf-8")
+    deal_id = runtime_no_llm.manager.handle_user_message(
+        message="New lead at 12 Birch St, Vancouver, WA 98660", uploaded_paths=[staged], run_scout=False
+    )["deal_id"]
+
+    inbox = runtime_no_llm.config.firm_inbox_path.read_text(encoding="utf-8")
+    assert "### Relevant Passages" in inbox
+    assert "[inspection.txt @" in inbox and "tear-off" in inbox
+
+    class RecordingLLM:
+        transcript: list = []
+
+        def chat_reply(self, transcript, deal_id):
+            RecordingLLM.transcript = transcript
+            return "ok"
+
+    runtime_no_llm.manager.llm_client = RecordingLLM()
+    runtime_no_llm.manager._build_manager_reply(deal_id, query="Is the foundation crack a problem?", queue_results=[])
+
+    context = RecordingLLM.transcript[-1]
+    assert context["role"] == "system"
+    assert "hairline crack on the north wall" in context["content"]
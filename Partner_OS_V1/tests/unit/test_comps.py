@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+import math
+import random
+import time
+from pathlib import Path
+
+import pytest
+
+from partner_os.agents.cfo import CFOAgent
+from partner_os.config import load_config
+from partner_os.db.store import DataStore
+from partner_os.models import Task, TaskType
+from partner_os.services.comps import CompsEngine, CompSubject, KDTree, read_sales_csv, write_analysis_comps
+
+BASE_LAT, BASE_LON = 45.63, -122.66
+
+
+def _write_sales(path: Path, count: int = 3000, seed: int = 3) -> None:
+    rng = random.Random(seed)
+    lines = ["Sale_ID,Address,Lat,Lon,Sale_Price,Sale_Date,SqFt,Year_Built"]
+    for idx in range(count):
+        lat = BASE_LAT + rng.uniform(-0.15, 0.15)
+        lon = BASE_LON + rng.uniform(-0.2, 0.2)
+        sqft = rng.randint(900, 3200)
+        lines.append(f"S{idx},{idx} Test St,{lat:.6f},{lon:.6f},{sqft * 250},2025-{rng.randint(1, 12):02d}-15,{sqft},{rng.randint(1950, 2020)}")
+    lines.append("N1,Near Match,45.6305,-122.6605,\"$400,000\",2025-06-01,1600,1995")
+    lines.append("OLD,Too Old,45.6301,-122.6601,999999,2019-01-01,1600,1995")
+    lines.append("BAD,Bad Row,not-a-number,-122.6,100000,2025-01-01,1000,1990")
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+
+def test_kdtree_matches_brute_force() -> None:
+    rng = random.Random(1)
+    points = [tuple(rng.random() for _ in range(4)) for _ in range(500)]
+    tree = KDTree(points)
+    for _ in range(20):
+        query = tuple(rng.random() for _ in range(4))
+        expected = sorted(range(len(points)), key=lambda idx: math.dist(query, points[idx]))[:5]
+        assert [idx for _, idx in tree.nearest(query, 5)] == expected
+
+
+def test_comps_respect_radius_and_window_and_estimate_arv(tmp_path: Path) -> None:
+    store = DataStore(tmp_path / "db.sqlite")
+    csv_path = tmp_path / "sales.csv"
+    _write_sales(csv_path)
+    engine = CompsEngine(store)
+
+    assert engine.import_csv(csv_path) == 3002
+
+    subject = CompSubject(latitude=45.63, longitude=-122.66, building_sqft=1600, year_built=1995, as_of="2025-12-31")
+    started = time.perf_counter()
+    matches = engine.find(subject, k=6, radius_miles=1.0, months=12)
+    assert engine.find(subject, k=6, radius_miles=1.0, months=12)
+    elapsed = time.perf_counter() - started
+
+    assert matches[0].sale.sale_id == "N1"
+    assert all(match.distance_miles <= 1.0 for match in matches)
+    assert all(match.sale.sale_date >= "2025-01-01" for match in matches)
+    assert "OLD" not in {match.sale.sale_id for match in matches}
+    assert elapsed < 0.5
+
+    estimate = engine.estimate(subject, radius_miles=2.0)
+    assert estimate.arv == pytest.approx(400000, rel=0.05)
+    assert estimate.low <= estimate.arv <= estimate.high
+    assert "Near Match" in estimate.summary
+
+    far = CompSubject(latitude=47.6, longitude=-122.3, as_of="2025-12-31")
+    batch = engine.estimate_many([subject, far], radius_miles=2.0)
+    assert batch[0].arv == estimate.arv
+    assert batch[1].arv is None
+    store.close()
+
+
+def test_cfo_uses_comps_arv_when_payload_omits_it(tmp_path: Path, default_cfo_payload) -> None:
+    config = load_config(root_override=tmp_path)
+    store = DataStore(config.database_path)
+    csv_path = tmp_path / "sales.csv"
+    _write_sales(csv_path, count=200)
+    engine = CompsEngine(store)
+    engine.import_csv(csv_path)
+    store.create_deal("deal-1", "123 Main St, Vancouver, WA 98660", "123-main-st", False)
+
+    payload = {key: value for key, value in default_cfo_payload.items() if key != "arv"}
+    payload["subject"] = {"latitude": 45.63, "longitude": -122.66, "building_sqft": 1600, "year_built": 1995, "as_of": "2025-12-31"}
+    agent = CFOAgent(name="CFO", config=config, store=store, comps=engine)
+    result = agent.run_underwrite_task(
+        Task(task_id="t1", task_type=TaskType.run_cfo, deal_id="deal-1", actor="CFO", payload=payload, rationale="test")
+    )
+
+    metrics = result.details["metrics"]
+    assert metrics["comps_count"] >= 1
+    assert metrics["mao"] == pytest.approx(metrics["comps_arv"] * 0.7 - payload["rehab_budget"], abs=0.01)
+    assert "Comparable Sales" in Path(result.details["report_path"]).read_text(encoding="utf-8")
+    store.close()
+
+
+def test_unparseable_optional_columns_do_not_abort_import(tmp_path: Path) -> None:
+    path = tmp_path / "sales.csv"
+    path.write_text(
+        "Address,Lat,Lon,Sale_Price,Sale_Date,SqFt,Year_Built\n"
+        "1 A St,45.63,-122.66,300000,2025-05-01,N/A,unknown\n"
+        "2 B St,45.64,-122.67,310000,2025-05-02,1500,1990\n",
+        encoding="utf-8",
+    )
+    sales = list(read_sales_csv(path))
+    assert [(sale.building_sqft, sale.year_built) for sale in sales] == [(None, None), (1500.0, 1990)]
+
+
+def test_estimate_lands_in_scout_analysis_for_the_underwriter(tmp_path: Path) -> None:
+    config = load_config(root_override=tmp_path)
+    store = DataStore(config.database_path)
+    _write_sales(tmp_path / "sales.csv", count=200)
+    engine = CompsEngine(store)
+    engine.import_csv(tmp_path / "sales.csv")
+    estimate = engine.estimate(CompSubject(latitude=45.63, longitude=-122.66, as_of="2025-12-31"), radius_miles=2.0)
+
+    analysis = tmp_path / "deals" / "active" / "1-main-st" / "analysis.json"
+    assert not write_analysis_comps(analysis, estimate)
+    analysis.parent.mkdir(parents=True)
+    analysis.write_text(json.dumps({"address": "1 Main St", "valuation": {"assessed_value": 250000}}), encoding="utf-8")
+    assert write_analysis_comps(analysis, estimate)
+
+    valuation = json.loads(analysis.read_text(encoding="utf-8"))["valuation"]
+    assert valuation["assessed_value"] == 250000
+    assert valuation["comps_arv"] == estimate.arv
+    assert valuation["comps_summary"] == estimate.summary
+    store.close()
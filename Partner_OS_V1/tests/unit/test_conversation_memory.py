@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from partner_os.config import load_config
+from partner_os.db.store import DataStore
+from partner_os.services.llm import NullLLMClient
+from partner_os.services.memory import ConversationMemory
+
+
+def _store(tmp_path):
+    config = load_config(root_override=tmp_path)
+    store = DataStore(config.database_path)
+    store.create_deal(
+        deal_id="deal-mem",
+        property_address="123 Main St, Vancouver, WA 98660",
+        slug="123-main-st-vancouver-wa-98660",
+        jurisdiction_warning=False,
+    )
+    return store
+
+
+def test_transcript_stays_bounded_as_thread_grows(tmp_path):
+    store = _store(tmp_path)
+    memory = ConversationMemory(store=store, llm_client=NullLLMClient(), recent_turns=4, summary_max_chars=500)
+
+    sizes = []
+    for idx in range(60):
+        role = "user" if idx % 2 == 0 else "assistant"
+        store.insert_chat_message(role=role, content=f"turn {idx}: " + "detail " * 20, deal_id="deal-mem")
+        transcript = memory.build_transcript("deal-mem")
+        sizes.append(sum(len(item["content"]) for item in transcript))
+
+    assert len(transcript) == 5
+    assert transcript[0]["role"] == "system"
+    assert transcript[-1]["content"].startswith("turn 59:")
+    assert max(sizes[20:]) <= 500 + 4 * 200 + 100
+
+    row = store.get_conversation_memory("deal-mem")
+    assert row is not None
+    assert "turn 55:" in row["summary"]
+
+    store.close()
+
+
+def test_short_thread_is_returned_verbatim(tmp_path):
+    store = _store(tmp_path)
+    memory = ConversationMemory(store=store, llm_client=NullLLMClient(), recent_turns=4)
+    store.insert_chat_message(role="user", content="hello", deal_id="deal-mem")
+
+    assert memory.build_transcript("deal-mem") == [{"role": "user", "content": "hello"}]
+    assert store.get_conversation_memory("deal-mem") is None
+
+    store.close()
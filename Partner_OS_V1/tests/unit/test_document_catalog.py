@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import shutil
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from partner_os.constants import DOCUMENT_KIND_CFO_REPORT, DOCUMENT_KIND_JACKET
+from partner_os.db.store import DataStore
+from partner_os.services.filesystem import ensure_deal_jacket
+
+
+def test_older_documents_table_is_migrated_and_backfilled(tmp_path: Path):
+    database = tmp_path / "old.db"
+    conn = sqlite3.connect(database)
+    conn.executescript(
+        """
+        CREATE TABLE deals (
+            deal_id TEXT PRIMARY KEY, property_address TEXT NOT NULL, slug TEXT NOT NULL, status TEXT NOT NULL,
+            jurisdiction_warning INTEGER NOT NULL DEFAULT 0, created_at TEXT NOT NULL, updated_at TEXT NOT NULL,
+            underwriting_json TEXT, notes TEXT
+        );
+        CREATE TABLE documents (
+            document_id INTEGER PRIMARY KEY AUTOINCREMENT, deal_id TEXT NOT NULL, category TEXT NOT NULL,
+            file_path TEXT NOT NULL UNIQUE, summary TEXT, created_at TEXT NOT NULL
+        );
+        INSERT INTO deals VALUES ('deal-1', '1 Main St', '1-main-st', 'new', 0, 't0', 't0', NULL, NULL);
+        INSERT INTO documents (deal_id, category, file_path, summary, created_at) VALUES
+            ('deal-1', '04_Intel_Docs', '/d/04_Intel_Docs/notes.txt', 'Roof leak.', 't1'),
+            ('deal-1', '06_AI_Deliverables', '/d/06_AI_Deliverables/notes_summary.md',
+             'Librarian artifact summary', 't2'),
+            ('deal-1', '06_AI_Deliverables', '/d/06_AI_Deliverables/cfo_underwriting_1.md',
+             'Deterministic CFO underwriting report', 't3'),
+            ('deal-1', '04_Intel_Docs', '/d/04_Intel_Docs/market_context_1.md', NULL, 't4');
+        """
+    )
+    conn.commit()
+    conn.close()
+
+    store = DataStore(database)
+    try:
+        kinds = [row["kind"] for row in store.list_documents("deal-1")]
+        assert kinds == ["upload", "summary", "cfo_report", "market_report"]
+        assert store.latest_document("deal-1", DOCUMENT_KIND_CFO_REPORT)["file_path"].endswith("cfo_underwriting_1.md")
+        indexes = {row["name"] for row in store._conn.execute("PRAGMA index_list(documents)")}
+        assert {"idx_documents_deal_kind", "idx_documents_hash"} <= indexes
+    finally:
+        store.close()
+    # Reopening a migrated database is a no-op.
+    DataStore(database).close()
+
+
+def test_catalog_names_uploads_around_unknown_files(runtime_no_llm):
+    staging = runtime_no_llm.config.staging_inbox_dir
+
+    def upload(name: str, text: str, address: str = "7 Cedar St, Vancouver, WA 98660") -> dict:
+        staged = staging / name
+        staged.write_text(text, encoding="utf-8")
+        return runtime_no_llm.manager.handle_user_message(
+            message=f"Intel for {address}", uploaded_paths=[staged], cfo_payload=None, run_scout=False
+        )
+
+    deal_id = upload("notes[1].txt", "First walkthrough.")["deal_id"]
+    upload("notes[1].txt", "Second walkthrough.")
+    upload("notes[1].txt", "Third walkthrough.")
+    names = sorted(
+        Path(row["file_path"]).name for row in runtime_no_llm.store.list_documents(deal_id) if row["kind"] == "upload"
+    )
+    assert names == ["notes[1].txt", "notes[1]_1.txt", "notes[1]_2.txt"]
+    docs = {Path(row["file_path"]).name: row for row in runtime_no_llm.store.list_documents(deal_id)}
+    assert docs["notes[1]_1.txt"]["size_bytes"] == len("Second walkthrough.")
+    assert len(docs["notes[1]_1.txt"]["content_hash"]) == 64
+
+    # A file the catalog does not know about is left alone; the upload takes the next free name.
+    deal = runtime_no_llm.store.get_deal(deal_id)
+    stray = runtime_no_llm.config.root_dir / f"{deal_id}_{deal['slug']}" / "04_Intel_Docs" / "stray.txt"
+    stray.write_text("hand-copied", encoding="utf-8")
+    upload("stray.txt", "Filed through the app.")
+    assert stray.read_text(encoding="utf-8") == "hand-copied"
+    assert stray.with_name("stray_1.txt").read_text(encoding="utf-8") == "Filed through the app."
+    assert not (staging / "stray.txt").exists()
+
+
+def test_same_stem_uploads_keep_separate_summaries(runtime_no_llm):
+    staging = runtime_no_llm.config.staging_inbox_dir
+    first, second = staging / "report.txt", staging / "report.md"
+    first.write_text("Plain-text inspection.", encoding="utf-8")
+    second.write_text("Markdown appraisal.", encoding="utf-8")
+    result = runtime_no_llm.manager.handle_user_message(
+        message="Intel for 3 Ash St, Vancouver, WA 98660",
+        uploaded_paths=[first, second],
+        cfo_payload=None,
+        run_scout=False,
+    )
+
+    summaries = {
+        Path(row["file_path"]).name: Path(row["file_path"])
+        for row in runtime_no_llm.store.list_documents(result["deal_id"])
+        if row["kind"] == "summary"
+    }
+    assert sorted(summaries) == ["report.md_summary.md", "report.txt_summary.md"]
+    assert "Plain-text inspection" in summaries["report.txt_summary.md"].read_text(encoding="utf-8")
+    assert "Markdown appraisal" in summaries["report.md_summary.md"].read_text(encoding="utf-8")
+    with pytest.raises(sqlite3.IntegrityError):
+        runtime_no_llm.store.insert_document(
+            result["deal_id"], "06_AI_Deliverables", summaries["report.md_summary.md"], summary=None
+        )
+
+
+def test_catalogued_jacket_skips_directory_creation(runtime_no_llm, monkeypatch):
+    store = runtime_no_llm.store
+    store.create_deal("deal-9", "9 Fir St, Vancouver, WA", "9-fir-st", jurisdiction_warning=False)
+    root = ensure_deal_jacket(runtime_no_llm.config, "deal-9", "9-fir-st", store)
+    assert (root / "06_AI_Deliverables").is_dir()
+    assert store.latest_document("deal-9", DOCUMENT_KIND_JACKET)["file_path"] == str(root)
+    assert store.list_documents("deal-9") == []
+
+    def fail(*args, **kwargs):
+        raise AssertionError("mkdir on a catalogued jacket")
+
+    monkeypatch.setattr(Path, "mkdir", fail)
+    assert ensure_deal_jacket(runtime_no_llm.config, "deal-9", "9-fir-st", store) == root
+    with pytest.raises(AssertionError):
+        ensure_deal_jacket(runtime_no_llm.config, "deal-9", "9-fir-st")
+    monkeypatch.undo()
+
+    # A jacket removed by hand is recreated even though the catalog still lists it.
+    shutil.rmtree(root)
+    assert ensure_deal_jacket(runtime_no_llm.config, "deal-9", "9-fir-st", store) == root
+    assert (root / "04_Intel_Docs").is_dir()
+
+
+def test_uncatalogued_scout_report_is_found_and_catalogued(runtime_no_llm):
+    address = "4 Elm Ct, Vancouver, WA 98660"
+    result = runtime_no_llm.manager.handle_user_message(
+        message=f"New lead at {address}", uploaded_paths=[], cfo_payload=None, run_scout=False
+    )
+    deal_id = result["deal_id"]
+    deal = runtime_no_llm.store.get_deal(deal_id)
+    docs_dir = runtime_no_llm.config.root_dir / f"{deal_id}_{deal['slug']}" / "04_Intel_Docs"
+    # Reports a Scout wrote before it catalogued them.
+    for stamp in ("20250101_090000", "20250301_090000"):
+        (docs_dir / f"market_context_{stamp}.md").write_text(f"# Market Context Report {stamp}", encoding="utf-8")
+
+    runtime_no_llm.manager.handle_user_message(
+        message=f"Any update on {address}", uploaded_paths=[], cfo_payload=None, run_scout=False
+    )
+
+    newest = docs_dir / "market_context_20250301_090000.md"
+    assert f"- Market Context: `{newest}`" in runtime_no_llm.config.firm_inbox_path.read_text(encoding="utf-8")
+    assert runtime_no_llm.store.latest_document(deal_id, "market_report")["file_path"] == str(newest)
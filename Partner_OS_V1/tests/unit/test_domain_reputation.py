@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import time
+
+from partner_os.models import ScoutClaim
+from partner_os.services.reputation import DomainReputationIndex
+from partner_os.services.search import score_claims
+
+
+def test_file_rules_with_path_overrides_and_label_boundaries(tmp_path):
+    source = tmp_path / "domains.txt"
+    source.write_text(
+        "\n".join(
+            [
+                "# vetted sources",
+                "clark.wa.gov 90",
+                "clark.wa.gov/assessor 95 High",
+                "clark.wa.gov/blog 50",
+                "lender.example 75",
+                "spam.example 0",
+            ]
+        ),
+        encoding="utf-8",
+    )
+    index = DomainReputationIndex.from_defaults().load_file(source)
+
+    assert index.lookup("https://www.clark.wa.gov/assessor/parcel/1") == ("High", 95)
+    assert index.lookup("https://gis.clark.wa.gov/blog") == ("Low", 50)
+    assert index.lookup("https://clark.wa.gov/assessors") == ("High", 90)
+    assert index.lookup("https://notclark.wa.gov/") == ("Low", 40)
+    assert index.lookup("https://lender.example/rates") == ("Medium", 75)
+    assert index.lookup("https://cdn.spam.example/x") == ("Blocked", 0)
+    assert index.lookup("https://fred.stlouisfed.org/series/DGS10") == ("High", 90)
+
+
+def test_bulk_scoring_over_large_index():
+    index = DomainReputationIndex()
+    for idx in range(20_000):
+        index.add(f"county{idx}.wa.gov", 85)
+    claims = [
+        ScoutClaim(f"t{idx}", f"https://www.county{idx}.wa.gov/p", "s", "ts", "", 0)
+        for idx in range(0, 20_000, 4)
+    ]
+
+    start = time.perf_counter()
+    scored = score_claims(claims, index=index)
+    elapsed = time.perf_counter() - start
+
+    assert all(claim.confidence_label == "High" and claim.confidence_score == 85 for claim in scored)
+    assert elapsed < 0.5
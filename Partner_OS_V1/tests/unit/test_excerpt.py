@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import tracemalloc
+from pathlib import Path
+
+from partner_os.services.excerpt import read_excerpt
+from partner_os.services.extract import extract_text
+
+
+def test_cut_never_splits_a_multibyte_character(tmp_path: Path):
+    path = tmp_path / "notes.txt"
+    path.write_text("é" * 10 + "€" * 10, encoding="utf-8")
+    for head in range(1, 21):
+        text, truncated = read_excerpt(path, head_chars=head)
+        assert "�" not in text
+        assert text == ("é" * 10 + "€" * 10)[:head]
+        assert truncated == (head < 20)
+
+    text, truncated = read_excerpt(path, head_chars=2, tail_chars=3, mmap_threshold=0)
+    assert text == "éé\n...\n€€€"
+    assert truncated
+
+
+def test_structured_tail_starts_on_a_row_and_memory_is_bounded(tmp_path: Path):
+    path = tmp_path / "export.csv"
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write("address,price,sqft\n")
+        for idx in range(200_000):
+            handle.write(f"{idx} Main St,{300000 + idx},1200\n")
+    assert path.stat().st_size > 4_000_000
+
+    tracemalloc.start()
+    text, truncated = read_excerpt(path, head_chars=200, tail_chars=120)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert truncated
+    assert peak < 64 * 1024
+    head, tail = text.split("\n...\n")
+    assert head.startswith("address,price,sqft\n0 Main St")
+    assert tail.split("\n")[0].split(",")[0].endswith("Main St")
+    assert tail.rstrip().endswith("199999 Main St,499999,1200")
+
+    summary_input, truncated = extract_text(path, max_chars=400)
+    assert truncated and "199999 Main St" in summary_input
+
+
+def test_small_file_is_returned_whole(tmp_path: Path):
+    path = tmp_path / "inbox.md"
+    path.write_text("# Inbox\n- item\n", encoding="utf-8")
+    assert read_excerpt(path, head_chars=0, tail_chars=1000) == ("# Inbox\n- item\n", False)
+    assert read_excerpt(path, head_chars=1000) == ("# Inbox\n- item\n", False)
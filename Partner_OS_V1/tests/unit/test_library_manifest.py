@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import os
+from dataclasses import replace
+
+import pytest
+
+from partner_os.services.llm import SummaryResult
+
+
+class CountingLLM:
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+
+    def summarize_many(self, texts, deal_id=None, max_concurrency=None):
+        self.texts.extend(texts)
+        return [SummaryResult(index=idx, summary=f"abstract: {text[:20]}") for idx, text in enumerate(texts)]
+
+
+def _library(runtime):
+    return {row["file_path"]: row for row in runtime.store.search_library("", limit=100)}
+
+
+def test_reindex_reads_only_new_or_changed_files(runtime_no_llm):
+    llm = CountingLLM()
+    runtime_no_llm.librarian.llm_client = llm
+    library = runtime_no_llm.config.firm_library_dir
+    (library / "cap_rates.md").write_text("Cap rate doctrine.", encoding="utf-8")
+    (library / "sub").mkdir()
+    (library / "sub" / "brrrr.txt").write_text("BRRRR doctrine.", encoding="utf-8")
+    (library / "photo.jpg").write_bytes(b"\xff\xd8")
+
+    first = runtime_no_llm.librarian.index_firm_library()
+    assert first.details["indexed"] == 2
+    assert len(llm.texts) == 2
+
+    second = runtime_no_llm.librarian.index_firm_library()
+    assert second.details == {"indexed": 0, "renamed": 0, "removed": 0, "unchanged": 2}
+    assert len(llm.texts) == 2
+
+    changed = library / "cap_rates.md"
+    changed.write_text("Cap rate doctrine, revised for 2026.", encoding="utf-8")
+    stat = changed.stat()
+    os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    third = runtime_no_llm.librarian.index_firm_library()
+    assert third.details["indexed"] == 1
+    assert llm.texts[-1].startswith("Cap rate doctrine, revised")
+    assert len(_library(runtime_no_llm)) == 2
+
+
+def test_rename_keeps_abstract_and_delete_purges(runtime_no_llm):
+    llm = CountingLLM()
+    runtime_no_llm.librarian.llm_client = llm
+    library = runtime_no_llm.config.firm_library_dir
+    original = library / "seller_finance.md"
+    original.write_text("Seller finance doctrine.", encoding="utf-8")
+    (library / "old.txt").write_text("Obsolete guidance.", encoding="utf-8")
+    runtime_no_llm.librarian.index_firm_library()
+    ref_id = _library(runtime_no_llm)[str(original)]["ref_id"]
+
+    renamed = library / "archive" / "seller_finance_v1.md"
+    renamed.parent.mkdir()
+    original.rename(renamed)
+    (library / "old.txt").unlink()
+    (library / "fresh.md").write_text("New doctrine.", encoding="utf-8")
+
+    result = runtime_no_llm.librarian.index_firm_library()
+    assert result.details == {"indexed": 1, "renamed": 1, "removed": 1, "unchanged": 0}
+    assert len(llm.texts) == 3
+
+    rows = _library(runtime_no_llm)
+    assert set(rows) == {str(renamed), str(library / "fresh.md")}
+    assert rows[str(renamed)]["ref_id"] == ref_id
+    assert rows[str(renamed)]["title"] == "seller_finance_v1"
+    assert set(runtime_no_llm.store.list_library_manifest()) == set(rows)
+
+    # A new file at the vacated path must not reuse the renamed file's ref_id.
+    original.write_text("Different seller finance notes.", encoding="utf-8")
+    runtime_no_llm.librarian.index_firm_library()
+    rows = _library(runtime_no_llm)
+    assert len(rows) == 3
+    assert rows[str(original)]["ref_id"] != ref_id
+
+
+def test_pipeline_reports_progress_and_resumes_after_interruption(runtime_no_llm):
+    runtime_no_llm.librarian.config = replace(runtime_no_llm.config, library_index_batch_size=2)
+    library = runtime_no_llm.config.firm_library_dir
+    for idx in range(5):
+        (library / f"doc{idx}.md").write_text(f"Doctrine number {idx}.", encoding="utf-8")
+
+    class FailingLLM(CountingLLM):
+        def summarize_many(self, texts, deal_id=None, max_concurrency=None):
+            if len(self.texts) >= 2:
+                raise RuntimeError("interrupted")
+            return CountingLLM.summarize_many(self, texts)
+
+    runtime_no_llm.librarian.llm_client = FailingLLM()
+    with pytest.raises(RuntimeError):
+        runtime_no_llm.librarian.index_firm_library()
+    assert len(runtime_no_llm.store.list_library_manifest()) == 2
+
+    llm = CountingLLM()
+    runtime_no_llm.librarian.llm_client = llm
+    updates = []
+    result = runtime_no_llm.librarian.index_firm_library(
+        progress=lambda update: updates.append((update.stage, update.done, update.total))
+    )
+    assert result.details["indexed"] == 3
+    assert result.details["unchanged"] == 2
+    assert len(llm.texts) == 3
+    assert updates == [("scanning", 0, 0), ("indexing", 0, 3), ("indexing", 2, 3), ("indexing", 3, 3)]
+    assert len(_library(runtime_no_llm)) == 5
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import gc
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from partner_os.services import llm
+
+
+def test_summarize_many_preserves_order_and_isolates_failures(gemini_client, fake_gemini_response, monkeypatch):
+    client, store = gemini_client()
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_post(url, headers, params, json, timeout):  # noqa: A002, ARG001
+        nonlocal in_flight, peak
+        text = json["contents"][0]["parts"][0]["text"]
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        if text.endswith("doc-2"):
+            return fake_gemini_response("", status=500)
+        return fake_gemini_response(f"summary of {text.rsplit(chr(10), 1)[-1]}")
+
+    monkeypatch.setattr(llm.requests, "post", fake_post)
+
+    texts = [f"doc-{idx}" for idx in range(6)]
+    results = client.summarize_many(texts, max_concurrency=3)
+
+    assert [result.index for result in results] == list(range(6))
+    assert not results[2].ok
+    assert all(result.ok for idx, result in enumerate(results) if idx != 2)
+    assert results[4].summary == "summary of doc-4"
+    assert 1 < peak <= 3
+
+    calls = store.list_api_calls(limit=20)
+    assert len(calls) == len(texts)
+    assert sum(call["status"] == "failed" for call in calls) == 1
+
+
+def test_worker_writes_during_a_task_transaction_survive_its_rollback(gemini_client, fake_gemini_response, monkeypatch):
+    client, store = gemini_client()
+    monkeypatch.setattr(llm.requests, "post", lambda *args, **kwargs: fake_gemini_response("ok"))
+
+    try:
+        with store.transaction():
+            store.insert_chat_message(role="user", content="rolled back")
+            results = client.summarize_many(["doc-0", "doc-1", "doc-2"], max_concurrency=3)
+            assert all(result.ok for result in results)
+            raise RuntimeError("task failed")
+    except RuntimeError:
+        pass
+
+    assert store.list_chat_messages() == []
+    assert len(store.list_api_calls(limit=20)) == 3
+
+
+def test_worker_thread_connections_close_when_the_thread_exits(gemini_client):
+    _, store = gemini_client()
+    seen = []
+
+    def work() -> None:
+        seen.append(store._conn)
+        store.insert_api_call(
+            provider="google", model="m", endpoint="e", request_type="summary", status="success", latency_ms=1,
+            deal_id=None,
+        )
+
+    for _ in range(3):
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+    gc.collect()
+
+    assert len(store._connections) == 1  # only the test thread's connection is left
+    for conn in seen:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    assert len(store.list_api_calls(limit=10)) == 3
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+import pytest
+
+from partner_os.config import parse_model_routes
+from partner_os.services import llm
+
+
+def test_parse_model_routes():
+    assert parse_model_routes("summary=lite, chat = pro,broken,=x") == {"summary": "lite", "chat": "pro"}
+
+
+def test_request_type_routing_and_timeout_fallback(gemini_client, fake_gemini_response, monkeypatch):
+    client, store = gemini_client(
+        gemini_model_routes={"summary": "lite-model", "chat": "pro-model"},
+        gemini_fallback_model="backup-model",
+    )
+
+    def fake_post(url, headers, params, json, timeout):  # noqa: A002, ARG001
+        if "pro-model" in url:
+            raise llm.requests.Timeout("read timed out")
+        return fake_gemini_response(url.split("/models/")[1].split(":")[0])
+
+    monkeypatch.setattr(llm.requests, "post", fake_post)
+
+    assert client.summarize_text("doc", deal_id=None) == "lite-model"
+    assert client.chat_reply([{"role": "user", "content": "hi"}], deal_id=None) == "backup-model"
+
+    calls = {(row["model"], row["status"]): json.loads(row["details_json"]) for row in store.list_api_calls()}
+    assert calls[("lite-model", "success")]["route"] == "primary"
+    assert calls[("pro-model", "failed")]["route"] == "primary"
+    assert calls[("backup-model", "success")] == {"fallback_from": "pro-model", "response_id": "", "route": "fallback"}
+
+
+@pytest.mark.parametrize("requests_per_minute", [0, 60])
+def test_hedged_request_returns_first_answer(gemini_client, fake_gemini_response, monkeypatch, requests_per_minute):
+    # At 60 rpm a paced hedge would wait a full second behind the primary's slot.
+    client, store = gemini_client(
+        gemini_hedge_request_types=frozenset({"chat"}),
+        gemini_hedge_min_delay_ms=50,
+        gemini_requests_per_minute=requests_per_minute,
+    )
+    for _ in range(20):
+        store.insert_api_call(
+            provider="google",
+            model=client.config.gemini_model,
+            endpoint=client.endpoint,
+            request_type="chat",
+            status="success",
+            latency_ms=60,
+            deal_id=None,
+        )
+
+    attempts = 0
+    lock = threading.Lock()
+
+    def fake_post(url, headers, params, json, timeout):  # noqa: A002, ARG001
+        nonlocal attempts
+        with lock:
+            attempts += 1
+            attempt = attempts
+        if attempt == 1:
+            time.sleep(0.6)
+            return fake_gemini_response("slow")
+        return fake_gemini_response("fast")
+
+    monkeypatch.setattr(llm.requests, "post", fake_post)
+
+    start = time.perf_counter()
+    reply = client.chat_reply([{"role": "user", "content": "hi"}], deal_id=None)
+    elapsed = time.perf_counter() - start
+
+    assert reply == "fast"
+    assert elapsed < 0.5
+    time.sleep(0.7)
+
+    hedged = [json.loads(row["details_json"]) for row in store.list_api_calls(limit=50) if "hedged" in row["details_json"]]
+    assert {item["route"]: item["won"] for item in hedged} == {"primary_hedge": True, "primary": False}
+    assert all(item["hedge_delay_ms"] == 60 for item in hedged)
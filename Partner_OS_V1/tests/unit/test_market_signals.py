@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from partner_os.config import load_config
+from partner_os.db.store import DataStore
+from partner_os.models import MarketSignal, ScoutClaim
+from partner_os.services.signals import (
+    extract_signals,
+    geography_for_address,
+    history_conflicts,
+    history_stats,
+)
+
+
+def _claim(summary: str, url: str = "https://www.costar.com/a") -> ScoutClaim:
+    return ScoutClaim("t", url, summary, datetime.now(timezone.utc).isoformat(), "Medium", 70)
+
+
+def test_extract_signals_by_metric_and_geography():
+    claims = [
+        _claim("Clark County cap rate now 5.4% for multifamily; rents near $1,850/month."),
+        _claim("SOFR at 5.31% while the 10-year treasury yield is 4.2%.", "https://fred.stlouisfed.org/x"),
+        _claim("Cap rate 45% is a typo and should be ignored."),
+    ]
+
+    signals = extract_signals(claims, geography_for_address("123 Main St, Vancouver, WA 98660"))
+    found = {(signal.geography, signal.metric, signal.value) for signal in signals}
+
+    assert found == {
+        ("vancouver-wa", "cap_rate", 5.4),
+        ("vancouver-wa", "rent_monthly", 1850.0),
+        ("us", "sofr", 5.31),
+        ("us", "treasury_10y", 4.2),
+    }
+    assert signals[0].source_domain == "costar.com"
+
+
+def test_history_conflict_against_cross_deal_median(tmp_path):
+    store = DataStore(load_config(root_override=tmp_path).database_path)
+    now = datetime.now(timezone.utc)
+    history = [
+        MarketSignal("vancouver-wa", "cap_rate", value, f"https://src{idx}.example/", "src.example", 70,
+                     (now - timedelta(days=idx)).isoformat())
+        for idx, value in enumerate([5.0, 5.1, 5.2, 5.0, 5.3, 5.1, 4.9, 5.2])
+    ]
+    store.insert_market_signals(history, deal_id=None)
+    store.insert_market_signals(history, deal_id=None)
+
+    stats = history_stats(store, "vancouver-wa", "cap_rate")
+    assert stats is not None and stats.count == 8
+    assert abs(stats.median - 5.1) < 1e-9
+
+    fresh = [MarketSignal("vancouver-wa", "cap_rate", 6.4, "https://new.example/", "new.example", 40, now.isoformat())]
+    notes = history_conflicts(store, fresh)
+    assert len(notes) == 1 and "6.40%" in notes[0] and "n=8" in notes[0]
+
+    in_band = [MarketSignal("vancouver-wa", "cap_rate", 5.15, "https://new.example/", "new.example", 40, now.isoformat())]
+    assert history_conflicts(store, in_band) == []
+
+    store.close()
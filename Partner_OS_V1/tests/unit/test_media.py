@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import struct
+import wave
+from pathlib import Path
+
+from partner_os.services.media import MediaProcessor, probe_media
+
+THUMBNAIL = b"\xff\xd8\xff\xdbthumbnail-bytes\xff\xd9"
+
+
+def _ascii(tag: int, text: str) -> tuple[int, int, int, bytes]:
+    raw = text.encode("latin-1") + b"\x00"
+    return tag, 2, len(raw), raw
+
+
+def _long(tag: int, value: int) -> tuple[int, int, int, bytes]:
+    return tag, 4, 1, struct.pack("<I", value)
+
+
+def _rationals(tag: int, *pairs: tuple[int, int]) -> tuple[int, int, int, bytes]:
+    return tag, 5, len(pairs), b"".join(struct.pack("<II", num, den) for num, den in pairs)
+
+
+def _ifd(entries: list[tuple[int, int, int, bytes]], offset: int, next_offset: int = 0) -> bytes:
+    """Little-endian IFD at `offset`, with values over four bytes stored right after it."""
+    data_start = offset + 2 + 12 * len(entries) + 4
+    body, extra = struct.pack("<H", len(entries)), b""
+    for tag, kind, count, raw in entries:
+        if len(raw) <= 4:
+            body += struct.pack("<HHI", tag, kind, count) + raw.ljust(4, b"\x00")
+        else:
+            body += struct.pack("<HHII", tag, kind, count, data_start + len(extra))
+            extra += raw
+    return body + struct.pack("<I", next_offset) + extra
+
+
+def write_jpeg(path: Path) -> None:
+    exif_entries = [_ascii(0x9003, "2026:03:14 09:26:53"), _long(0xA002, 4000), _long(0xA003, 3000)]
+    gps_entries = [
+        _ascii(1, "N"),
+        _rationals(2, (45, 1), (38, 1), (2430, 100)),
+        _ascii(3, "W"),
+        _rationals(4, (122, 1), (39, 1), (3600, 100)),
+    ]
+    camera = [_ascii(0x010F, "Canon"), _ascii(0x0110, "EOS R6"), (0x0112, 3, 1, b"\x06\x00")]
+    # Value sizes do not depend on the offsets, so lay out with zeros first.
+    exif_at = 8 + len(_ifd(camera + [_long(0x8769, 0), _long(0x8825, 0)], 8))
+    gps_at = exif_at + len(_ifd(exif_entries, exif_at))
+    ifd1_at = gps_at + len(_ifd(gps_entries, gps_at))
+    thumb_at = ifd1_at + len(_ifd([_long(0x0201, 0), _long(0x0202, 0)], ifd1_at))
+    ifd0 = camera + [_long(0x8769, exif_at), _long(0x8825, gps_at)]
+    tiff = (
+        b"II*\x00" + struct.pack("<I", 8)
+        + _ifd(ifd0, 8, next_offset=ifd1_at)
+        + _ifd(exif_entries, exif_at)
+        + _ifd(gps_entries, gps_at)
+        + _ifd([_long(0x0201, thumb_at), _long(0x0202, len(THUMBNAIL))], ifd1_at)
+        + THUMBNAIL
+    )
+    app1 = b"Exif\x00\x00" + tiff
+    sof0 = b"\x08" + struct.pack(">HH", 3000, 4000) + b"\x03" + b"\x01\x22\x00\x02\x11\x01\x03\x11\x01"
+    path.write_bytes(
+        b"\xff\xd8"
+        + b"\xff\xe1" + struct.pack(">H", len(app1) + 2) + app1
+        + b"\xff\xc0" + struct.pack(">H", len(sof0) + 2) + sof0
+        + b"\xff\xda\x00\x02" + b"\x00" * 64 + b"\xff\xd9"
+    )
+
+
+def _box(kind: bytes, body: bytes) -> bytes:
+    return struct.pack(">I", len(body) + 8) + kind + body
+
+
+def write_mp4(path: Path) -> None:
+    # mvhd v0: created 2024-01-01 (seconds since 1904), timescale 1000, 95.5 s.
+    mvhd = b"\x00" * 4 + struct.pack(">IIII", 3786912000, 0, 1000, 95500) + b"\x00" * 80
+    tkhd = b"\x00" * 76 + struct.pack(">II", 1920 << 16, 1080 << 16)
+    moov = _box(b"moov", _box(b"mvhd", mvhd) + _box(b"trak", _box(b"tkhd", tkhd)))
+    path.write_bytes(_box(b"ftyp", b"isom\x00\x00\x02\x00") + _box(b"mdat", b"\x00" * 4096) + moov)
+
+
+def test_jpeg_exif_gps_capture_time_and_embedded_thumbnail(tmp_path: Path):
+    photo = tmp_path / "front.jpg"
+    write_jpeg(photo)
+    info = probe_media(photo, tmp_path / "thumbs" / "front.jpg")
+
+    assert info.kind == "photo"
+    assert (info.width, info.height) == (3000, 4000)  # orientation 6 is portrait
+    assert info.captured_at == "2026-03-14T09:26:53"
+    assert round(info.latitude, 4) == 45.6401
+    assert round(info.longitude, 4) == -122.6600
+    assert info.camera == "Canon EOS R6"
+    assert Path(info.thumbnail_path).read_bytes() == THUMBNAIL
+
+
+def test_video_and_audio_headers(tmp_path: Path):
+    video = tmp_path / "walkthrough.mp4"
+    write_mp4(video)
+    info = probe_media(video, tmp_path / "unused.jpg")
+    assert (info.kind, info.width, info.height) == ("video", 1920, 1080)
+    assert info.duration_seconds == 95.5
+    assert info.captured_at == "2024-01-01T00:00:00"
+    assert info.thumbnail_path is None
+
+    memo = tmp_path / "seller.wav"
+    with wave.open(str(memo), "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(8000)
+        handle.writeframes(b"\x00\x00" * 8000 * 3)
+    assert probe_media(memo, tmp_path / "unused.jpg").duration_seconds == 3.0
+
+    # 128 kbps MPEG-1 Layer III: 417-byte frames, 40 of them at 16000 bytes/s.
+    mp3 = tmp_path / "call.mp3"
+    mp3.write_bytes((b"\xff\xfb\x90\x64" + b"\x00" * 413) * 40)
+    assert probe_media(mp3, tmp_path / "unused.jpg").duration_seconds == round(417 * 40 / 16000, 3)
+
+    png = tmp_path / "plan.png"
+    png.write_bytes(b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">II", 640, 480))
+    plan = probe_media(png, tmp_path / "plan-thumb.jpg")
+    assert (plan.kind, plan.width, plan.height) == ("photo", 640, 480)
+
+
+def test_truncated_headers_keep_what_was_parsed(tmp_path: Path):
+    video = tmp_path / "cut.mp4"
+    video.write_bytes(_box(b"moov", _box(b"mvhd", b"") + _box(b"trak", _box(b"tkhd", b"\x00" * 10))))
+    assert probe_media(video, tmp_path / "unused.jpg").duration_seconds is None
+
+    # An MPEG-1 frame header whose Xing tag is cut off right after the magic.
+    mp3 = tmp_path / "cut.mp3"
+    mp3.write_bytes(b"\xff\xfb\x90\x64" + b"\x00" * 32 + b"Xing")
+    info = probe_media(mp3, tmp_path / "unused.jpg")
+    assert info.kind == "audio"
+    assert info.duration_seconds == round(len(mp3.read_bytes()) * 8 / 128000, 3)
+
+    stub = tmp_path / "stub.mp4"
+    stub.write_bytes(_box(b"mvhd", b"\x01" + b"\x00" * 12))
+    assert probe_media(stub, tmp_path / "unused.jpg").duration_seconds is None
+
+
+def test_processor_caches_by_hash_and_skips_documents(tmp_path: Path, runtime_no_llm):
+    photo = tmp_path / "front.jpg"
+    write_jpeg(photo)
+    notes = tmp_path / "notes.txt"
+    notes.write_text("not media", encoding="utf-8")
+    processor = MediaProcessor(runtime_no_llm.store, tmp_path / "thumbs", max_workers=1)
+    try:
+        first = processor.process_many([photo, notes], ["a" * 64, "b" * 64])
+        photo.unlink()
+        again = processor.process_many([tmp_path / "copy.jpg"], ["a" * 64])
+    finally:
+        processor.close()
+
+    assert first[1] is None
+    assert again[0] == first[0]
+    assert first[0].thumbnail_path == str(tmp_path / "thumbs" / "aa" / f"{'a' * 64}.jpg")
+
+
+def test_triaged_photo_is_described_and_browsable(runtime_no_llm):
+    staged = runtime_no_llm.config.staging_inbox_dir / "front.jpg"
+    write_jpeg(staged)
+    result = runtime_no_llm.manager.handle_user_message(
+        message="New lead at 9 Birch St, Vancouver, WA 98660",
+        uploaded_paths=[staged],
+        cfo_payload=None,
+        run_scout=False,
+    )
+
+    deal_id = result["deal_id"]
+    media = runtime_no_llm.store.list_deal_media(deal_id)
+    assert [Path(row["file_path"]).name for row in media] == ["front.jpg"]
+    assert Path(media[0]["thumbnail_path"]).exists()
+    deal = runtime_no_llm.store.get_deal(deal_id)
+    deal_root = runtime_no_llm.config.root_dir / f"{deal_id}_{deal['slug']}"
+    summary = (deal_root / "06_AI_Deliverables" / "front.jpg_summary.md").read_text(encoding="utf-8")
+    assert "GPS 45.64008, -122.66000" in summary
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from partner_os.services.pages import MainTextExtractor, PageFetcher
+
+PAGE = (
+    "<html><head><style>body{}</style><script>var cap = '9.9%';</script></head><body>"
+    "<nav>Home | About</nav><article><h1>Clark County Multifamily</h1>"
+    "<p>Average cap rate held at 5.8% this quarter.</p></article><footer>Copyright</footer></body></html>"
+)
+
+
+class _PageServer:
+    def __init__(self) -> None:
+        self.requests: list[dict[str, str]] = []
+        self.active = 0
+        self.peak = 0
+        lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                with lock:
+                    server.requests.append(dict(self.headers))
+                    server.active += 1
+                    server.peak = max(server.peak, server.active)
+                time.sleep(0.05)
+                with lock:
+                    server.active -= 1
+                if self.headers.get("If-None-Match") == '"v1"':
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                is_pdf = self.path.endswith(".pdf")
+                body = b"%PDF-1.4\n\xe2\xe3\xcf\xd3 binary" if is_pdf else PAGE.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/pdf" if is_pdf else "text/html; charset=utf-8")
+                self.send_header("ETag", '"v1"')
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+
+def test_extractor_keeps_main_text_and_bounds_size() -> None:
+    extractor = MainTextExtractor(max_chars=1000)
+    for offset in range(0, len(PAGE), 7):
+        extractor.feed(PAGE[offset : offset + 7])
+    text = extractor.text()
+
+    assert "cap rate held at 5.8%" in text
+    assert "9.9%" not in text
+    assert "Home" not in text and "Copyright" not in text
+
+    bounded = MainTextExtractor(max_chars=50)
+    bounded.feed("<p>" + "word " * 1000 + "</p>")
+    assert len(bounded.text()) <= 50
+
+
+
+def test_fetcher_revalidates_with_etag_and_limits_per_host(tmp_path: Path) -> None:
+    server = _PageServer()
+    try:
+        fetcher = PageFetcher(cache_dir=tmp_path / "pages", per_host=1, per_host_delay_seconds=0)
+        urls = [f"{server.base_url}/page/{idx}" for idx in range(4)]
+
+        first = fetcher.fetch_many(urls)
+        assert {page.status for page in first.values()} == {"fetched"}
+        assert all("5.8%" in page.text for page in first.values())
+        assert server.peak == 1
+        assert len(list((tmp_path / "pages").rglob("*.html.gz"))) == 4
+
+        second = fetcher.fetch_many(urls)
+        assert {page.status for page in second.values()} == {"revalidated"}
+        assert all("5.8%" in page.text for page in second.values())
+        assert all(headers.get("If-None-Match") == '"v1"' for headers in server.requests[4:])
+    finally:
+        server.close()
+
+
+
+def test_fetcher_skips_non_text_bodies(tmp_path: Path) -> None:
+    server = _PageServer()
+    try:
+        fetcher = PageFetcher(cache_dir=tmp_path / "pages", per_host_delay_seconds=0)
+        page = fetcher.fetch(f"{server.base_url}/reports/market.pdf")
+        assert page.status == "skipped"
+        assert page.text == ""
+        assert "application/pdf" in (page.error or "")
+        assert not list((tmp_path / "pages").rglob("*.html.gz"))
+    finally:
+        server.close()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+
+from partner_os.services.parcels import GEOCODE_URL, PARCEL_URL, ParcelClient, point_in_rings
+
+
+def _square(x: float, y: float, size: float = 10.0) -> list[list[list[float]]]:
+    return [[[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]]
+
+
+class FakeResponse:
+    def __init__(self, payload: dict):
+        self._payload = payload
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> dict:
+        return self._payload
+
+
+class FakeSession:
+    LOCATIONS = {"1 Main St": (5.0, 5.0), "2 Main St": (25.0, 5.0)}
+
+    def __init__(self) -> None:
+        self.gets: list[dict] = []
+        self.posts: list[dict] = []
+
+    def get(self, url, params=None, timeout=10):
+        assert url == GEOCODE_URL
+        self.gets.append(params)
+        location = self.LOCATIONS.get(params["SingleLine"])
+        if location is None:
+            return FakeResponse({"candidates": []})
+        return FakeResponse(
+            {
+                "spatialReference": {"wkid": 2927},
+                "candidates": [{"address": params["SingleLine"].upper(), "score": 98, "location": {"x": location[0], "y": location[1]}}],
+            }
+        )
+
+    def post(self, url, data=None, timeout=10):
+        assert url == PARCEL_URL
+        self.posts.append(data)
+        features = [
+            {
+                "attributes": {"Prop_id": 111, "SitusAddrsFull": "1 MAIN ST", "Zone1": "R1-6", "MktLandVal": 100000, "MktBldgVal": 150000},
+                "geometry": {"rings": _square(0, 0)},
+            },
+            {
+                "attributes": {"Prop_id": 222, "SitusAddrsFull": "2 MAIN ST", "Zone1": "CX", "MktLandVal": 50000, "MktBldgVal": None},
+                "geometry": {"rings": _square(20, 0)},
+            },
+        ]
+        return FakeResponse({"features": features})
+
+
+def test_point_in_rings_excludes_holes() -> None:
+    rings = _square(0, 0, 10) + _square(4, 4, 2)
+    assert point_in_rings(1, 1, rings)
+    assert not point_in_rings(5, 5, rings)
+    assert not point_in_rings(11, 5, rings)
+
+
+def test_lookup_many_batches_parcel_query_and_matches_points() -> None:
+    session = FakeSession()
+    client = ParcelClient(session=session, max_concurrency=2)
+
+    results = client.lookup_many(["1 Main St", "2 Main St", "9 Nowhere Rd", "1 Main St"])
+
+    assert len(session.gets) == 3
+    assert len(session.posts) == 1
+    geometry = json.loads(session.posts[0]["geometry"])
+    assert session.posts[0]["geometryType"] == "esriGeometryMultipoint"
+    assert geometry["points"] == [[5.0, 5.0], [25.0, 5.0]]
+    assert geometry["spatialReference"] == {"wkid": 2927}
+
+    assert results["1 Main St"].parcel_id == "111"
+    assert results["1 Main St"].assessed_value == 250000
+    assert results["2 Main St"].zoning_code == "CX"
+    assert results["9 Nowhere Rd"] is None
+
+
+def test_parcels_by_ids_uses_in_clause() -> None:
+    session = FakeSession()
+    client = ParcelClient(session=session, batch_size=1)
+
+    records = client.parcels_by_ids(["111", "222"])
+
+    assert [post["where"] for post in session.posts] == ["Prop_id IN (111)", "Prop_id IN (222)"]
+    assert set(records) == {"111", "222"}
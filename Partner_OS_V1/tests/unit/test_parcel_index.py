@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+from partner_os.db.store import DataStore
+from partner_os.models import GeocodeResult
+from partner_os.services.parcel_db import ParcelIndex
+from partner_os.services.parcels import ParcelClient
+
+
+def _feature(pid: int, x: float, y: float, size: float = 0.001, multi: bool = False) -> dict:
+    ring = [[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]
+    geometry = {"type": "MultiPolygon", "coordinates": [[ring]]} if multi else {"type": "Polygon", "coordinates": [ring]}
+    return {
+        "type": "Feature",
+        "properties": {"Prop_id": pid, "SitusAddrsFull": f"{pid} MAIN ST", "Zone1": "R1-6", "MktLandVal": 1000, "MktBldgVal": 2000},
+        "geometry": geometry,
+    }
+
+
+def _grid(n: int) -> list[dict]:
+    return [_feature(row * n + col, -122.7 + col * 0.001, 45.6 + row * 0.001, multi=bool(col % 2)) for row in range(n) for col in range(n)]
+
+
+def test_import_feature_collection_and_geojsonseq(tmp_path: Path) -> None:
+    store = DataStore(tmp_path / "db.sqlite")
+    index = ParcelIndex(store)
+
+    collection = tmp_path / "taxlots.geojson"
+    collection.write_text(json.dumps({"type": "FeatureCollection", "features": _grid(10)}), encoding="utf-8")
+    seq = tmp_path / "taxlots.geojsonl"
+    seq.write_text("\n".join("\x1e" + json.dumps(feature) for feature in _grid(12)[100:]), encoding="utf-8")
+
+    assert index.import_geojson(collection, batch_size=7) == 100
+    assert index.import_geojson(seq) == 44
+    assert store.count_parcels() == 144
+
+    record = index.parcel_at(-122.7 + 3 * 0.001 + 0.0005, 45.6 + 0.0005)
+    assert record is not None and record.parcel_id == "3"
+    assert record.assessed_value == 3000
+    assert index.parcel_at(-100.0, 40.0) is None
+    assert index.get("143").property_address == "143 MAIN ST"
+
+    started = time.perf_counter()
+    for _ in range(200):
+        index.parcel_at(-122.7 + 0.0055, 45.6 + 0.0055)
+    assert (time.perf_counter() - started) / 200 < 0.005
+    store.close()
+
+
+def test_parcel_client_prefers_local_index(tmp_path: Path) -> None:
+    class NoNetwork:
+        def post(self, *args, **kwargs):
+            raise AssertionError("live parcel query should not run")
+
+    store = DataStore(tmp_path / "db.sqlite")
+    path = tmp_path / "taxlots.geojson"
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": _grid(3)}), encoding="utf-8")
+    index = ParcelIndex(store)
+    index.import_geojson(path)
+
+    client = ParcelClient(session=NoNetwork(), local=index)
+    point = GeocodeResult(address="4 Main St", x=-122.7 + 0.0015, y=45.6 + 0.0015, score=99, matched_address="4 MAIN ST")
+
+    assert client.parcels_at([point])["4 Main St"].parcel_id == "4"
+    assert set(client.parcels_by_ids(["1", "2"])) == {"1", "2"}
+    store.close()
@@ -50,3 +50,43 @@ def test_market_conflict_detection(tmp_path):
     assert conflicts
 
     store.close()
+
+
+def test_scan_fans_out_dedups_and_ranks(tmp_path):
+    import threading
+    import time
+
+    from partner_os.agents.scout import MARKET_SUB_QUERIES
+    from partner_os.services.search import canonical_url
+
+    seen: list[str] = []
+    lock = threading.Lock()
+
+    class FanOutSearch(WebSearchClient):
+        def search(self, query: str, limit: int = 6):  # noqa: ARG002
+            with lock:
+                seen.append(query)
+            time.sleep(0.1)
+            if "zoning" in query:
+                raise RuntimeError("upstream 503")
+            return [
+                ScoutClaim("Shared", "https://www.example.com/a/?utm_source=x", f"snippet for {query}", "t", "Low", 40),
+                ScoutClaim("County", "https://clark.wa.gov/data#top", "county data", "t", "High", 90),
+            ]
+
+    config = load_config(root_override=tmp_path)
+    store = DataStore(config.database_path)
+    scout = ScoutAgent(name="Scout", config=config, store=store, search_client=FanOutSearch())
+
+    start = time.perf_counter()
+    claims, failed = scout._scan("123 Main St, Vancouver, WA 98660")
+    elapsed = time.perf_counter() - start
+
+    assert len(seen) == len(MARKET_SUB_QUERIES)
+    assert elapsed < 0.3
+    assert failed == ["zoning"]
+    assert [claim.title for claim in claims] == ["County", "Shared"]
+    assert claims[1].summary.count("snippet for") == len(MARKET_SUB_QUERIES) - 1
+    assert canonical_url("https://duckduckgo.com/l/?uddg=https%3A%2F%2Fwww.example.com%2Fa%2F") == "example.com/a"
+
+    store.close()
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+from partner_os.config import load_config
+from partner_os.db.store import DataStore
+from partner_os.models import ScoutClaim
+from partner_os.runtime import build_runtime
+from partner_os.services.search import WebSearchClient
+from partner_os.services.search_cache import CachedSearchClient, normalize_query
+
+
+class CountingSearch(WebSearchClient):
+    calls: int = 0
+
+    def search(self, query: str, limit: int = 6):
+        CountingSearch.calls += 1
+        return [
+            ScoutClaim(
+                title=f"result {CountingSearch.calls}",
+                url="https://www.clark.wa.gov/a",
+                summary="Cap rate 5.5%",
+                timestamp_utc=datetime.now(timezone.utc).isoformat(),
+                confidence_label="High",
+                confidence_score=90,
+            )
+        ][:limit]
+
+
+def _cache(tmp_path, ttl=60, stale=3600):
+    CountingSearch.calls = 0
+    store = DataStore(load_config(root_override=tmp_path).database_path)
+    return CachedSearchClient(inner=CountingSearch(), store=store, ttl_seconds=ttl, stale_seconds=stale), store
+
+
+def _age_entry(store, seconds):
+    old = (datetime.now(timezone.utc) - timedelta(seconds=seconds)).isoformat()
+    store._conn.execute("UPDATE search_cache SET fetched_at = ?", (old,))
+    store._conn.commit()
+
+
+def test_normalized_queries_share_one_entry(tmp_path):
+    cache, store = _cache(tmp_path)
+
+    first = cache.search("123 Main St,  Vancouver  cap rate", limit=8)
+    second = cache.search("123 main st vancouver CAP RATE", limit=8)
+
+    assert normalize_query("A,  b") == "a b"
+    assert CountingSearch.calls == 1
+    assert first[0].cache_age_seconds is None
+    assert second[0].cache_age_seconds == 0
+    store.close()
+
+
+def test_stale_entry_is_served_then_refreshed_in_background(tmp_path):
+    cache, store = _cache(tmp_path)
+    cache.search("cap rate", limit=8)
+    _age_entry(store, 600)
+
+    stale = cache.search("cap rate", limit=8)
+    cache.wait_for_refreshes(timeout=5)
+
+    assert stale[0].title == "result 1"
+    assert stale[0].cache_age_seconds >= 600
+    assert CountingSearch.calls == 2
+    assert cache.search("cap rate", limit=8)[0].title == "result 2"
+    store.close()
+
+
+def test_expired_entry_is_fetched_synchronously(tmp_path):
+    cache, store = _cache(tmp_path)
+    cache.search("cap rate", limit=8)
+    _age_entry(store, 7200)
+
+    claims = cache.search("cap rate", limit=8)
+
+    assert claims[0].title == "result 2"
+    assert claims[0].cache_age_seconds is None
+    store.close()
+
+
+def test_failed_background_refresh_is_logged_and_awaited_on_close(tmp_path):
+    runtime = build_runtime(root_override=tmp_path, use_llm=False)
+    cache = runtime.scout.search_client
+    cache.inner = CountingSearch()
+    CountingSearch.calls = 0
+    cache.search("cap rate", limit=8)
+    _age_entry(runtime.store, cache.ttl_seconds + 60)
+
+    release = threading.Event()
+
+    class FailingSearch(WebSearchClient):
+        def search(self, query: str, limit: int = 6):
+            release.wait(5)
+            raise RuntimeError("search endpoint returned 503")
+
+    cache.inner = FailingSearch()
+    assert cache.search("cap rate", limit=8)[0].title == "result 1"
+    release.set()
+    runtime.close()
+
+    store = DataStore(runtime.config.database_path)
+    failed = [row for row in store.list_api_calls() if row["request_type"] == "search_refresh"]
+    assert len(failed) == 1
+    assert failed[0]["status"] == "failed"
+    assert "503" in failed[0]["error_message"]
+    store.close()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from urllib.parse import quote
+
+from partner_os.services.search import ResultParser, canonical_url, parse_results
+
+
+def _result(href: str, title: str, snippet: str) -> str:
+    return (
+        '<div class="result results_links web-result">'
+        f'<h2 class="result__title"><a class="result__a" rel="nofollow" href="{href}">{title}</a></h2>'
+        f'<div class="result__extras"><span class="result__url">ignored</span></div>'
+        f'<a class="result__snippet" href="{href}">{snippet}</a>'
+        "</div>"
+    )
+
+
+def test_parse_results_unwraps_redirects_and_strips_markup() -> None:
+    target = "https://www.clark.wa.gov/assessor/report?id=7"
+    html = "<html><body>" + _result(
+        f"//duckduckgo.com/l/?uddg={quote(target, safe='')}&amp;rut=abc",
+        "Clark County <b>Cap</b> Rates",
+        "Average <b>cap rate</b> of 5.8% &amp; rising",
+    ) + "</body></html>"
+
+    [claim] = parse_results(html, limit=6)
+
+    assert claim.url == target
+    assert claim.title == "Clark County Cap Rates"
+    assert claim.summary == "Average cap rate of 5.8% & rising"
+    assert claim.confidence_label == "High"
+    assert canonical_url(claim.url) == "clark.wa.gov/assessor/report?id=7"
+
+
+def test_parser_stops_at_limit_and_tolerates_missing_snippets() -> None:
+    blocks = [_result(f"https://example.com/{idx}", f"Result {idx}", f"Snippet {idx}") for idx in range(50)]
+    blocks.insert(1, '<a class="result__a" href="https://example.com/bare">No snippet</a>')
+    html = "<html><body>" + "".join(blocks) + "</body></html>"
+
+    claims = parse_results(html, limit=3)
+    assert [claim.url for claim in claims] == [
+        "https://example.com/0",
+        "https://example.com/bare",
+        "https://example.com/1",
+    ]
+    assert claims[1].summary == ""
+
+    parser = ResultParser(limit=2)
+    parser.feed(html[: len(html) // 10])
+    assert parser.done
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import multiprocessing
+import random
+from operator import mul
+from pathlib import Path
+
+import pytest
+
+from partner_os.config import load_config
+from partner_os.db.store import DataStore
+from partner_os.services import semantic
+from partner_os.services.semantic import SemanticIndex, embed
+
+WORDS = (
+    "roof foundation lease tenant rent escrow appraisal zoning parking boiler plumbing survey easement "
+    "refinance mortgage covenant vacancy turnover insurance permit variance setback drainage"
+).split()
+
+
+def _index(tmp_path: Path) -> tuple[SemanticIndex, DataStore]:
+    store = DataStore(load_config(root_override=tmp_path).database_path)
+    return SemanticIndex(store, tmp_path / "vectors.f32"), store
+
+
+def test_inflections_match_and_scope_is_respected(tmp_path: Path):
+    index, store = _index(tmp_path)
+    try:
+        index.add("chunk", Path("/lib/debt.md"), ["Refinance when the balloon payment comes due."], deal_id=None)
+        index.add("chunk", Path("/lib/roofs.md"), ["Inspect the roof membrane every spring."], deal_id=None)
+        store.create_deal("deal-1", "1 Main St, Vancouver, WA", "1-main-st", jurisdiction_warning=False)
+        index.add("chunk", Path("/deal/notes.txt"), ["Seller wants refinancing help."], deal_id="deal-1")
+
+        library_only = index.search("refinancing the loan", k=2)
+        assert [hit.source_path for hit in library_only][0] == "/lib/debt.md"
+        assert all(hit.deal_id is None for hit in library_only)
+
+        with_deal = index.search("refinancing the loan", k=3, deal_id="deal-1")
+        assert {hit.source_path for hit in with_deal} == {"/lib/debt.md", "/lib/roofs.md", "/deal/notes.txt"}
+        assert with_deal[0].source_path == "/deal/notes.txt"
+        assert index.search("refinancing", k=3, deal_id="deal-1", include_library=False)[0].deal_id == "deal-1"
+
+        index.remove(["/lib/debt.md"])
+        index.move("/lib/roofs.md", Path("/lib/roofing.md"))
+        assert [hit.source_path for hit in index.search("refinance roof", k=5)] == ["/lib/roofing.md"]
+    finally:
+        index.close()
+        store.close()
+
+
+def test_blocked_scan_agrees_with_exact_cosine_across_appends(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(semantic, "BLOCK_ROWS", 16)
+    rng = random.Random(7)
+    index, store = _index(tmp_path)
+    try:
+        texts = [" ".join(rng.choices(WORDS, k=12)) for _ in range(90)]
+        for start in range(0, len(texts), 25):
+            index.add("chunk", Path(f"/lib/batch-{start}.md"), texts[start : start + 25], deal_id=None)
+        assert index.rows == len(texts)
+        assert (tmp_path / "vectors.i8").stat().st_size == semantic.DIM * 16 * 6
+
+        query = "tenant escrow survey"
+        idf = index._query_idf()
+        weighted = [value * weight for value, weight in zip(embed(query), idf)]
+        exact = sorted(
+            (sum(map(mul, weighted, embed(text))), row) for row, text in enumerate(texts)
+        )[-1][1]
+        top = index.search(query, k=1)[0]
+        assert (top.source_path, top.ordinal) == (f"/lib/batch-{exact // 25 * 25}.md", exact % 25)
+
+        # A fresh instance reads the same files; a torn final row is dropped on open.
+        index.close()
+        with (tmp_path / "vectors.f32").open("ab") as handle:
+            handle.write(b"\x00" * 10)
+        reopened = SemanticIndex(store, tmp_path / "vectors.f32")
+        assert reopened.rows == len(texts)
+        assert reopened.search(query, k=1)[0] == top
+        reopened.close()
+    finally:
+        index.close()
+        store.close()
+
+
+def _append_batches(root: Path, name: str) -> None:
+    index, store = _index(root)
+    try:
+        for batch in range(10):
+            texts = [f"{name} {batch} {word}" for word in WORDS]
+            index.add("chunk", Path(f"/lib/{name}-{batch}.md"), texts, deal_id=None)
+    finally:
+        index.close()
+        store.close()
+
+
+@pytest.mark.skipif(semantic.fcntl is None, reason="flock is POSIX-only")
+def test_concurrent_processes_get_their_own_rows(tmp_path: Path):
+    _index(tmp_path)[1].close()
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_append_batches, args=(tmp_path, name)) for name in ("alpha", "beta")]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+
+    index, store = _index(tmp_path)
+    try:
+        rows = store.get_vector_rows(list(range(index.rows)), None, include_library=True)
+        assert len(rows) == index.rows == 2 * 10 * len(WORDS)
+        for row in rows:
+            name, batch = Path(row["source_path"]).stem.split("-")
+            assert index._row(row["row_id"]) == embed(f"{name} {batch} {WORDS[row['ordinal']]}")
+    finally:
+        index.close()
+        store.close()
+
+
+def test_scan_copy_is_rebuilt_to_match_rows_on_open(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(semantic, "BLOCK_ROWS", 16)
+    index, store = _index(tmp_path)
+    try:
+        index.add("chunk", Path("/lib/a.md"), [f"tenant {word}" for word in WORDS], deal_id=None)
+        expected = index.search("tenant escrow", k=3)
+        index.close()
+
+        scan = tmp_path / "vectors.i8"
+        # A crash between the two writes: the last block of the int8 copy never landed.
+        scan.write_bytes(scan.read_bytes()[: semantic.DIM * 16])
+        reopened = SemanticIndex(store, tmp_path / "vectors.f32")
+        assert scan.stat().st_size == semantic.DIM * 16 * 2
+        assert reopened.search("tenant escrow", k=3) == expected
+
+        # Extra blocks from a rolled-back append are cut off.
+        reopened.close()
+        with scan.open("ab") as handle:
+            handle.write(b"\x80" * semantic.DIM * 16)
+        SemanticIndex(store, tmp_path / "vectors.f32").close()
+        assert scan.stat().st_size == semantic.DIM * 16 * 2
+    finally:
+        index.close()
+        store.close()
+
+
+def test_library_search_is_semantic(runtime_no_llm):
+    library = runtime_no_llm.config.firm_library_dir
+    (library / "debt_playbook.md").write_text("Refinance before the balloon note matures; lock rates early.")
+    (library / "capex_playbook.md").write_text("Replace any roof membrane older than twenty years.")
+    runtime_no_llm.librarian.index_firm_library()
+
+    vectors = runtime_no_llm.librarian.chunks.vectors
+    results = vectors.search_library("refinancing a maturing loan", k=2)
+
+    assert results[0]["title"] == "debt_playbook"
+    assert results[0]["score"] >= results[-1]["score"]
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from partner_os.services.watcher import StagingWatcher, deal_hint, original_name
+
+
+def _poll_until(watcher: StagingWatcher, deadline_seconds: float = 5.0) -> list[Path]:
+    deadline = time.monotonic() + deadline_seconds
+    while time.monotonic() < deadline:
+        ready = watcher.poll(timeout=0.05)
+        if ready:
+            return ready
+    return []
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_files_are_reported_once_after_they_stop_changing(tmp_path: Path, use_inotify: bool):
+    watcher = StagingWatcher(tmp_path, settle_seconds=0.3, poll_seconds=0.05, use_inotify=use_inotify)
+    try:
+        scan = tmp_path / "scan.pdf"
+        with scan.open("wb") as handle:
+            for _ in range(4):
+                handle.write(b"x" * 1024)
+                handle.flush()
+                assert watcher.poll(timeout=0.1) == []
+        (tmp_path / "upload.pdf.part").write_bytes(b"partial")
+        (tmp_path / ".DS_Store").write_bytes(b"")
+
+        assert _poll_until(watcher) == [scan]
+        assert watcher.poll(timeout=0.4) == []
+
+        # A sidecar naming the deal changes the file's routing, so it is reported again.
+        (tmp_path / "scan.pdf.deal").write_text("deal-123\n", encoding="utf-8")
+        assert _poll_until(watcher) == [scan]
+    finally:
+        watcher.close()
+
+
+def test_deal_hints_come_from_sidecar_subfolder_or_prefix(tmp_path: Path):
+    folder = tmp_path / "12 Birch St, Vancouver, WA 98660"
+    folder.mkdir()
+    in_folder = folder / "roof.jpg"
+    prefixed = tmp_path / "deal-42__lease.pdf"
+    with_sidecar = tmp_path / "notes.txt"
+    (tmp_path / "notes.txt.deal").write_text("9 Oak St, Vancouver, WA 98660\n", encoding="utf-8")
+
+    assert deal_hint(in_folder, tmp_path) == "12 Birch St, Vancouver, WA 98660"
+    assert deal_hint(prefixed, tmp_path) == "deal-42"
+    assert deal_hint(with_sidecar, tmp_path) == "9 Oak St, Vancouver, WA 98660"
+    assert deal_hint(tmp_path / "loose.pdf", tmp_path) is None
+    assert original_name(prefixed) == "lease.pdf"
+    assert original_name(with_sidecar) == "notes.txt"
+
+
+def test_intake_routes_settled_files_to_deals(runtime_no_llm):
+    staging = runtime_no_llm.config.staging_inbox_dir
+    existing = runtime_no_llm.manager.handle_user_message(
+        message="New lead at 77 Cedar Ave, Vancouver, WA 98661", uploaded_paths=[], cfo_payload=None, run_scout=False
+    )["deal_id"]
+
+    folder = staging / "12 Birch St, Vancouver, WA 98660"
+    folder.mkdir()
+    (folder / "inspection.txt").write_text("Foundation crack on north wall.", encoding="utf-8")
+    (folder / "roof.jpg").write_bytes(b"\xff\xd8\xff")
+    (staging / f"{existing}__lease.txt").write_text("Lease term 12 months.", encoding="utf-8")
+    (staging / "loose.txt").write_text("No deal named anywhere.", encoding="utf-8")
+
+    watcher = StagingWatcher(staging, settle_seconds=0.1, poll_seconds=0.05)
+    try:
+        ready = []
+        deadline = time.monotonic() + 5
+        while len(ready) < 4 and time.monotonic() < deadline:
+            ready += watcher.poll(timeout=0.05)
+    finally:
+        watcher.close()
+
+    intake = runtime_no_llm.manager.intake_staged_files(ready)
+
+    assert intake["unmatched"] == [str(staging / "loose.txt")]
+    assert all(result.success for result in intake["results"])
+    new_deal = next(deal_id for deal_id in intake["routed"] if deal_id != existing)
+    assert len(intake["routed"][new_deal]) == 2
+
+    deal = runtime_no_llm.store.get_deal(existing)
+    jacket = runtime_no_llm.config.root_dir / f"{existing}_{deal['slug']}"
+    assert (jacket / "04_Intel_Docs" / "lease.txt").exists()
+    assert (staging / "loose.txt").exists()
+    assert not list(folder.iterdir())
+
+    task_types = [task["task_type"] for task in runtime_no_llm.store.list_tasks()]
+    assert task_types.count("triage_batch") == 1
+    assert task_types.count("triage_file") == 1
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import zipfile
+import zlib
+from pathlib import Path
+
+from partner_os.services.extract import TextExtractor, extract_text, iter_docx_text, iter_pdf_text
+
+
+def write_pdf(path: Path, pages: list[str], compress: bool = True) -> None:
+    contents = []
+    for text in pages:
+        escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").encode("latin-1")
+        contents.append(b"BT /F1 12 Tf 72 720 Td (" + escaped + b") Tj T* [(Page) -250 ( end)] TJ ET")
+    write_pdf_streams(path, contents, compress)
+
+
+def write_pdf_streams(path: Path, contents: list[bytes], compress: bool = True) -> None:
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", b"<< /Type /Pages /Count %d >>" % len(contents)]
+    for content in contents:
+        if compress:
+            body = zlib.compress(content)
+            objects.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(body) + body + b"\nendstream")
+        else:
+            objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+    objects.append(b"<< /Length 4 /Subtype /Image >>\nstream\n\x00\x01(x)\nendstream")
+    chunks = [b"%PDF-1.4\n"]
+    for number, obj in enumerate(objects, start=1):
+        chunks.append(b"%d 0 obj\n" % number + obj + b"\nendobj\n")
+    chunks.append(b"trailer\n<< /Root 1 0 R >>\n%%EOF\n")
+    path.write_bytes(b"".join(chunks))
+
+
+def write_docx(path: Path, paragraphs: list[str]) -> None:
+    ns = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    body = "".join(f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>" for text in paragraphs)
+    xml = f'<?xml version="1.0"?><w:document xmlns:w="{ns}"><w:body>{body}</w:body></w:document>'
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", xml)
+
+
+def test_pdf_content_streams_in_order_and_skip_binary_objects(tmp_path: Path):
+    pdf = tmp_path / "doctrine.pdf"
+    write_pdf(pdf, ["Cap rates (market) compress", "Seller finance terms"])
+    pages = list(iter_pdf_text(pdf))
+    assert pages == ["Cap rates (market) compress\nPage end", "Seller finance terms\nPage end"]
+
+    plain = tmp_path / "plain.pdf"
+    write_pdf(plain, ["Uncompressed page"], compress=False)
+    assert next(iter_pdf_text(plain)).startswith("Uncompressed page")
+
+
+def test_extraction_stops_at_budget(tmp_path: Path):
+    docx = tmp_path / "contract.docx"
+    write_docx(docx, [f"Clause {idx}: buyer shall close within 30 days." for idx in range(500)])
+    assert next(iter_docx_text(docx)) == "Clause 0: buyer shall close within 30 days."
+
+    text, truncated = extract_text(docx, max_chars=200)
+    assert truncated and len(text) == 200
+    text, truncated = extract_text(docx, max_chars=10**6)
+    assert not truncated and text.count("Clause") == 500
+    assert extract_text(tmp_path / "photo.jpg", 100) == ("", False)
+
+
+def test_extractor_uses_process_pool_and_caches_by_content_hash(runtime_no_llm, tmp_path: Path):
+    pdf = tmp_path / "report.pdf"
+    docx = tmp_path / "lease.docx"
+    write_pdf(pdf, ["Rent roll summary"])
+    write_docx(docx, ["Lease term 12 months"])
+    extractor = TextExtractor(runtime_no_llm.store, max_workers=1)
+    try:
+        texts = extractor.extract_many([pdf, docx, tmp_path / "photo.jpg"], max_tokens=100)
+        assert texts[0].startswith("Rent roll summary")
+        assert texts[1] == "Lease term 12 months"
+        assert texts[2] == ""
+
+        copy = tmp_path / "renamed.pdf"
+        copy.write_bytes(pdf.read_bytes())
+        pdf.unlink()
+        extractor.close()
+        extractor.max_workers = 0
+        assert extractor.extract_many([copy], max_tokens=100) == [texts[0]]
+    finally:
+        extractor.close()
+
+
+def test_uploaded_pdf_is_summarized_instead_of_flagged_binary(runtime_no_llm):
+    staged = runtime_no_llm.config.staging_inbox_dir / "inspection.pdf"
+    write_pdf(staged, ["Roof replaced 2019; furnace at end of life"])
+
+    result = runtime_no_llm.manager.handle_user_message(
+        message="New lead at 9 Oak St, Vancouver, WA 98660",
+        uploaded_paths=[staged],
+        cfo_payload=None,
+        run_scout=False,
+    )
+
+    docs = runtime_no_llm.store.list_documents(result["deal_id"])
+    summary = next(row["summary"] for row in docs if row["file_path"].endswith("inspection.pdf"))
+    assert "Binary or non-text artifact" not in summary
+    assert "furnace at end of life" in summary
+
+
+def test_pdf_without_extractable_text_is_flagged_for_review(runtime_no_llm):
+    staged = runtime_no_llm.config.staging_inbox_dir / "appraisal.pdf"
+    # Identity-H text: two-byte glyph ids that the stream parser does not map back to characters.
+    write_pdf_streams(staged, [b"BT /F0 12 Tf <00370048005B0057> Tj ET"])
+    assert list(iter_pdf_text(staged)) == []
+
+    result = runtime_no_llm.manager.handle_user_message(
+        message="New lead at 5 Pine St, Vancouver, WA 98660",
+        uploaded_paths=[staged],
+        cfo_payload=None,
+        run_scout=False,
+    )
+
+    docs = runtime_no_llm.store.list_documents(result["deal_id"])
+    summary = next(row["summary"] for row in docs if row["file_path"].endswith("appraisal.pdf"))
+    assert "no extractable text" in summary
+    warnings = [row for row in runtime_no_llm.store.list_action_logs() if row["action"] == "pdf_text_missing"]
+    assert len(warnings) == 1 and warnings[0]["deal_id"] == result["deal_id"]
@@ -88,6 +88,7 @@ def normalize_schema(data):
     zoning = data.get("zoning", {})
 
     normalized["as_is_value"] = valuation.get("assessed_value")
+    normalized["comps_summary"] = valuation.get("comps_summary")
     normalized["zoning_code"] = zoning.get("zoning_code")
     normalized["lot_size_sf"] = zoning.get("lot_size_sf")
     normalized["development_potential"] = zoning.get("development_potential")
@@ -149,7 +150,10 @@ def run_underwriting(slug):
     assessed = analysis.get("as_is_value") or 0
     log(f"   ℹ️  Tax Assessed Value: ${assessed:,.2f}")
 
-    arv = get_input("💰 Input After Repair Value (ARV)", default=assessed * 1.2)
+    comps_arv = data.get("valuation", {}).get("comps_arv")
+    if comps_arv:
+        log(f"   ℹ️  Comps ARV: ${comps_arv:,.2f}")
+    arv = get_input("💰 Input After Repair Value (ARV)", default=comps_arv or assessed * 1.2)
     analysis["arv"] = arv
 
     rehab = get_input("🔨 Input Rehab Budget", default=45000.0)
@@ -3,6 +3,7 @@ import os
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 os.environ["PINNEO_QUIET"] = "1"
 
@@ -55,6 +56,28 @@ class TestUnderwriterCalc(unittest.TestCase):
             finally:
                 os.chdir(cwd)
 
+    def test_run_underwriting_defaults_arv_to_comps_arv(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            base = Path(tmp_dir) / "deals" / "active" / "1-main-st"
+            base.mkdir(parents=True)
+            (base / "analysis.json").write_text(json.dumps({
+                "address": "1 Main St",
+                "valuation": {"assessed_value": 250000, "comps_arv": 400000, "comps_summary": "ARV $400,000"},
+                "zoning": {"zoning_code": "R1", "lot_size_sf": 5000, "building_sqft": 1600},
+            }))
+
+            cwd = os.getcwd()
+            try:
+                os.chdir(tmp_dir)
+                with patch("builtins.input", return_value=""):
+                    uc.run_underwriting("1-main-st")
+            finally:
+                os.chdir(cwd)
+
+            saved = json.loads((base / "analysis.json").read_text())
+            self.assertEqual(saved["arv"], 400000)
+            self.assertEqual(saved["comps_summary"], "ARV $400,000")
+
 
 if __name__ == "__main__":
     unittest.main()